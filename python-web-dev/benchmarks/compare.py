@@ -0,0 +1,69 @@
+"""
+Compare two loadtest.py result files and flag regressions.
+
+An operation regresses when its p95 latency grows, or its throughput drops,
+by more than --threshold percent; a target regresses when its peak RSS grows
+by more than that. Exits with status 1 if anything regressed, so it can gate
+a CI job.
+
+    python benchmarks/compare.py loadtest-abc1234.json loadtest-def5678.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def change(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0, help='percent')
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    for key in ('rows', 'concurrency', 'requests', 'list_query'):
+        if before['meta'].get(key) != after['meta'].get(key):
+            print(f"warning: runs differ in {key}: {before['meta'].get(key)!r} vs {after['meta'].get(key)!r}")
+
+    regressions = 0
+    print(f"{'target':>15} {'op':>7}  {'p95 ms':>19}  {'req/s':>21}")
+    for name, new in after['targets'].items():
+        old = before['targets'].get(name)
+        if old is None:
+            continue
+        for op, stats in new['ops'].items():
+            if op not in old['ops']:
+                continue
+            p95 = change(old['ops'][op]['p95_ms'], stats['p95_ms'])
+            rps = change(old['ops'][op]['rps'], stats['rps'])
+            flag = ''
+            if p95 > args.threshold or rps < -args.threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{name:>15} {op:>7}  {stats['p95_ms']:9.2f} ({p95:+6.1f}%)  "
+                  f"{stats['rps']:9.1f} ({rps:+6.1f}%){flag}")
+
+        old_peak = old['memory_kb']['final']['peak']
+        new_peak = new['memory_kb']['final']['peak']
+        if old_peak and new_peak:
+            rss = change(old_peak, new_peak)
+            flag = ''
+            if rss > args.threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{name:>15} {'rss':>7}  {new_peak / 1024:9.1f} MB ({rss:+6.1f}%){flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Load-test list, detail, create, update and delete on every Gunpla backend.
+
+Each target is started in its own process (serve.py) on a fresh SQLite file
+seeded with --rows rows. Every operation is then driven by --concurrency
+client threads over keep-alive connections, --requests times, and the
+latency percentiles, throughput and the server's resident memory are written
+to a JSON file. Compare two runs with compare.py.
+
+    python benchmarks/loadtest.py --rows 100000 --concurrency 8 --requests 1000
+    python benchmarks/loadtest.py --targets django flask-react --ops list detail --list-query 'grade=MG'
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from targets import TARGETS
+
+# Deletes run last so the other operations always find their rows.
+OPERATIONS = ('list', 'detail', 'update', 'create', 'delete')
+STARTUP_TIMEOUT = 600
+
+
+def git_revision():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain'], cwd=HERE,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return sha, dirty
+
+
+def memory_kb(pid):
+    """Current (VmRSS) and peak (VmHWM) resident set size of ``pid``, Linux only."""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            fields = dict(line.split(':', 1) for line in status)
+    except OSError:
+        return {'rss': None, 'peak': None}
+    return {
+        'rss': int(fields['VmRSS'].split()[0]),
+        'peak': int(fields['VmHWM'].split()[0]),
+    }
+
+
+def start_server(target, rows, db_path):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, 'serve.py'), target.name, '--db', db_path, '--rows', str(rows)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    timer = threading.Timer(STARTUP_TIMEOUT, process.kill)
+    timer.start()
+    try:
+        line = process.stdout.readline()
+    finally:
+        timer.cancel()
+    if not line.startswith('READY'):
+        process.kill()
+        raise RuntimeError(f'{target.name} did not start (exit code {process.wait()})')
+    return process, int(line.split()[1])
+
+
+def percentiles(latencies):
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return cuts[49], cuts[94], cuts[98]
+
+
+def drive(port, requests, concurrency):
+    """Send ``requests`` (method, path, body, headers) tuples from ``concurrency`` threads."""
+    pending = iter(requests)
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+        own_latencies = []
+        own_errors = 0
+        while True:
+            with lock:
+                request = next(pending, None)
+            if request is None:
+                break
+            method, path, body, headers = request
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    own_errors += 1
+            except (OSError, http.client.HTTPException):
+                own_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=300)
+            own_latencies.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = percentiles(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+    }
+
+
+def operation_ids(op, args, rng):
+    if op == 'delete':
+        # Each delete needs its own seeded row.
+        return range(1, min(args.requests, args.rows) + 1)
+    if op == 'create':
+        return range(args.requests)
+    return (rng.randint(1, args.rows) for _ in range(args.requests))
+
+
+def run_target(target, args):
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        process, port = start_server(target, args.rows, os.path.join(tmp, 'gunpla.db'))
+        try:
+            result = {'memory_kb': {'seeded': memory_kb(process.pid)}, 'ops': {}}
+            if args.warmup:
+                warmup = [target.request(op, rng.randint(1, args.rows), args.list_query)
+                          for op in ('list', 'detail') if op in args.ops
+                          for _ in range(args.warmup)]
+                drive(port, warmup, args.concurrency)
+            for op in OPERATIONS:
+                if op not in args.ops:
+                    continue
+                requests = [target.request(op, pk, args.list_query) for pk in operation_ids(op, args, rng)]
+                result['ops'][op] = stats = drive(port, requests, args.concurrency)
+                print(f"{target.name:>15} {op:>7}  {stats['rps']:8.1f} req/s  "
+                      f"p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+                      f"p99 {stats['p99_ms']:8.2f} ms  errors {stats['errors']}", flush=True)
+            result['memory_kb']['final'] = memory_kb(process.pid)
+        finally:
+            process.kill()
+            process.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--ops', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument('--rows', type=int, default=1000, help='rows seeded per target (1k-1M)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help='requests per operation')
+    parser.add_argument('--warmup', type=int, default=20, help='untimed list/detail requests first')
+    parser.add_argument('--list-query', default='', help="query string for list requests, e.g. 'grade=MG'")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON results file (default: loadtest-<commit>.json)')
+    args = parser.parse_args()
+
+    sha, dirty = git_revision()
+    results = {
+        'meta': {
+            'commit': sha,
+            'dirty': dirty,
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'rows': args.rows,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'list_query': args.list_query,
+        },
+        'targets': {},
+    }
+    for name in args.targets:
+        results['targets'][name] = run_target(TARGETS[name], args)
+
+    output = args.output or f"loadtest-{sha or 'nogit'}{'-dirty' if dirty else ''}.json"
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'wrote {output}')
+
+
+if __name__ == '__main__':
+    main()
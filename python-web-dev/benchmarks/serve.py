@@ -0,0 +1,45 @@
+"""
+Serve one Gunpla backend for the load test: build it against a fresh SQLite
+file, seed ``--rows`` rows, then print ``READY <port>`` and serve on a
+threaded, keep-alive Werkzeug server until killed.
+
+    python benchmarks/serve.py django --db /tmp/gunpla.db --rows 10000
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+from targets import TARGETS
+
+
+class KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('target', choices=TARGETS)
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args()
+
+    target = TARGETS[args.target]
+    db_path = os.path.abspath(args.db)
+    sys.path.insert(0, target.root)
+    os.chdir(target.root)
+    app = target.build(db_path, args.rows)
+
+    server = make_server('127.0.0.1', args.port, app, threaded=True, request_handler=KeepAliveHandler)
+    print(f'READY {server.port}', flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+The four Gunpla backends as load-test targets.
+
+Each target knows how to build its WSGI app against a fresh SQLite file,
+seed it, and shape the list/detail/create/update/delete requests for its
+routes. ``build_*`` functions run inside ``serve.py``, one process per
+target, because every project has its own top-level ``app`` package.
+"""
+import json
+import os
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_BATCH = 10000
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["HG", "RG", "MG", "PG"]
+
+
+def seed_rows(rows):
+    for i in range(rows):
+        yield {
+            'name': f'Zaku II {i}',
+            'series': SERIES[i % len(SERIES)],
+            'grade': GRADES[i % len(GRADES)],
+            'scale': '1/144',
+        }
+
+
+def kit(i):
+    return {'name': f'Load Test {i}', 'series': 'Gundam Build Fighters', 'grade': 'HG', 'scale': '1/144'}
+
+
+def seed_sqlalchemy(db, model, rows, prepare=None):
+    """Core inserts in batches; ``prepare`` maps each row dict to the table's columns."""
+    batch = []
+    for row in seed_rows(rows):
+        batch.append(prepare(row) if prepare else row)
+        if len(batch) == SEED_BATCH:
+            db.session.execute(db.insert(model), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(model), batch)
+    db.session.commit()
+
+
+def build_flask_react(db_path, rows):
+    from app import create_app
+    from app.models import db
+    from app.models.gunpla import Gunpla
+    from app.utils.lookups import resolve_lookups
+    from config.settings import Config
+
+    config = type('LoadTestConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'DEBUG': False,
+    })
+    app = create_app(config)
+    with app.app_context():
+        # series/grade are names over the series_id/grade_id foreign keys.
+        seed_sqlalchemy(db, Gunpla, rows, lambda row: resolve_lookups(db.session, row))
+    return app
+
+
+def build_monolith(db_path, rows):
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from app import create_app, db
+    from app.models.gunpla import Gunpla
+    from config import Config
+
+    config = type('LoadTestConfig', (Config,), {'WTF_CSRF_ENABLED': False})
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        seed_sqlalchemy(db, Gunpla, rows)
+    return app
+
+
+def build_django(db_path, rows):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'myproject.settings'
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = db_path
+    # DEBUG keeps every query in memory, which would skew RSS.
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+    django.setup()
+
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+    from gunpla.models import Gunpla
+
+    call_command('migrate', verbosity=0)
+    Gunpla.objects.bulk_create((Gunpla(**row) for row in seed_rows(rows)), batch_size=SEED_BATCH)
+    return get_wsgi_application()
+
+
+def json_request(method, path, data=None):
+    if data is None:
+        return method, path, None, {}
+    return method, path, json.dumps(data).encode(), {'Content-Type': 'application/json'}
+
+
+def form_request(path, data):
+    return 'POST', path, urlencode(data).encode(), {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+class Target:
+    def __init__(self, name, root, build, list_path, api=True, detail_path=None):
+        self.name = name
+        self.root = os.path.join(ROOT, root)
+        self.build = build
+        self.list_path = list_path
+        self.api = api
+        self.detail_path = detail_path
+
+    def request(self, op, pk, query=''):
+        """Return ``(method, path, body, headers)`` for one operation on row ``pk``."""
+        if op == 'list':
+            return 'GET', self.list_path + (f'?{query}' if query else ''), None, {}
+        if self.api:
+            if op == 'detail':
+                return json_request('GET', f'/gunplas/{pk}')
+            if op == 'create':
+                return json_request('POST', '/gunplas', kit(pk))
+            if op == 'update':
+                return json_request('PUT', f'/gunplas/{pk}', kit(pk))
+            return json_request('DELETE', f'/gunplas/{pk}')
+        if op == 'detail':
+            return 'GET', self.detail_path.format(pk=pk), None, {}
+        if op == 'create':
+            return form_request('/create', kit(pk))
+        if op == 'update':
+            return form_request(f'/edit/{pk}', kit(pk))
+        return form_request(f'/delete/{pk}', {})
+
+
+TARGETS = {
+    target.name: target for target in [
+        Target('flask-react', 'flask-react-gunpla-app/backend', build_flask_react, '/gunplas'),
+        Target('django', 'django-gunpla-backend-only/myproject', build_django, '/gunplas'),
+        Target('flask-monolith', 'flask-gunpla-monolith', build_monolith, '/',
+               api=False, detail_path='/edit/{pk}'),
+        Target('flask-htmx', 'flask-gunpla-monolith-htmx', build_monolith, '/',
+               api=False, detail_path='/gunpla/{pk}'),
+    ]
+}
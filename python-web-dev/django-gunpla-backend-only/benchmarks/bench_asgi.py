@@ -0,0 +1,225 @@
+"""
+Compare the sync views under WSGI with the async views under ASGI at high concurrency.
+
+Seeds a SQLite file, then for each deployment starts a server process and
+opens --connections keep-alive connections at once, each sending
+--requests requests for a random Gunpla detail (or --path):
+
+    wsgi        sync views, Django's threaded WSGI server (as runserver)
+    asgi-sync   sync views under uvicorn (run in a thread per request)
+    asgi        async views (/async/...) under uvicorn
+
+Before serving the ASGI modes it checks that no middleware has to be
+adapted between sync and async, which would cost a thread hop per request.
+
+Requires uvicorn for the ASGI modes (pip install uvicorn):
+
+    python benchmarks/bench_asgi.py --connections 1000 --rows 10000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject')
+sys.path.insert(0, PROJECT)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+MODES = {
+    'wsgi': '/gunplas/{id}',
+    'asgi-sync': '/gunplas/{id}',
+    'asgi': '/async/gunplas/{id}',
+}
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["HG", "RG", "MG", "PG"]
+
+
+def setup_django(db_path):
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['127.0.0.1']
+    django.setup()
+
+
+def seed(db_path, count):
+    setup_django(db_path)
+    from django.core.management import call_command
+    from gunpla.models import Gunpla
+
+    call_command('migrate', verbosity=0)
+    Gunpla.objects.bulk_create(
+        (Gunpla(name=f"Kit {i}", series=SERIES[i % len(SERIES)], grade=GRADES[i % len(GRADES)], scale="1/144")
+         for i in range(count)),
+        batch_size=10000,
+    )
+
+
+def check_async_middleware():
+    """
+    Fail if loading MIDDLEWARE for ASGI adapts any of it: Django logs
+    "Synchronous/Asynchronous handler adapted for middleware ..." at debug
+    level, with DEBUG on, for every middleware it wraps in sync_to_async or
+    async_to_sync.
+    """
+    from django.conf import settings
+    from django.core.handlers.asgi import ASGIHandler
+
+    class Adaptations(logging.Handler):
+        def __init__(self):
+            super().__init__(logging.DEBUG)
+            self.messages = []
+
+        def emit(self, record):
+            if 'adapted for middleware' in record.getMessage():
+                self.messages.append(record.getMessage())
+
+    adaptations = Adaptations()
+    logger = logging.getLogger('django.request')
+    level, debug = logger.level, settings.DEBUG
+    logger.addHandler(adaptations)
+    logger.setLevel(logging.DEBUG)
+    settings.DEBUG = True
+    try:
+        ASGIHandler()
+    finally:
+        settings.DEBUG = debug
+        logger.setLevel(level)
+        logger.removeHandler(adaptations)
+    if adaptations.messages:
+        raise SystemExit('\n'.join(adaptations.messages))
+
+
+def serve(mode, db_path, port):
+    setup_django(db_path)
+    if mode == 'wsgi':
+        from django.core.servers.basehttp import WSGIRequestHandler, run
+        from django.core.wsgi import get_wsgi_application
+
+        WSGIRequestHandler.log_message = lambda *args: None
+        run('127.0.0.1', port, get_wsgi_application(), threading=True)
+    else:
+        import uvicorn
+        from django.core.asgi import get_asgi_application
+
+        check_async_middleware()
+        uvicorn.run(get_asgi_application(), host='127.0.0.1', port=port,
+                    log_level='warning', access_log=False, backlog=4096)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def connection(port, path, requests, rows, latencies, counts):
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    except OSError:
+        counts['failed'] += requests
+        return
+    try:
+        for _ in range(requests):
+            target = path.format(id=random.randint(1, rows))
+            start = time.perf_counter()
+            writer.write(f'GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode())
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            counts['ok' if status < 400 else 'failed'] += 1
+    except (OSError, asyncio.IncompleteReadError):
+        counts['failed'] += 1
+    finally:
+        writer.close()
+
+
+async def load(port, path, args):
+    await wait_for_port(port)
+    latencies = []
+    counts = {'ok': 0, 'failed': 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        connection(port, path, args.requests, args.rows, latencies, counts)
+        for _ in range(args.connections)
+    ))
+    return latencies, counts, time.perf_counter() - start
+
+
+def run_mode(mode, db_path, args):
+    port = free_port()
+    server = subprocess.Popen([sys.executable, __file__, '--serve', mode, '--db', db_path, '--port', str(port)])
+    try:
+        latencies, counts, elapsed = asyncio.run(load(port, args.path or MODES[mode], args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    print(f"{mode:<10} {counts['ok'] / elapsed:9.0f} {cuts[49] * 1000:9.1f} {cuts[94] * 1000:9.1f} "
+          f"{cuts[98] * 1000:9.1f} {counts['failed']:8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=5, help='requests per connection')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--path', help="override the request path; '{id}' is replaced by a random id")
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.db, args.port)
+        return
+
+    # Every connection is a file descriptor on both ends.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'gunpla.db')
+        seed(db_path, args.rows)
+        print(f"{args.connections} connections x {args.requests} requests, {args.rows:,} rows\n")
+        print(f"{'mode':<10} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'failed':>8}")
+        for mode in args.modes:
+            run_mode(mode, db_path, args)
+
+
+if __name__ == '__main__':
+    main()
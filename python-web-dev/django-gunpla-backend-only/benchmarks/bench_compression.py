@@ -0,0 +1,87 @@
+"""
+Bytes saved versus CPU spent by CompressionMiddleware on Gunpla list payloads.
+
+Seeds an in-memory SQLite database with N rows and renders ``/gunplas?all=true``
+once, then compresses that body with every available encoder at a few levels
+(the starred ones are the middleware's defaults). Reports compressed size,
+ratio, compression time and throughput:
+
+    python benchmarks/bench_compression.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.core.management import call_command
+from django.test import Client
+from gunpla import compression
+from gunpla.models import Gunpla
+
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["High Grade", "Real Grade", "Master Grade", "Perfect Grade"]
+SCALES = ["1/144", "1/100", "1/60", None]
+
+LEVELS = {
+    'gzip': [1, compression.GZIP_LEVEL, 9],
+    'br': [1, compression.BROTLI_QUALITY, 7],
+    'zstd': [1, compression.ZSTD_LEVEL, 9],
+}
+DEFAULTS = {'gzip': compression.GZIP_LEVEL, 'br': compression.BROTLI_QUALITY, 'zstd': compression.ZSTD_LEVEL}
+
+
+def seed(count):
+    Gunpla.objects.all().delete()
+    Gunpla.objects.bulk_create(
+        (Gunpla(name=f"Kit {i}", series=SERIES[i % len(SERIES)],
+                grade=GRADES[i % len(GRADES)], scale=SCALES[i % len(SCALES)])
+         for i in range(count)),
+        batch_size=10000,
+    )
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    client = Client()
+
+    print(f"{'rows':>7}  {'encoding':<10} {'bytes':>11} {'ratio':>6} {'ms':>8} {'MB/s':>8}")
+    for size in args.sizes:
+        seed(size)
+        response = client.get('/gunplas', {'all': 'true'})
+        assert response.status_code == 200, response.status_code
+        body = response.content
+        print(f"{size:>7}  {'identity':<10} {len(body):>11,} {1:>6.1f} {0:>8.2f} {'-':>8}")
+        for encoding, encoder in compression.ENCODERS.items():
+            for level in LEVELS[encoding]:
+                elapsed, compressed = best_of(lambda: encoder(level).compress(body), args.repeat)
+                label = f"{encoding}-{level}" + ('*' if level == DEFAULTS[encoding] else '')
+                print(f"{size:>7}  {label:<10} {len(compressed):>11,} {len(body) / len(compressed):>6.1f} "
+                      f"{elapsed * 1000:>8.2f} {len(body) / elapsed / 1e6:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-request overhead of MetricsMiddleware and the /metrics registry.
+
+Times --requests GETs of /gunplas/cache (no SQL) through the test client
+with and without MetricsMiddleware, then the middleware's bookkeeping
+alone, and the render of a /metrics scrape:
+
+    python benchmarks/bench_metrics.py --requests 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.core.management import call_command
+from django.test import Client, override_settings
+from gunpla.metrics import registry
+
+METRICS_MIDDLEWARE = 'gunpla.metrics.MetricsMiddleware'
+
+
+def client(middleware):
+    # The handler loads MIDDLEWARE on its first request and keeps it.
+    client = Client()
+    with override_settings(MIDDLEWARE=middleware):
+        client.get('/gunplas/cache')
+    return client
+
+
+def per_request(client, count, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get('/gunplas/cache')
+        timings.append((time.perf_counter() - start) / count)
+    return min(timings)
+
+
+def per_bookkeeping(count, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            begin = time.perf_counter()
+            registry.start()
+            registry.end()
+            registry.route('GunplaCacheStats', 'GET').observe(time.perf_counter() - begin, 200)
+        timings.append((time.perf_counter() - start) / count)
+    return min(timings)
+
+
+def per_scrape(repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        registry.render()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    plain = per_request(client([m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]),
+                        args.requests, args.repeat)
+    metered = per_request(client(settings.MIDDLEWARE), args.requests, args.repeat)
+    bookkeeping = per_bookkeeping(args.requests, args.repeat)
+    scrape = per_scrape(args.repeat)
+    print(f"{'request, metrics off':<24} {plain * 1e6:>8.1f} us")
+    print(f"{'request, metrics on':<24} {metered * 1e6:>8.1f} us  ({(metered - plain) * 1e6:+.1f} us)")
+    print(f"{'middleware bookkeeping':<24} {bookkeeping * 1e6:>8.1f} us")
+    print(f"{'/metrics render':<24} {scrape * 1e6:>8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare FTS5 search (/gunplas/search) against a LIKE '%...%' scan.
+
+Seeds an in-memory SQLite database (the FTS triggers index every row as it
+is inserted) and times a few typical "find a kit" queries both ways.
+
+LIKE has no ranking, so with LIMIT it can stop at the first 50 hits and is
+cheap for very common terms; it has to scan the whole table for rare or
+missing ones. FTS5 goes straight to the matching rows but BM25-ranks all
+of them, so its cost follows the number of matches, not the table size:
+
+    python benchmarks/bench_search.py --rows 1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+django.setup()
+
+from django.core.management import call_command
+from django.db.models import Q
+from gunpla.models import Gunpla
+from gunpla.search import search_gunplas
+from gunpla.serializers import GunplaReadSerializer
+
+MOBILE_SUITS = ["Zaku", "Gouf", "Dom", "Gelgoog", "Nu", "Sazabi", "Exia", "Barbatos", "Unicorn", "Strike"]
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["HG", "RG", "MG", "PG"]
+QUERIES = ["sazabi", "gundam wing", "barbatos 4217", "sazabi 99", "turn a"]
+LIMIT = 50
+
+
+def seed(count):
+    Gunpla.objects.bulk_create(
+        (Gunpla(name=f"{MOBILE_SUITS[i % len(MOBILE_SUITS)]} {i}", series=SERIES[i % len(SERIES)],
+                grade=GRADES[i % len(GRADES)], scale="1/144")
+         for i in range(count)),
+        batch_size=10000,
+    )
+
+
+def like_search(q, limit):
+    queryset = Gunpla.objects.all()
+    for term in q.split():
+        queryset = queryset.filter(Q(name__icontains=term) | Q(series__name__icontains=term))
+    return GunplaReadSerializer(queryset.order_by('id')[:limit]).data
+
+
+def median_ms(func, q, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(q, LIMIT)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<16} {'matches':>9} {'LIKE ms':>10} {'FTS5 ms':>10} {'speedup':>8}")
+    for q in QUERIES:
+        matches = len(search_gunplas(q, args.rows))
+        like_ms = median_ms(like_search, q, args.repeat)
+        fts_ms = median_ms(search_gunplas, q, args.repeat)
+        print(f"{q:<16} {matches:>9,} {like_ms:>10.2f} {fts_ms:>10.2f} {like_ms / fts_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
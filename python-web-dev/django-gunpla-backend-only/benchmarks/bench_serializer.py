@@ -0,0 +1,89 @@
+"""
+Compare GunplaSerializer(many=True) against the GunplaReadSerializer fast path.
+
+Seeds an in-memory SQLite database with N rows and times query + serialize +
+render for both paths, reporting rows/second:
+
+    python benchmarks/bench_serializer.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+django.setup()
+
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+from gunpla.models import Gunpla
+from gunpla.renderers import FastJSONRenderer, orjson
+from gunpla.serializers import GunplaSerializer, GunplaReadSerializer
+
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["HG", "RG", "MG", "PG"]
+SCALES = ["1/144", "1/100", "1/60", None]
+
+
+def seed(count):
+    Gunpla.objects.all().delete()
+    Gunpla.objects.bulk_create(
+        (Gunpla(name=f"Kit {i}", series=SERIES[i % len(SERIES)],
+                grade=GRADES[i % len(GRADES)], scale=SCALES[i % len(SCALES)])
+         for i in range(count)),
+        batch_size=10000,
+    )
+
+
+def model_serializer():
+    return JSONRenderer().render(GunplaSerializer(Gunpla.objects.all(), many=True).data)
+
+
+def read_serializer():
+    return JSONRenderer().render(GunplaReadSerializer(Gunpla.objects.all()).data)
+
+
+def read_serializer_orjson():
+    return FastJSONRenderer().render(GunplaReadSerializer(Gunpla.objects.all()).data)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    paths = [("GunplaSerializer", model_serializer), ("GunplaReadSerializer", read_serializer)]
+    if orjson is not None:
+        paths.append(("GunplaReadSerializer+orjson", read_serializer_orjson))
+
+    print(f"{'rows':>9}  {'path':<28} {'seconds':>8} {'rows/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        seed(size)
+        baseline_time = baseline_body = None
+        for name, func in paths:
+            elapsed, body = best_of(func, args.repeat)
+            if baseline_body is None:
+                baseline_time, baseline_body = elapsed, body
+            assert body == baseline_body, f"{name} output differs from GunplaSerializer"
+            print(f"{size:>9}  {name:<28} {elapsed:>8.3f} {size / elapsed:>12,.0f} {baseline_time / elapsed:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+/gunplas/stats from the trigger-maintained summary table vs. GROUP BY scans.
+
+Seeds an in-memory SQLite database with N rows, then times gunpla_stats()
+(one row per distinct value) against the same counts aggregated over the
+Gunpla table. "insert s" is the seeding time with every trigger in place:
+
+    python benchmarks/bench_stats.py --sizes 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'myproject'))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+import django
+from django.conf import settings
+
+settings.DATABASES['default']['NAME'] = ':memory:'
+django.setup()
+
+from django.core.management import call_command
+from gunpla.models import Gunpla
+from gunpla.stats import aggregate_rows, gunpla_stats
+
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["High Grade", "Real Grade", "Master Grade", "Perfect Grade"]
+SCALES = ["1/144", "1/100", "1/60", None]
+
+
+def seed(count):
+    Gunpla.objects.all().delete()
+    start = time.perf_counter()
+    Gunpla.objects.bulk_create(
+        (Gunpla(name=f"Kit {i}", series=SERIES[i % len(SERIES)],
+                grade=GRADES[i % len(GRADES)], scale=SCALES[i % len(SCALES)])
+         for i in range(count)),
+        batch_size=10000,
+    )
+    return time.perf_counter() - start
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+
+    print(f"{'rows':>9}  {'insert s':>9} {'summary ms':>11} {'group by ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        insert = seed(size)
+        summary = best_of(gunpla_stats, args.repeat)
+        scan = best_of(aggregate_rows, args.repeat)
+        print(f"{size:>9,}  {insert:>9.2f} {summary * 1000:>11.2f} {scan * 1000:>12.2f} {scan / summary:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
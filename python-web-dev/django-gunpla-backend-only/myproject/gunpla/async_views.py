@@ -0,0 +1,149 @@
+# gunpla/async_views.py
+import json
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from .cache import response_cache, detail_key, list_key
+from .conditional import atable_version, list_etag, list_validators
+from .filters import filter_gunplas
+from .lookups import aresolve_lookups
+from .models import Gunpla
+from .pagination import GunplaCursorPagination, wants_unpaginated
+from .renderers import FastJSONRenderer
+from .serializers import (
+    GunplaSerializer, GunplaReadSerializer, GunplaColumnarSerializer, format_errors, wants_columnar
+)
+from .streaming import NDJSON_MEDIA_TYPE, astream_ndjson
+
+
+class AsyncGunplaView(View):
+    """
+    Base for the async-native views served under ASGI.
+
+    Plain Django views, since DRF's APIView is sync-only: request bodies are
+    JSON, responses are rendered with FastJSONRenderer so they are
+    byte-identical to the sync API, and CSRF is exempt as it is for APIView.
+    """
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def respond(self, data, status=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), content_type=self.renderer.media_type, status=status)
+
+    def not_found(self):
+        return self.respond({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    def parse_error(self):
+        return self.respond({"detail": "JSON parse error."}, status=status.HTTP_400_BAD_REQUEST)
+
+    def parse_body(self, request):
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+
+
+class AsyncGunplaList(AsyncGunplaView):
+    pagination_class = GunplaCursorPagination
+
+    async def get(self, request):
+        # The same conditional GET as the sync view's condition() decorator,
+        # which cannot wrap an async method on Django 5.1. The table version
+        # is loaded through the async ORM first and cached on the request.
+        await atable_version(request)
+        etag, last_modified = list_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await self.list_response(request)
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        if last_modified:
+            response.headers.setdefault('Last-Modified', http_date(last_modified))
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    async def list_response(self, request):
+        gunplas = filter_gunplas(Gunpla.objects.all(), request.GET)
+        stream = request.GET.get('stream', '').lower() in ('1', 'true', 'yes')
+        if stream or NDJSON_MEDIA_TYPE in request.headers.get('Accept', ''):
+            return astream_ndjson(gunplas, GunplaReadSerializer.fields, GunplaReadSerializer.columns)
+
+        etag = list_etag(request)
+        cache_key = list_key(etag) if etag else None
+        data = await response_cache.aget(cache_key)
+        if data is None:
+            try:
+                data = await self.list_data(Request(request), gunplas)
+            except NotFound as exc:  # tampered cursor
+                return self.respond({"detail": exc.detail}, status=status.HTTP_404_NOT_FOUND)
+            await response_cache.aset(cache_key, data)
+        return self.respond(data)
+
+    async def list_data(self, request, gunplas):
+        serializer_class = GunplaColumnarSerializer if wants_columnar(request) else GunplaReadSerializer
+        rows = GunplaReadSerializer.rows(gunplas)
+        if wants_unpaginated(request):
+            return serializer_class([row async for row in rows.order_by('id')]).data
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(rows, request)
+        return {
+            'results': serializer_class(page).data,
+            'next': paginator.next_link,
+            'prev': paginator.prev_link,
+        }
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        if data is None:
+            return self.parse_error()
+        serializer = GunplaSerializer(data=data)
+        if not serializer.is_valid():
+            return self.respond({"message": format_errors(serializer.errors)}, status=status.HTTP_400_BAD_REQUEST)
+        data = await aresolve_lookups(Gunpla, serializer.validated_data)
+        gunpla = await Gunpla.objects.acreate(**data)
+        return self.respond(GunplaSerializer(gunpla).data, status=status.HTTP_201_CREATED)
+
+
+class AsyncGunplaDetail(AsyncGunplaView):
+    async def get(self, request, pk):
+        cache_key = detail_key(pk, await atable_version(request))
+        data = await response_cache.aget(cache_key)
+        if data is None:
+            gunpla = await Gunpla.objects.filter(pk=pk).afirst()
+            if gunpla is None:
+                return self.not_found()
+            data = GunplaSerializer(gunpla).data
+            await response_cache.aset(cache_key, data)
+        return self.respond(data)
+
+    async def put(self, request, pk):
+        gunpla = await Gunpla.objects.filter(pk=pk).afirst()
+        if gunpla is None:
+            return self.not_found()
+        data = self.parse_body(request)
+        if data is None:
+            return self.parse_error()
+        serializer = GunplaSerializer(gunpla, data=data)
+        if not serializer.is_valid():
+            return self.respond({"message": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        data = await aresolve_lookups(Gunpla, serializer.validated_data)
+        for field, value in data.items():
+            setattr(gunpla, field, value)
+        await gunpla.asave()
+        return self.respond(GunplaSerializer(gunpla).data)
+
+    async def delete(self, request, pk):
+        gunpla = await Gunpla.objects.filter(pk=pk).afirst()
+        if gunpla is None:
+            return self.not_found()
+        await gunpla.adelete()
+        return self.respond({"message": "Gunpla model deleted successfully"})
@@ -0,0 +1,117 @@
+# gunpla/bulk.py
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from .lookups import resolve_lookups
+from .models import Gunpla
+from .serializers import GunplaSerializer, format_errors
+
+DEFAULT_BULK_CHUNK_SIZE = 1000
+UPDATE_FIELDS = ['name', 'series', 'grade', 'scale']
+
+
+def get_chunk_size():
+    return getattr(settings, 'GUNPLA_BULK_CHUNK_SIZE', DEFAULT_BULK_CHUNK_SIZE)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def validate_items(items):
+    """
+    Validate every item up front.
+
+    Returns ``(valid, errors)`` where ``valid`` is a list of
+    ``(index, validated_data)`` pairs and ``errors`` holds one
+    ``{"index", "message"}`` entry per rejected item.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'message': ['Item must be a JSON object.']})
+            continue
+        serializer = GunplaSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'message': format_errors(serializer.errors)})
+    return valid, errors
+
+
+def bulk_create(items, chunk_size=None):
+    """Insert all valid items with one ``bulk_create`` and one transaction per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    valid, errors = validate_items(items)
+    created = 0
+    for chunk in chunked(valid, chunk_size):
+        with transaction.atomic():
+            resolve_lookups(Gunpla, [data for _, data in chunk])
+            Gunpla.objects.bulk_create([Gunpla(**data) for _, data in chunk])
+        created += len(chunk)
+    return created, errors
+
+
+def bulk_update(items, chunk_size=None):
+    """Update existing rows by ``id`` with one ``bulk_update`` and one transaction per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    errors = []
+    with_ids = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('id'), int):
+            errors.append({'index': index, 'message': ['Id field is required.']})
+        else:
+            with_ids.append((index, item))
+
+    valid, validation_errors = validate_items(item for _, item in with_ids)
+    for error in validation_errors:
+        error['index'] = with_ids[error['index']][0]
+    errors.extend(validation_errors)
+
+    updated = 0
+    for chunk in chunked(valid, chunk_size):
+        ids = [with_ids[position][1]['id'] for position, _ in chunk]
+        with transaction.atomic():
+            resolve_lookups(Gunpla, [data for _, data in chunk])
+            existing = Gunpla.objects.in_bulk(ids)
+            objs = []
+            for (position, data), pk in zip(chunk, ids):
+                gunpla = existing.get(pk)
+                if gunpla is None:
+                    errors.append({'index': with_ids[position][0], 'message': ['Gunpla model not found']})
+                    continue
+                for field in UPDATE_FIELDS:
+                    setattr(gunpla, field, data.get(field))
+                objs.append(gunpla)
+            Gunpla.objects.bulk_update(objs, UPDATE_FIELDS)
+        updated += len(objs)
+    errors.sort(key=lambda error: error['index'])
+    return updated, errors
+
+
+def bulk_delete(ids, chunk_size=None):
+    """Delete rows by ``id`` with one ``DELETE ... WHERE id IN (...)`` per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    errors = []
+    valid = []
+    for index, pk in enumerate(ids):
+        if isinstance(pk, int):
+            valid.append((index, pk))
+        else:
+            errors.append({'index': index, 'message': ['Id must be an integer.']})
+
+    deleted = 0
+    for chunk in chunked(valid, chunk_size):
+        chunk_ids = [pk for _, pk in chunk]
+        with transaction.atomic():
+            found = set(Gunpla.objects.filter(pk__in=chunk_ids).values_list('pk', flat=True))
+            Gunpla.objects.filter(pk__in=found).delete()
+        deleted += len(found)
+        errors.extend(
+            {'index': index, 'message': ['Gunpla model not found']}
+            for index, pk in chunk if pk not in found
+        )
+    errors.sort(key=lambda error: error['index'])
+    return deleted, errors
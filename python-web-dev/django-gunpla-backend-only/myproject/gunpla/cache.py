@@ -0,0 +1,89 @@
+# gunpla/cache.py
+import threading
+from django.conf import settings
+from django.core.cache import caches
+
+
+def detail_key(pk, version):
+    # Keyed by the table version, as the lists are: a write in any worker
+    # moves every detail to a new key, so none is served stale from another
+    # process's cache. Without a version (no triggers) details are not cached.
+    if version is None:
+        return None
+    return f'gunpla:detail:{version.version}:{pk}'
+
+
+def list_key(etag):
+    # List ETags already embed the table version, so a write anywhere moves
+    # every list to a new key and the stale ones age out of the LRU.
+    return f'gunpla:list:{etag}'
+
+
+class ResponseCache:
+    """
+    Read-through cache for serialized Gunpla responses.
+
+    Storage is whatever Django cache ``GUNPLA_CACHE_ALIAS`` points at:
+    LocMemCache (a per-process LRU bounded by ``MAX_ENTRIES`` and
+    ``TIMEOUT``) by default, or Redis to share entries between workers.
+    Hit and miss counts are kept per process for sizing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        return caches[getattr(settings, 'GUNPLA_CACHE_ALIAS', 'gunpla')]
+
+    def _count(self, value):
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get(self, key):
+        if key is None:
+            return None
+        return self._count(self.backend.get(key))
+
+    def set(self, key, value):
+        if key is not None:
+            self.backend.set(key, value)
+
+    def delete_many(self, keys):
+        self.backend.delete_many(list(keys))
+
+    async def aget(self, key):
+        if key is None:
+            return None
+        return self._count(await self.backend.aget(key))
+
+    async def aset(self, key, value):
+        if key is not None:
+            await self.backend.aset(key, value)
+
+    async def adelete_many(self, keys):
+        await self.backend.adelete_many(list(keys))
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,195 @@
+# gunpla/compression.py
+import zlib
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+# Levels tuned for dynamic responses: most of the size win for little CPU.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+class GzipEncoder:
+    def __init__(self, level=GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+    def chunk(self, data):
+        # Sync-flush so each streamed chunk reaches the client right away.
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, level=BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.finish()
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level=ZSTD_LEVEL):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+ENCODERS = {'gzip': GzipEncoder}
+if brotli is not None:
+    ENCODERS['br'] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS['zstd'] = ZstdEncoder
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` from an Accept-Encoding header."""
+    qualities = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            qualities[coding.strip().lower()] = q
+    return qualities
+
+
+def choose_encoding(header, encodings):
+    """
+    The coding from ``encodings`` (in server preference order) with the
+    highest q-value in ``header``, or None for identity.
+    """
+    qualities = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = qualities.get(encoding, qualities.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with zstd, brotli or gzip, whichever the client
+    prefers from ``GUNPLA_COMPRESSION_ENCODINGS``. Codings whose optional
+    package is missing are skipped; an empty setting disables the middleware.
+
+    Bodies under ``GUNPLA_COMPRESSION_MIN_SIZE`` bytes are left alone. Streamed
+    responses (the NDJSON export, sync or async) are compressed chunk by
+    chunk with a flush after each, so they keep streaming. Strong ETags are
+    weakened, as Django's GZipMiddleware does, since the bytes differ from
+    the identity representation the ETag was computed for.
+
+    Works both ways, so under ASGI the async views are not hopped through a
+    thread to reach it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.encodings = [
+            encoding for encoding in getattr(settings, 'GUNPLA_COMPRESSION_ENCODINGS', ())
+            if encoding in ENCODERS
+        ]
+        if not self.encodings:
+            raise MiddlewareNotUsed
+        self.min_size = getattr(settings, 'GUNPLA_COMPRESSION_MIN_SIZE', 1024)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not self.compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''), self.encodings)
+        if encoding is None:
+            return response
+
+        encoder = ENCODERS[encoding]()
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.acompress_stream(encoder, response.streaming_content)
+            else:
+                response.streaming_content = self.compress_stream(encoder, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            response.content = encoder.compress(response.content)
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def compressible(self, response):
+        if response.status_code != 200 or response.has_header('Content-Encoding'):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        return response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def compress_stream(encoder, chunks):
+        for chunk in chunks:
+            data = encoder.chunk(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def acompress_stream(encoder, chunks):
+        async for chunk in chunks:
+            data = encoder.chunk(chunk)
+            if data:
+                yield data
+        yield encoder.finish()
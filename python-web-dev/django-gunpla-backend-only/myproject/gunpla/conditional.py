@@ -0,0 +1,53 @@
+# gunpla/conditional.py
+import hashlib
+from django.utils.http import quote_etag
+from django.db import connection
+from .models import GunplaVersion
+
+
+def table_version(request):
+    """Current GunplaVersion row, or None where no triggers maintain it."""
+    if connection.vendor != 'sqlite':
+        return None
+    if not hasattr(request, '_gunpla_version'):
+        request._gunpla_version = GunplaVersion.current()
+    return request._gunpla_version
+
+
+async def atable_version(request):
+    """Async ORM variant of ``table_version``; caches the row on the request the same way."""
+    if connection.vendor != 'sqlite':
+        return None
+    if not hasattr(request, '_gunpla_version'):
+        request._gunpla_version = await GunplaVersion.objects.filter(pk=1).afirst()
+    return request._gunpla_version
+
+
+def list_etag(request, *args, **kwargs):
+    """
+    Strong ETag for a list response: the table version plus everything that
+    shapes the representation (path, query string and negotiated format).
+    """
+    version = table_version(request)
+    if version is None:
+        return None
+    key = f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+    return f"{version.version}-{hashlib.md5(key.encode()).hexdigest()[:16]}"
+
+
+def list_last_modified(request, *args, **kwargs):
+    version = table_version(request)
+    return version.updated_at if version is not None else None
+
+
+def list_validators(request):
+    """
+    ``(quoted ETag, Last-Modified timestamp)`` for a list response, as
+    ``condition()`` computes them, for views that cannot use the decorator.
+    """
+    etag = list_etag(request)
+    last_modified = list_last_modified(request)
+    return (
+        quote_etag(etag) if etag else None,
+        int(last_modified.timestamp()) if last_modified else None,
+    )
@@ -0,0 +1,33 @@
+# gunpla/filters.py
+# Query parameter -> lookup; series and grade match the lookup table name.
+EXACT_FILTERS = {'series': 'series__name', 'grade': 'grade__name', 'scale': 'scale'}
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def filter_gunplas(queryset, params):
+    """
+    Apply the list query parameters to ``queryset``.
+
+    - ``series``, ``grade``, ``scale``: exact match, each backed by an index.
+    - ``q``: name prefix. It is written as a ``name >= q AND name < q'``
+      range so it can use the ``name`` index (a ``LIKE`` is case-insensitive
+      on SQLite and cannot). The match is therefore case-sensitive.
+    - ``match=contains``: make ``q`` a case-insensitive substring match
+      instead. This cannot use an index and scans the table.
+    """
+    for param, lookup in EXACT_FILTERS.items():
+        value = params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: value})
+
+    q = params.get('q')
+    if q:
+        if params.get('match') == 'contains':
+            queryset = queryset.filter(name__icontains=q)
+        else:
+            queryset = queryset.filter(name__gte=q, name__lt=prefix_upper_bound(q))
+    return queryset
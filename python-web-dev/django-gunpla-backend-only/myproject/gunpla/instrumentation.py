@@ -0,0 +1,185 @@
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('gunpla.requests')
+
+_metrics = ContextVar('gunpla_request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL statements than its ``GUNPLA_QUERY_BUDGETS`` entry allows."""
+
+
+class RequestMetrics:
+    """SQL statements, database time and serialization time of one request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # A connection.execute_wrapper(): times every statement on the connection.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.statements[sql] += 1
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.start
+
+    def repeated(self, threshold):
+        """Statements run at least ``threshold`` times: likely N+1 queries."""
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_time * 1000:.2f}, '
+            f'total;dur={self.duration * 1000:.2f}'
+        )
+
+
+class QueryTotals:
+    """SQL statements and database time summed over every instrumented request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.db_time = 0.0
+
+    def add(self, metrics):
+        with self._lock:
+            self.queries += metrics.queries
+            self.db_time += metrics.db_time
+
+
+query_totals = QueryTotals()
+
+
+def current_metrics():
+    return _metrics.get()
+
+
+def timed_serialization(func):
+    """Add the time spent in ``func`` to the current request's serialization time."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _metrics.get()
+        if metrics is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.serialize_time += time.perf_counter() - start
+    return wrapper
+
+
+class QueryMetricsMiddleware:
+    """
+    Count the SQL statements of each request and time them, along with JSON
+    serialization. The figures go out as a ``Server-Timing`` header and a
+    ``gunpla.requests`` log record whose ``extra`` fields hold them.
+
+    Statements repeated ``GUNPLA_REPEATED_QUERY_THRESHOLD`` times in one
+    request are logged as a possible N+1. ``GUNPLA_QUERY_BUDGETS`` caps the
+    statements of a view, keyed ``"<METHOD> <view class>"``; going over is
+    logged, or raised as ``QueryBudgetExceeded`` with
+    ``GUNPLA_QUERY_BUDGET_STRICT`` (the test suite sets it).
+
+    Queries an NDJSON export runs while streaming, after the view has
+    returned, are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            query_totals.add(metrics)
+            _metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        # Connections are per thread, and async views reach the ORM through
+        # sync_to_async on the request's thread-sensitive thread: wrap that
+        # thread's connections, not the event loop's.
+        request_connections = await sync_to_async(connections.all)()
+        try:
+            with ExitStack() as stack:
+                for connection in request_connections:
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = await self.get_response(request)
+        finally:
+            query_totals.add(metrics)
+            _metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        # Read off the resolver rather than in a process_view() hook, which
+        # Django would run through sync_to_async under ASGI.
+        match = request.resolver_match
+        if match is not None:
+            metrics.view = f'{request.method} {getattr(match.func, "view_class", match.func).__name__}'
+        response.headers['Server-Timing'] = metrics.server_timing()
+        self.log(request, response, metrics)
+        self.check_budget(request, metrics)
+        return response
+
+    def log(self, request, response, metrics):
+        logger.info(
+            '%s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'view': metrics.view,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': round(metrics.db_time * 1000, 2),
+                'serialize_ms': round(metrics.serialize_time * 1000, 2),
+                'duration_ms': round(metrics.duration * 1000, 2),
+            },
+        )
+        threshold = getattr(settings, 'GUNPLA_REPEATED_QUERY_THRESHOLD', 5)
+        for sql, count in metrics.repeated(threshold).items():
+            logger.warning('Possible N+1 in %s: %d x %s', metrics.view or request.path, count, sql)
+
+    def check_budget(self, request, metrics):
+        budget = getattr(settings, 'GUNPLA_QUERY_BUDGETS', {}).get(metrics.view)
+        if budget is None or metrics.queries <= budget:
+            return
+        message = f'{metrics.view} ran {metrics.queries} queries, over its budget of {budget}'
+        if getattr(settings, 'GUNPLA_QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,99 @@
+import threading
+from asgiref.sync import sync_to_async
+from django.db import models, transaction
+from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor
+
+
+class LookupCache:
+    """
+    Lookup rows (``Series``, ``Grade``) by name, held in process so writes
+    resolve the strings clients send without a query. Lookup rows are never
+    updated or deleted, so an entry cannot go stale: a name missing here is
+    fetched (or created) once and then remembered.
+
+    Entries are only added once the surrounding transaction commits, so a
+    rollback cannot leave a row that does not exist in the cache.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def get(self, model, name):
+        key = (model, name)
+        row = self._rows.get(key)
+        if row is None:
+            row, _ = model.objects.get_or_create(name=name)
+            # Runs immediately outside of atomic blocks.
+            transaction.on_commit(lambda: self.remember(key, row))
+        return row
+
+    async def aget(self, model, name):
+        row = self._rows.get((model, name))
+        if row is None:
+            row = await sync_to_async(self.get)(model, name)
+        return row
+
+    def remember(self, key, row):
+        with self._lock:
+            self._rows[key] = row
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+lookup_cache = LookupCache()
+
+
+class LookupDescriptor(ForwardManyToOneDescriptor):
+    """Accepts a name as well as an instance: ``gunpla.series = 'Gundam 00'``."""
+
+    def __set__(self, instance, value):
+        if isinstance(value, str):
+            value = lookup_cache.get(self.field.related_model, value)
+        super().__set__(instance, value)
+
+
+class LookupForeignKey(models.ForeignKey):
+    """
+    Foreign key to a name lookup table that can be assigned the name itself,
+    so ``Gunpla(series='Gundam 00')`` and ``Gunpla.objects.create(...)`` keep
+    taking the strings the API exposes.
+    """
+    forward_related_accessor_class = LookupDescriptor
+
+    def deconstruct(self):
+        # Only the descriptor differs; migrations see a plain ForeignKey.
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.ForeignKey', args, kwargs
+
+
+def lookup_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, LookupForeignKey)]
+
+
+def resolve_lookups(model, items):
+    """
+    Replace lookup names in ``items`` (dicts of ``model`` fields) with rows,
+    fetching each distinct name at most once. Used by bulk writes.
+    """
+    for field in lookup_fields(model):
+        rows = {}
+        for data in items:
+            name = data.get(field.name)
+            if isinstance(name, str):
+                if name not in rows:
+                    rows[name] = lookup_cache.get(field.related_model, name)
+                data[field.name] = rows[name]
+    return items
+
+
+async def aresolve_lookups(model, data):
+    """Async ``resolve_lookups`` for one dict; keeps ORM access off the event loop."""
+    data = dict(data)
+    for field in lookup_fields(model):
+        name = data.get(field.name)
+        if isinstance(name, str):
+            data[field.name] = await lookup_cache.aget(field.related_model, name)
+    return data
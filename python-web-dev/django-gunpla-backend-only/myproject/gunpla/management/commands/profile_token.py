@@ -0,0 +1,10 @@
+# gunpla/management/commands/profile_token.py
+from django.core.management.base import BaseCommand
+from gunpla.profiling import HEADER, profile_token
+
+
+class Command(BaseCommand):
+    help = 'Print a header value that profiles the request carrying it (see GUNPLA_PROFILE_DIR).'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{HEADER}: {profile_token()}')
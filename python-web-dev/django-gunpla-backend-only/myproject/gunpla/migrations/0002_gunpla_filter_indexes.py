@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["name"], name="gunpla_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["series"], name="gunpla_series_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["grade"], name="gunpla_grade_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["scale"], name="gunpla_scale_idx"),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Full-text search index over Gunpla.name and Gunpla.series.
+#
+# FTS5 is SQLite-only, so on other databases this migration is a no-op and
+# gunpla.search falls back to a substring scan.
+
+from django.db import migrations
+
+FTS_SETUP = [
+    """
+    CREATE VIRTUAL TABLE gunpla_gunpla_fts USING fts5(
+        name, series, content='gunpla_gunpla', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_ai AFTER INSERT ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, new.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_ad AFTER DELETE ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_au AFTER UPDATE OF name, series ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, new.series);
+    END
+    """,
+    "INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts) VALUES ('rebuild')",
+]
+
+FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ai",
+    "DROP TABLE IF EXISTS gunpla_gunpla_fts",
+]
+
+
+def run_on_sqlite(schema_editor, statements):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts(apps, schema_editor):
+    run_on_sqlite(schema_editor, FTS_SETUP)
+
+
+def drop_fts(apps, schema_editor):
+    run_on_sqlite(schema_editor, FTS_TEARDOWN)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0002_gunpla_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
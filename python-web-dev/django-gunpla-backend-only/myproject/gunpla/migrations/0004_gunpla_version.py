@@ -0,0 +1,66 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:48
+#
+# The triggers that maintain the counter are SQLite-only; on other databases
+# the row is never bumped and gunpla.conditional does not emit list ETags.
+
+from django.db import migrations, models
+
+BUMP = (
+    "UPDATE gunpla_gunplaversion SET version = version + 1, "
+    "updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = 1;"
+)
+
+VERSION_SETUP = [
+    f"CREATE TRIGGER gunpla_gunpla_version_ai AFTER INSERT ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_au AFTER UPDATE ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_ad AFTER DELETE ON gunpla_gunpla BEGIN {BUMP} END",
+]
+
+VERSION_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ai",
+]
+
+
+def create_version_row(apps, schema_editor):
+    from django.utils import timezone
+
+    GunplaVersion = apps.get_model("gunpla", "GunplaVersion")
+    GunplaVersion.objects.create(pk=1, version=0, updated_at=timezone.now())
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in VERSION_SETUP:
+            schema_editor.execute(statement)
+
+
+def drop_version_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in VERSION_TEARDOWN:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0003_gunpla_fts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GunplaVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(create_version_row, drop_version_triggers),
+    ]
@@ -0,0 +1,182 @@
+# Moves Gunpla.series and Gunpla.grade into Series/Grade lookup tables.
+#
+# The old text columns are renamed aside, foreign keys added next to them and
+# filled from the distinct names; 0006 then drops the text columns. The FTS
+# and version triggers read gunpla_gunpla.series and would not survive the
+# table remakes SQLite needs, so they are dropped here and recreated in 0006.
+#
+# The renamed columns are made nullable so that migrating back from 0006,
+# which re-adds them empty on a populated table, can run copy_names_back.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+TRIGGER_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ai",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ai",
+    "DROP TABLE IF EXISTS gunpla_gunpla_fts",
+]
+
+BUMP = (
+    "UPDATE gunpla_gunplaversion SET version = version + 1, "
+    "updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = 1;"
+)
+
+# The 0003/0004 triggers, restored when migrating backwards.
+TRIGGER_SETUP = [
+    f"CREATE TRIGGER gunpla_gunpla_version_ai AFTER INSERT ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_au AFTER UPDATE ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_ad AFTER DELETE ON gunpla_gunpla BEGIN {BUMP} END",
+    """
+    CREATE VIRTUAL TABLE gunpla_gunpla_fts USING fts5(
+        name, series, content='gunpla_gunpla', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_ai AFTER INSERT ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, new.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_ad AFTER DELETE ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_gunpla_fts_au AFTER UPDATE OF name, series ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, new.series);
+    END
+    """,
+    "INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts) VALUES ('rebuild')",
+]
+
+
+def run_on_sqlite(schema_editor, statements):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    run_on_sqlite(schema_editor, TRIGGER_TEARDOWN)
+
+
+def restore_triggers(apps, schema_editor):
+    run_on_sqlite(schema_editor, TRIGGER_SETUP)
+
+
+def fill_lookups(apps, schema_editor):
+    Gunpla = apps.get_model("gunpla", "Gunpla")
+    for model_name, field in (("Series", "series"), ("Grade", "grade")):
+        model = apps.get_model("gunpla", model_name)
+        names = Gunpla.objects.values_list(f"{field}_name", flat=True).distinct()
+        for row in model.objects.bulk_create([model(name=name) for name in names]):
+            Gunpla.objects.filter(**{f"{field}_name": row.name}).update(**{field: row})
+
+
+def copy_names_back(apps, schema_editor):
+    Gunpla = apps.get_model("gunpla", "Gunpla")
+    for model_name, field in (("Series", "series"), ("Grade", "grade")):
+        model = apps.get_model("gunpla", model_name)
+        for row in model.objects.all():
+            Gunpla.objects.filter(**{field: row}).update(**{f"{field}_name": row.name})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0004_gunpla_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_triggers, restore_triggers),
+        migrations.CreateModel(
+            name="Series",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=120, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Grade",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name="gunpla",
+            name="gunpla_series_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="gunpla",
+            name="gunpla_grade_idx",
+        ),
+        migrations.RenameField(
+            model_name="gunpla",
+            old_name="series",
+            new_name="series_name",
+        ),
+        migrations.RenameField(
+            model_name="gunpla",
+            old_name="grade",
+            new_name="grade_name",
+        ),
+        migrations.AlterField(
+            model_name="gunpla",
+            name="series_name",
+            field=models.CharField(max_length=120, null=True),
+        ),
+        migrations.AlterField(
+            model_name="gunpla",
+            name="grade_name",
+            field=models.CharField(max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="gunpla",
+            name="series",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="gunpla.series",
+            ),
+        ),
+        migrations.AddField(
+            model_name="gunpla",
+            name="grade",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="gunpla.grade",
+            ),
+        ),
+        migrations.RunPython(fill_lookups, copy_names_back),
+    ]
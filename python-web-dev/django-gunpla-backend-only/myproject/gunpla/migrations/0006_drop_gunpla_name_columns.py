@@ -0,0 +1,123 @@
+# Second half of the Series/Grade move: drops the old text columns, makes
+# the foreign keys required and recreates the triggers dropped by 0005.
+#
+# The FTS index still covers name and series; its content table is now the
+# gunpla_gunpla_search view, which joins the series name in.
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BUMP = (
+    "UPDATE gunpla_gunplaversion SET version = version + 1, "
+    "updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = 1;"
+)
+
+SERIES_NAME = "(SELECT name FROM gunpla_series WHERE id = {row}.series_id)"
+
+TRIGGER_SETUP = [
+    f"CREATE TRIGGER gunpla_gunpla_version_ai AFTER INSERT ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_au AFTER UPDATE ON gunpla_gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER gunpla_gunpla_version_ad AFTER DELETE ON gunpla_gunpla BEGIN {BUMP} END",
+    """
+    CREATE VIEW gunpla_gunpla_search AS
+    SELECT g.id, g.name, s.name AS series
+    FROM gunpla_gunpla g JOIN gunpla_series s ON s.id = g.series_id
+    """,
+    """
+    CREATE VIRTUAL TABLE gunpla_gunpla_fts USING fts5(
+        name, series, content='gunpla_gunpla_search', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER gunpla_gunpla_fts_ai AFTER INSERT ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, {SERIES_NAME.format(row='new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER gunpla_gunpla_fts_ad AFTER DELETE ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, {SERIES_NAME.format(row='old')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER gunpla_gunpla_fts_au AFTER UPDATE OF name, series_id ON gunpla_gunpla BEGIN
+        INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, {SERIES_NAME.format(row='old')});
+        INSERT INTO gunpla_gunpla_fts(rowid, name, series)
+        VALUES (new.id, new.name, {SERIES_NAME.format(row='new')});
+    END
+    """,
+    "INSERT INTO gunpla_gunpla_fts(gunpla_gunpla_fts) VALUES ('rebuild')",
+]
+
+TRIGGER_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_fts_ai",
+    "DROP TABLE IF EXISTS gunpla_gunpla_fts",
+    "DROP VIEW IF EXISTS gunpla_gunpla_search",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_version_ai",
+]
+
+
+def run_on_sqlite(schema_editor, statements):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_triggers(apps, schema_editor):
+    run_on_sqlite(schema_editor, TRIGGER_SETUP)
+
+
+def drop_triggers(apps, schema_editor):
+    run_on_sqlite(schema_editor, TRIGGER_TEARDOWN)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0005_series_grade_lookups"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="gunpla",
+            name="series_name",
+        ),
+        migrations.RemoveField(
+            model_name="gunpla",
+            name="grade_name",
+        ),
+        migrations.AlterField(
+            model_name="gunpla",
+            name="series",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="gunpla.series",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gunpla",
+            name="grade",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="gunpla.grade",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["series"], name="gunpla_series_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gunpla",
+            index=models.Index(fields=["grade"], name="gunpla_grade_idx"),
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
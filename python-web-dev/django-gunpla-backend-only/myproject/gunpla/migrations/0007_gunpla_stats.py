@@ -0,0 +1,109 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:46
+#
+# Triggers keep gunpla_gunplastat counting the rows per series, grade and
+# scale value. They are SQLite-only; on other databases gunpla.stats
+# aggregates the Gunpla table instead.
+
+from django.db import migrations, models
+
+STATS_TABLE = "gunpla_gunplastat"
+# Dimension -> its value for a gunpla_gunpla row ({row}: new or old).
+DIMENSIONS = {
+    "series": "(SELECT name FROM gunpla_series WHERE id = {row}.series_id)",
+    "grade": "(SELECT name FROM gunpla_grade WHERE id = {row}.grade_id)",
+    "scale": "{row}.scale",
+}
+
+
+def count_statements(row, delta):
+    statements = []
+    for dimension, expression in DIMENSIONS.items():
+        value = expression.format(row=row)
+        if delta > 0:
+            # value IS ... also matches NULL scales, which a unique upsert would not.
+            statements.append(
+                f"INSERT INTO {STATS_TABLE} (dimension, value, count) "
+                f"SELECT '{dimension}', v, 0 FROM (SELECT {value} AS v) WHERE NOT EXISTS ("
+                f"SELECT 1 FROM {STATS_TABLE} WHERE dimension = '{dimension}' AND value IS v);"
+            )
+        statements.append(
+            f"UPDATE {STATS_TABLE} SET count = count + ({delta}) "
+            f"WHERE dimension = '{dimension}' AND value IS {value};"
+        )
+    return " ".join(statements)
+
+
+PRUNE = f"DELETE FROM {STATS_TABLE} WHERE count <= 0;"
+
+STATS_SETUP = [
+    f"CREATE TRIGGER gunpla_gunpla_stats_ai AFTER INSERT ON gunpla_gunpla BEGIN "
+    f"{count_statements('new', 1)} END",
+    f"CREATE TRIGGER gunpla_gunpla_stats_ad AFTER DELETE ON gunpla_gunpla BEGIN "
+    f"{count_statements('old', -1)} {PRUNE} END",
+    f"CREATE TRIGGER gunpla_gunpla_stats_au AFTER UPDATE OF series_id, grade_id, scale ON gunpla_gunpla BEGIN "
+    f"{count_statements('old', -1)} {count_statements('new', 1)} {PRUNE} END",
+    # Backfill the rows that already exist.
+    f"""
+    INSERT INTO {STATS_TABLE} (dimension, value, count)
+    SELECT 'series', s.name, COUNT(*) FROM gunpla_gunpla g
+        JOIN gunpla_series s ON s.id = g.series_id GROUP BY s.name
+    UNION ALL
+    SELECT 'grade', gr.name, COUNT(*) FROM gunpla_gunpla g
+        JOIN gunpla_grade gr ON gr.id = g.grade_id GROUP BY gr.name
+    UNION ALL
+    SELECT 'scale', g.scale, COUNT(*) FROM gunpla_gunpla g GROUP BY g.scale
+    """,
+]
+
+STATS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_stats_au",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_stats_ad",
+    "DROP TRIGGER IF EXISTS gunpla_gunpla_stats_ai",
+]
+
+
+def create_stats_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in STATS_SETUP:
+            schema_editor.execute(statement)
+
+
+def drop_stats_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in STATS_TEARDOWN:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gunpla", "0006_drop_gunpla_name_columns"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GunplaStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=10)),
+                ("value", models.CharField(max_length=120, null=True)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["dimension", "value"], name="gunpla_stat_value_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_stats_triggers, drop_stats_triggers),
+    ]
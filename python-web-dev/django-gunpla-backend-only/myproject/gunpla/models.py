@@ -1,11 +1,79 @@
 # gunpla/models.py
 from django.db import models
+from .lookups import LookupForeignKey
+
+
+class Series(models.Model):
+    name = models.CharField(max_length=120, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Grade(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class GunplaManager(models.Manager):
+    # Instances always carry their series/grade names; values_list() reads
+    # them as series__name/grade__name instead.
+    def get_queryset(self):
+        return super().get_queryset().select_related('series', 'grade')
+
 
 class Gunpla(models.Model):
     name = models.CharField(max_length=80)
-    series = models.CharField(max_length=120)
-    grade = models.CharField(max_length=50)
+    # Assignable by name, see gunpla.lookups.
+    series = LookupForeignKey(Series, on_delete=models.PROTECT, db_index=False)
+    grade = LookupForeignKey(Grade, on_delete=models.PROTECT, db_index=False)
     scale = models.CharField(max_length=20, blank=True, null=True)
 
+    objects = GunplaManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='gunpla_name_idx'),
+            models.Index(fields=['series'], name='gunpla_series_idx'),
+            models.Index(fields=['grade'], name='gunpla_grade_idx'),
+            models.Index(fields=['scale'], name='gunpla_scale_idx'),
+        ]
+
     def __str__(self):
         return self.name
+
+
+class GunplaVersion(models.Model):
+    """
+    Single-row change counter for the Gunpla table.
+
+    Database triggers bump ``version`` and ``updated_at`` on every insert,
+    update and delete, including bulk writes, so list ETags can be checked
+    with one primary-key lookup instead of a query and a serialize.
+    """
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).first()
+
+
+class GunplaStat(models.Model):
+    """
+    Number of Gunpla per distinct series, grade and scale value.
+
+    Database triggers adjust the counts on every insert, update and delete,
+    so ``/gunplas/stats`` reads one row per value instead of aggregating the
+    Gunpla table.
+    """
+    dimension = models.CharField(max_length=10)
+    value = models.CharField(max_length=120, null=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['dimension', 'value'], name='gunpla_stat_value_idx'),
+        ]
@@ -0,0 +1,83 @@
+# gunpla/pagination.py
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+from .serializers import GunplaReadSerializer
+
+
+class GunplaCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key.
+
+    Each page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n``,
+    so page 10,000 costs the same as page 1. The cursor itself is an opaque
+    base64 token produced by DRF.
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+    def _get_position_from_instance(self, instance, ordering):
+        # Pages of the fast read path are values_list() tuples, not models.
+        if isinstance(instance, tuple):
+            field_name = ordering[0].lstrip('-')
+            return str(instance[GunplaReadSerializer.fields.index(field_name)])
+        return super()._get_position_from_instance(instance, ordering)
+
+    async def apaginate_queryset(self, rows, request):
+        """
+        Async ORM variant of ``paginate_queryset`` for the ASGI views.
+
+        ``id`` is unique, so a cursor never needs an offset: a page is just
+        ``id > position`` (or ``id < position`` walking backwards). The
+        cursors are the same tokens the sync view produces and accepts.
+        ``request`` is a DRF ``Request``; links are left in ``next_link`` and
+        ``prev_link``.
+        """
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        if reverse:
+            rows = rows.order_by('-id')
+            if position is not None:
+                rows = rows.filter(id__lt=position)
+        else:
+            rows = rows.order_by('id')
+            if position is not None:
+                rows = rows.filter(id__gt=position)
+        page = [row async for row in rows[:self.page_size + 1]]
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+
+        if reverse:
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        self.next_link = self.prev_link = None
+        if page:
+            if has_next:
+                self.next_link = self.encode_cursor(Cursor(0, False, self.row_position(page[-1])))
+            if has_previous:
+                self.prev_link = self.encode_cursor(Cursor(0, True, self.row_position(page[0])))
+        return page
+
+    @staticmethod
+    def row_position(row):
+        return str(row[GunplaReadSerializer.fields.index('id')])
+
+    def get_paginated_response(self, data):
+        return Response({
+            'results': data,
+            'next': self.get_next_link(),
+            'prev': self.get_previous_link(),
+        })
+
+
+def wants_unpaginated(request):
+    """The full, unpaginated list is only returned when explicitly asked for."""
+    return request.query_params.get('all', '').lower() in ('1', 'true', 'yes')
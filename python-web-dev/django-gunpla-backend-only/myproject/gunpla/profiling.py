@@ -0,0 +1,149 @@
+# gunpla/profiling.py
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger('gunpla.profiling')
+
+HEADER = 'X-Gunpla-Profile'
+SALT = 'gunpla.profiling'
+
+
+class Sampler:
+    """
+    Stack samples of one thread, taken every ``interval`` seconds by a
+    background thread and counted as collapsed stacks: one
+    ``outer;...;inner count`` line per distinct stack, the input format of
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=0.005, max_samples=20000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='gunpla-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while self.samples < self.max_samples and not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[collapse(frame)] += 1
+            self.samples += 1
+
+    def write(self, path):
+        with open(path, 'w') as folded:
+            for stack, count in self.stacks.most_common():
+                folded.write(f'{stack} {count}\n')
+
+
+def collapse(frame):
+    """``frame``'s stack as ``outer;...;inner``, one ``function (file:line)`` per frame."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', code.co_name)  # co_qualname: Python 3.11+
+        names.append(f'{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def profile_token():
+    """A ``X-Gunpla-Profile`` value, good for ``GUNPLA_PROFILE_TOKEN_MAX_AGE`` seconds."""
+    return signing.TimestampSigner(salt=SALT).sign('profile')
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in sampling profiler. With ``GUNPLA_PROFILE_DIR`` set, a request
+    carrying an ``X-Gunpla-Profile`` header from ``manage.py profile_token``
+    (signed with ``SECRET_KEY``) has its thread's stack sampled every
+    ``GUNPLA_PROFILE_INTERVAL`` seconds, and the collapsed stacks are
+    written to ``GUNPLA_PROFILE_DIR``. The file name comes back in
+    ``X-Gunpla-Profile-File``. Other requests only pay for a header lookup;
+    without ``GUNPLA_PROFILE_DIR`` Django drops the middleware at startup.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.directory = getattr(settings, 'GUNPLA_PROFILE_DIR', None)
+        if not self.directory:
+            raise MiddlewareNotUsed
+        os.makedirs(self.directory, exist_ok=True)
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if not self.profiled(request):
+            # In async mode this hands back get_response's own coroutine.
+            return self.get_response(request)
+        if self.async_mode:
+            return self.__acall__(request)
+        sampler = self.sampler()
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        return self.finish(request, response, sampler)
+
+    async def __acall__(self, request):
+        # Samples the event loop's thread: the awaits of this request and of
+        # any other the loop serves meanwhile. ORM calls run in another thread.
+        sampler = self.sampler()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(sampler.stop, thread_sensitive=False)()
+        return await sync_to_async(self.finish, thread_sensitive=False)(request, response, sampler)
+
+    def profiled(self, request):
+        token = request.headers.get(HEADER)
+        if token is None:
+            return False
+        try:
+            signing.TimestampSigner(salt=SALT).unsign(
+                token, max_age=getattr(settings, 'GUNPLA_PROFILE_TOKEN_MAX_AGE', 3600)
+            )
+        except signing.BadSignature:
+            logger.warning('Ignoring an invalid or expired %s header on %s', HEADER, request.path)
+            return False
+        return True
+
+    def sampler(self):
+        return Sampler(
+            threading.get_ident(),
+            getattr(settings, 'GUNPLA_PROFILE_INTERVAL', 0.005),
+            getattr(settings, 'GUNPLA_PROFILE_MAX_SAMPLES', 20000),
+        ).start()
+
+    def finish(self, request, response, sampler):
+        match = request.resolver_match
+        view = getattr(match.func, 'view_class', match.func).__name__ if match else 'unmatched'
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-{view}-{uuid.uuid4().hex[:8]}.folded'
+        sampler.write(os.path.join(self.directory, name))
+        logger.info('Wrote %d samples of %s %s to %s', sampler.samples, request.method, request.path, name)
+        response[f'{HEADER}-File'] = name
+        return response
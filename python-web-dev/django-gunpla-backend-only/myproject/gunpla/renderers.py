@@ -0,0 +1,39 @@
+# gunpla/renderers.py
+from rest_framework.renderers import JSONRenderer
+from .instrumentation import timed_serialization
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that uses orjson when it is installed.
+
+    The output is byte-identical to DRF's compact, non-ASCII-escaping
+    renderer. Anything orjson cannot handle (indented output, DRF's lazy
+    strings and custom types) falls back to the stock renderer.
+    """
+
+    @timed_serialization
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Match JSONRenderer, which always escapes these two separators.
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """
+    Registers ``?format=columnar`` with DRF's format negotiation. The output
+    is plain JSON; the list views switch to ``GunplaColumnarSerializer``.
+    """
+    format = 'columnar'
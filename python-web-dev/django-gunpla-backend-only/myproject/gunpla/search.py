@@ -0,0 +1,50 @@
+# gunpla/search.py
+import re
+from django.db import connection
+from .filters import filter_gunplas
+from .models import Gunpla, Series, Grade
+from .serializers import GunplaReadSerializer
+
+FTS_TABLE = 'gunpla_gunpla_fts'
+# bm25() column weights: a hit in the name counts more than one in the series.
+NAME_WEIGHT = 10.0
+SERIES_WEIGHT = 1.0
+
+
+def build_match_query(q):
+    """
+    Turn free text from the search box into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"rx"* "78"*``), so FTS5
+    operators typed by users are treated as plain text.
+    """
+    terms = re.findall(r'\w+', q)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def search_gunplas(q, limit):
+    """Return up to ``limit`` Gunpla rows matching ``q``, best BM25 score first."""
+    match = build_match_query(q)
+    if not match:
+        return []
+    if not fts_available():
+        # Other databases have no FTS5; fall back to a substring scan.
+        queryset = filter_gunplas(Gunpla.objects.all(), {'q': q, 'match': 'contains'})
+        return GunplaReadSerializer(queryset.order_by('id')[:limit]).data
+
+    # Rank and limit inside FTS5 first, then join only the winning rows.
+    sql = (
+        f'SELECT g.id, g.name, s.name, gr.name, g.scale FROM {Gunpla._meta.db_table} g JOIN ('
+        f'SELECT rowid, bm25({FTS_TABLE}, %s, %s) AS score FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s'
+        f') hits ON g.id = hits.rowid '
+        f'JOIN {Series._meta.db_table} s ON s.id = g.series_id '
+        f'JOIN {Grade._meta.db_table} gr ON gr.id = g.grade_id ORDER BY hits.score'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [NAME_WEIGHT, SERIES_WEIGHT, match, limit])
+        return GunplaReadSerializer(cursor.fetchall()).data
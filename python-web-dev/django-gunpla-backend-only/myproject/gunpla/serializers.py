@@ -1,8 +1,23 @@
 # gunpla/serializers.py
+from django.db.models import QuerySet
 from rest_framework import serializers
+from .instrumentation import timed_serialization
 from .models import Gunpla
 
+class LookupField(serializers.CharField):
+    """
+    A ``Series``/``Grade`` foreign key read and written as its name. The
+    name is resolved to a row when it is assigned to the model.
+    """
+
+    def to_representation(self, value):
+        return value.name
+
+
 class GunplaSerializer(serializers.ModelSerializer):
+    series = LookupField(max_length=120)
+    grade = LookupField(max_length=50)
+
     class Meta:
         model = Gunpla
         fields = ['id', 'name', 'series', 'grade', 'scale']
@@ -20,4 +35,83 @@ class GunplaSerializer(serializers.ModelSerializer):
     def validate_grade(self, value):
         if not value:
             raise serializers.ValidationError("Grade field is required.")
-        return value
\ No newline at end of file
+        return value
+
+class GunplaReadSerializer:
+    """
+    Read-only fast path for listing Gunpla.
+
+    Skips ModelSerializer field introspection entirely: rows come straight
+    from ``.values_list()`` and are zipped against a field tuple computed
+    once at import time. ``columns`` are the matching ``values_list()``
+    lookups, reading series and grade names through their foreign keys, so
+    the resulting dicts are identical to ``GunplaSerializer(many=True).data``.
+    """
+    fields = tuple(GunplaSerializer.Meta.fields)
+    columns = ('id', 'name', 'series__name', 'grade__name', 'scale')
+
+    def __init__(self, instance):
+        self.instance = instance
+
+    @classmethod
+    def rows(cls, queryset):
+        return queryset.values_list(*cls.columns)
+
+    @property
+    @timed_serialization
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet):
+            rows = self.rows(rows)
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+
+class GunplaColumnarSerializer(GunplaReadSerializer):
+    """
+    Column-oriented variant of ``GunplaReadSerializer`` for ``?format=columnar``.
+
+    Returns one array per field instead of one object per row. The
+    low-cardinality ``categorical`` fields are dictionary-encoded: ``values``
+    holds each distinct value once, in order of first appearance, and
+    ``codes`` holds one index into it per row::
+
+        {"count": 2, "columns": {"id": [1, 2], "name": ["RX-78-2", "Zaku II"],
+         "series": {"values": ["Mobile Suit Gundam"], "codes": [0, 0]}, ...}}
+
+    ``decodeColumnar()`` in the React client turns this back into row objects.
+    """
+    categorical = ('series', 'grade', 'scale')
+
+    @property
+    @timed_serialization
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet):
+            rows = self.rows(rows)
+        rows = list(rows)
+        columns = {}
+        for field, values in zip(self.fields, zip(*rows) if rows else [()] * len(self.fields)):
+            columns[field] = encode_column(values) if field in self.categorical else list(values)
+        return {'count': len(rows), 'columns': columns}
+
+
+def encode_column(values):
+    """Dictionary-encode ``values`` as ``{"values": [distinct...], "codes": [index...]}``."""
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return {'values': list(index), 'codes': codes}
+
+
+def wants_columnar(request):
+    """True for ``?format=columnar`` (DRF's ``Request`` proxies ``GET``)."""
+    return request.GET.get('format') == 'columnar'
+
+
+def format_errors(errors):
+    """Flatten serializer errors into the "<Field> field is required." messages the API returns."""
+    messages = []
+    for field, field_errors in errors.items():
+        for error in field_errors:
+            messages.append(f"{field.capitalize()} field is required.")
+    return messages
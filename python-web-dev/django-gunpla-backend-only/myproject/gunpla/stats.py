@@ -0,0 +1,37 @@
+from django.db import connection
+from django.db.models import Count
+from .models import Gunpla, GunplaStat
+
+# Dimension -> the Gunpla lookup holding its value.
+DIMENSIONS = {'series': 'series__name', 'grade': 'grade__name', 'scale': 'scale'}
+
+
+def stat_rows():
+    """``(dimension, value, count)`` rows, from the summary table where triggers maintain it."""
+    if connection.vendor == 'sqlite':
+        return GunplaStat.objects.values_list('dimension', 'value', 'count')
+    return aggregate_rows()
+
+
+def aggregate_rows():
+    """The same rows computed with GROUP BY over the Gunpla table, O(rows)."""
+    rows = []
+    for dimension, lookup in DIMENSIONS.items():
+        counts = Gunpla.objects.order_by().values_list(lookup).annotate(count=Count('id'))
+        rows.extend((dimension, value, count) for value, count in counts)
+    return rows
+
+
+def gunpla_stats():
+    """
+    Counts per series, grade and scale, most common first::
+
+        {"count": 3, "series": [{"value": "Gundam Wing", "count": 2}, ...],
+         "grade": [...], "scale": [{"value": null, "count": 1}, ...]}
+    """
+    stats = {dimension: [] for dimension in DIMENSIONS}
+    for dimension, value, count in stat_rows():
+        stats[dimension].append({'value': value, 'count': count})
+    for values in stats.values():
+        values.sort(key=lambda item: (-item['count'], item['value'] is None, item['value'] or ''))
+    return {'count': sum(item['count'] for item in stats['grade']), **stats}
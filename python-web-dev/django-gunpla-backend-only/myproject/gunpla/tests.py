@@ -1,11 +1,45 @@
 # gunpla/tests.py
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Gunpla
+from rest_framework.renderers import JSONRenderer
+from .cache import response_cache
+from .compression import ENCODERS, CompressionMiddleware, choose_encoding
+from .lookups import lookup_cache
+from .models import Gunpla, GunplaStat, GunplaVersion, Series, Grade
+from .filters import filter_gunplas
+from .instrumentation import QueryBudgetExceeded
+from .profiling import Sampler, profile_token
+from .renderers import FastJSONRenderer
+from .serializers import GunplaSerializer, GunplaReadSerializer
+from .stats import aggregate_rows
+from .streaming import astream_ndjson
 
-class GunplaAPITest(TestCase):
+@override_settings(GUNPLA_QUERY_BUDGET_STRICT=True)
+class GunplaTestCase(TestCase):
     def setUp(self):
+        # Ids are reused once a test's transaction rolls back, so cached
+        # responses must not leak from one test into the next.
+        response_cache.clear()
+        lookup_cache.clear()
+
+class GunplaAPITest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.test_gunpla = Gunpla.objects.create(
             name="RX-78-2 Gundam",
@@ -20,13 +54,13 @@ class GunplaAPITest(TestCase):
         # First, clear the DB
         Gunpla.objects.all().delete()
 
-        response = self.client.get(self.base_url)
+        response = self.client.get(self.base_url, {'all': 'true'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), [])
 
     def test_get_gunplas(self):
         """Test getting list of gunplas."""
-        response = self.client.get(self.base_url)
+        response = self.client.get(self.base_url, {'all': 'true'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()), 1)
         gunpla_data = response.json()[0]
@@ -35,6 +69,28 @@ class GunplaAPITest(TestCase):
         self.assertEqual(gunpla_data['grade'], "Master Grade")
         self.assertEqual(gunpla_data['scale'], "1/100")
 
+    def test_stream_gunplas(self):
+        """Test the NDJSON export mode via query parameter."""
+        response = self.client.get(self.base_url, {'stream': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{
+            'id': self.test_gunpla.id,
+            'name': "RX-78-2 Gundam",
+            'series': "Mobile Suit Gundam",
+            'grade': "Master Grade",
+            'scale': "1/100",
+        }])
+
+    def test_stream_gunplas_accept_header(self):
+        """Test the NDJSON export mode via content negotiation."""
+        response = self.client.get(self.base_url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        row = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(row['name'], "RX-78-2 Gundam")
+
     def test_create_gunpla(self):
         """Test creating a new gunpla."""
         data = {
@@ -69,8 +125,8 @@ class GunplaAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         gunpla_data = response.json()
         self.assertEqual(gunpla_data['name'], self.test_gunpla.name)
-        self.assertEqual(gunpla_data['series'], self.test_gunpla.series)
-        self.assertEqual(gunpla_data['grade'], self.test_gunpla.grade)
+        self.assertEqual(gunpla_data['series'], self.test_gunpla.series.name)
+        self.assertEqual(gunpla_data['grade'], self.test_gunpla.grade.name)
         self.assertEqual(gunpla_data['scale'], self.test_gunpla.scale)
 
     def test_get_nonexistent_gunpla(self):
@@ -122,3 +178,933 @@ class GunplaAPITest(TestCase):
         response = self.client.delete(f'{self.base_url}/999')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(response.json()['detail'], 'Not found.')
+
+
+class GunplaPaginationTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.bulk_create([
+            Gunpla(name=f"Kit {i}", series="Series", grade="HG", scale="1/144")
+            for i in range(5)
+        ])
+        self.base_url = "/gunplas"
+
+    def test_first_page(self):
+        """Test the default list response is a cursor page."""
+        response = self.client.get(self.base_url, {'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([g['name'] for g in data['results']], ["Kit 0", "Kit 1"])
+        self.assertIsNotNone(data['next'])
+        self.assertIsNone(data['prev'])
+
+    def test_walk_pages_forward_and_back(self):
+        """Test following next/prev cursors visits every row exactly once."""
+        seen = []
+        url = f'{self.base_url}?limit=2'
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(g['name'] for g in data['results'])
+            last_page = data
+            url = data['next']
+        self.assertEqual(seen, [f"Kit {i}" for i in range(5)])
+
+        data = self.client.get(last_page['prev']).json()
+        self.assertEqual([g['name'] for g in data['results']], ["Kit 2", "Kit 3"])
+
+    def test_limit_is_capped(self):
+        """Test the page size cannot exceed max_page_size."""
+        response = self.client.get(self.base_url, {'limit': 100000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected."""
+        response = self.client.get(self.base_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class GunplaReadSerializerTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        Gunpla.objects.create(name="ガンダム", series="Mobile Suit Gundam", grade="MG", scale=None)
+        Gunpla.objects.create(name="Line\u2028Break \"Quoted\"", series="Séries", grade="HG", scale="1/144")
+
+    def test_matches_model_serializer(self):
+        """Test the fast path returns exactly what GunplaSerializer returns."""
+        gunplas = Gunpla.objects.order_by('id')
+        expected = GunplaSerializer(gunplas, many=True).data
+        self.assertEqual(GunplaReadSerializer(gunplas).data, expected)
+
+    def test_rendering_is_byte_identical(self):
+        """Test fast serializer + FastJSONRenderer output matches the DRF defaults byte for byte."""
+        gunplas = Gunpla.objects.order_by('id')
+        expected = JSONRenderer().render(GunplaSerializer(gunplas, many=True).data)
+        actual = FastJSONRenderer().render(GunplaReadSerializer(gunplas).data)
+        self.assertEqual(actual, expected)
+
+
+class GunplaBulkTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.base_url = "/gunplas/bulk"
+
+    def test_bulk_create(self):
+        """Test creating many gunplas in one request."""
+        data = [
+            {'name': f'Kit {i}', 'series': 'Series', 'grade': 'HG', 'scale': '1/144'}
+            for i in range(3)
+        ]
+        response = self.client.post(self.base_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {'created': 3, 'errors': []})
+        self.assertEqual(Gunpla.objects.count(), 3)
+
+    @override_settings(GUNPLA_BULK_CHUNK_SIZE=2)
+    def test_bulk_create_reports_errors_per_item(self):
+        """Test invalid items are skipped and reported by index across chunks."""
+        data = [
+            {'name': 'Kit 0', 'series': 'Series', 'grade': 'HG'},
+            {'name': 'Kit 1', 'grade': 'HG'},
+            {'name': 'Kit 2', 'series': 'Series', 'grade': 'HG'},
+            {'name': 'Kit 3', 'series': 'Series', 'grade': 'HG'},
+        ]
+        response = self.client.post(self.base_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['created'], 3)
+        self.assertEqual(response.json()['errors'], [
+            {'index': 1, 'message': ['Series field is required.']}
+        ])
+        self.assertEqual(Gunpla.objects.count(), 3)
+
+    def test_bulk_create_ndjson(self):
+        """Test creating gunplas from an NDJSON body."""
+        body = '\n'.join(
+            json.dumps({'name': f'Kit {i}', 'series': 'Series', 'grade': 'HG'})
+            for i in range(2)
+        )
+        response = self.client.post(self.base_url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['created'], 2)
+
+    def test_bulk_create_requires_array(self):
+        """Test a non-array body is rejected."""
+        response = self.client.post(self.base_url, {'name': 'Kit'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        """Test updating many gunplas by id."""
+        gunpla = Gunpla.objects.create(name='Old', series='Series', grade='HG')
+        data = [
+            {'id': gunpla.id, 'name': 'New', 'series': 'Series', 'grade': 'MG', 'scale': '1/100'},
+            {'id': 999, 'name': 'Missing', 'series': 'Series', 'grade': 'HG'},
+        ]
+        response = self.client.put(self.base_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'updated': 1,
+            'errors': [{'index': 1, 'message': ['Gunpla model not found']}],
+        })
+        gunpla.refresh_from_db()
+        self.assertEqual(gunpla.name, 'New')
+        self.assertEqual(gunpla.grade.name, 'MG')
+
+    def test_bulk_delete(self):
+        """Test deleting many gunplas by id."""
+        ids = [Gunpla.objects.create(name=f'Kit {i}', series='Series', grade='HG').id for i in range(2)]
+        response = self.client.delete(self.base_url, ids + [999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'deleted': 2,
+            'errors': [{'index': 2, 'message': ['Gunpla model not found']}],
+        })
+        self.assertFalse(Gunpla.objects.exists())
+
+
+class GunplaFilterTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG", scale="1/100")
+        Gunpla.objects.create(name="RX-93 Nu Gundam", series="Char's Counterattack", grade="RG", scale="1/144")
+        Gunpla.objects.create(name="Wing Gundam Zero", series="Gundam Wing", grade="MG", scale="1/100")
+        self.base_url = "/gunplas"
+
+    def names(self, params):
+        response = self.client.get(self.base_url, {'all': 'true', **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [g['name'] for g in response.json()]
+
+    def test_exact_filters(self):
+        """Test filtering on series, grade and scale."""
+        self.assertEqual(self.names({'series': 'Gundam Wing'}), ["Wing Gundam Zero"])
+        self.assertEqual(self.names({'grade': 'MG'}), ["RX-78-2 Gundam", "Wing Gundam Zero"])
+        self.assertEqual(self.names({'grade': 'MG', 'scale': '1/144'}), [])
+
+    def test_name_prefix(self):
+        """Test q matches a name prefix."""
+        self.assertEqual(self.names({'q': 'RX-'}), ["RX-78-2 Gundam", "RX-93 Nu Gundam"])
+        self.assertEqual(self.names({'q': 'Gundam'}), [])
+
+    def test_name_contains(self):
+        """Test q with match=contains matches a substring."""
+        self.assertEqual(self.names({'q': 'nu gundam', 'match': 'contains'}), ["RX-93 Nu Gundam"])
+
+    def test_filters_apply_to_pages(self):
+        """Test filters combine with cursor pagination."""
+        response = self.client.get(self.base_url, {'grade': 'MG', 'limit': 1})
+        data = response.json()
+        self.assertEqual([g['name'] for g in data['results']], ["RX-78-2 Gundam"])
+        data = self.client.get(data['next']).json()
+        self.assertEqual([g['name'] for g in data['results']], ["Wing Gundam Zero"])
+
+    def test_filters_use_indexes(self):
+        """Test EXPLAIN shows each filter is answered from an index, not a full scan."""
+        expected = {
+            'series': 'gunpla_series_idx',
+            'grade': 'gunpla_grade_idx',
+            'scale': 'gunpla_scale_idx',
+            'q': 'gunpla_name_idx',
+        }
+        for param, index_name in expected.items():
+            queryset = filter_gunplas(Gunpla.objects.order_by('id'), {param: 'value'})
+            plan = queryset.explain()
+            self.assertIn(f'USING INDEX {index_name}', plan, f'{param}: {plan}')
+
+
+class GunplaSearchTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.nu = Gunpla.objects.create(name="RX-93 Nu Gundam", series="Char's Counterattack", grade="RG", scale="1/144")
+        Gunpla.objects.create(name="Sazabi", series="Char's Counterattack", grade="MG", scale="1/100")
+        Gunpla.objects.create(name="Wing Gundam Zero", series="Gundam Wing", grade="MG", scale="1/100")
+        self.base_url = "/gunplas/search"
+
+    def names(self, q):
+        response = self.client.get(self.base_url, {'q': q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [g['name'] for g in response.json()]
+
+    def test_search_ranks_name_matches_first(self):
+        """Test a term in the name outranks the same term in the series."""
+        Gunpla.objects.create(name="Sinanju", series="Gundam Unicorn", grade="MG")
+        self.assertEqual(self.names('wing'), ["Wing Gundam Zero"])
+        self.assertEqual(self.names('gundam')[-1], "Sinanju")
+
+    def test_search_matches_prefixes_and_series(self):
+        """Test words are prefix terms and the series is searched too."""
+        self.assertEqual(sorted(self.names('char counter')), ["RX-93 Nu Gundam", "Sazabi"])
+        self.assertEqual(self.names('saz'), ["Sazabi"])
+
+    def test_search_index_follows_writes(self):
+        """Test the triggers keep the FTS index in sync with updates and deletes."""
+        self.nu.name = "Hi-Nu Gundam"
+        self.nu.save()
+        self.assertEqual(self.names('hi'), ["Hi-Nu Gundam"])
+        self.assertEqual(self.names('rx'), [])
+        self.nu.delete()
+        self.assertEqual(self.names('hi'), [])
+
+    def test_search_ignores_fts_syntax(self):
+        """Test FTS5 operators in user input are treated as text."""
+        self.assertEqual(self.names('"saz* -('), ["Sazabi"])
+        self.assertEqual(self.names('***'), [])
+
+
+class GunplaStatsTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.nu = Gunpla.objects.create(name="RX-93 Nu Gundam", series="Char's Counterattack", grade="RG", scale="1/144")
+        Gunpla.objects.create(name="Sazabi", series="Char's Counterattack", grade="MG", scale="1/100")
+        Gunpla.objects.create(name="Wing Gundam Zero", series="Gundam Wing", grade="MG", scale="1/100")
+
+    def assertSummaryMatchesTable(self):
+        rows = GunplaStat.objects.values_list('dimension', 'value', 'count')
+        self.assertEqual(sorted(rows, key=str), sorted(aggregate_rows(), key=str))
+
+    def test_stats(self):
+        """Test counts per series, grade and scale, most common first."""
+        response = self.client.get('/gunplas/stats')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'count': 3,
+            'series': [{'value': "Char's Counterattack", 'count': 2}, {'value': "Gundam Wing", 'count': 1}],
+            'grade': [{'value': 'MG', 'count': 2}, {'value': 'RG', 'count': 1}],
+            'scale': [{'value': '1/100', 'count': 2}, {'value': '1/144', 'count': 1}],
+        })
+
+    def test_stats_follow_writes(self):
+        """Test the triggers keep the summary table in step with every kind of write."""
+        self.client.put(f'/gunplas/{self.nu.id}', {'name': 'Nu Gundam', 'series': "Gundam Wing", 'grade': 'MG'}, format='json')
+        self.assertSummaryMatchesTable()
+        self.client.post('/gunplas/bulk', [{'name': 'Zaku II', 'series': 'Mobile Suit Gundam', 'grade': 'HG'}], format='json')
+        self.client.put('/gunplas/bulk', [{'id': self.nu.id, 'name': 'Nu', 'series': 'CCA', 'grade': 'RG', 'scale': '1/144'}], format='json')
+        self.assertSummaryMatchesTable()
+        Gunpla.objects.filter(grade__name='MG').delete()
+        self.assertSummaryMatchesTable()
+        self.assertEqual(self.client.get('/gunplas/stats').json()['grade'], [
+            {'value': 'HG', 'count': 1}, {'value': 'RG', 'count': 1},
+        ])
+        # Values no row has any more are pruned.
+        self.assertFalse(GunplaStat.objects.filter(count=0).exists())
+
+    def test_stats_read_one_row_per_value(self):
+        """Test the endpoint costs one query on the summary table."""
+        with self.assertNumQueries(1):
+            self.client.get('/gunplas/stats')
+
+
+class GunplaConditionalGetTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.gunpla = Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+        self.base_url = "/gunplas"
+
+    def assertNotModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_list_etag_and_304(self):
+        """Test an unchanged list poll is answered with 304."""
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotModified(self.base_url, response['ETag'])
+
+    def test_list_etag_varies_with_query(self):
+        """Test different pages and filters get different ETags."""
+        first = self.client.get(self.base_url)['ETag']
+        filtered = self.client.get(self.base_url, {'grade': 'MG'})['ETag']
+        self.assertNotEqual(first, filtered)
+
+    def test_list_etag_changes_on_every_kind_of_write(self):
+        """Test single and bulk writes all invalidate the list ETag."""
+        etags = [self.client.get(self.base_url)['ETag']]
+        self.client.post(self.base_url, {'name': 'Zaku', 'series': 'MSG', 'grade': 'HG'}, format='json')
+        etags.append(self.client.get(self.base_url)['ETag'])
+        self.client.put(f'{self.base_url}/{self.gunpla.id}', {'name': 'RX', 'series': 'MSG', 'grade': 'HG'}, format='json')
+        etags.append(self.client.get(self.base_url)['ETag'])
+        self.client.delete(f'{self.base_url}/bulk', [self.gunpla.id], format='json')
+        etags.append(self.client.get(self.base_url)['ETag'])
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_detail_etag_and_304(self):
+        """Test an unchanged detail poll is answered with 304 and an edit is not."""
+        url = f'{self.base_url}/{self.gunpla.id}'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.client.put(url, {'name': 'RX', 'series': 'MSG', 'grade': 'HG'}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'RX')
+
+
+class GunplaResponseCacheTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.gunpla = Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+        self.url = f'/gunplas/{self.gunpla.id}'
+
+    def test_detail_is_served_from_cache(self):
+        """Test a repeated detail read is a cache hit that only reads the table version."""
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.json()['name'], "RX-78-2 Gundam")
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_detail_writes_move_the_key(self):
+        """Test updates, bulk updates and deletes are never served from the entry cached before them."""
+        self.client.get(self.url)
+        self.client.put(self.url, {'name': 'RX', 'series': 'MSG', 'grade': 'HG'}, format='json')
+        self.assertEqual(self.client.get(self.url).json()['name'], 'RX')
+        self.client.put('/gunplas/bulk', [{'id': self.gunpla.id, 'name': 'RX-78', 'series': 'MSG', 'grade': 'HG'}],
+                        format='json')
+        self.assertEqual(self.client.get(self.url).json()['name'], 'RX-78')
+        self.client.delete(self.url)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(CACHES={
+        'worker-a': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'},
+        'worker-b': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'},
+    })
+    def test_detail_is_fresh_across_workers(self):
+        """Test a write through one worker's cache is seen by a worker holding the old entry in its own."""
+        with self.settings(GUNPLA_CACHE_ALIAS='worker-a'):
+            self.client.get(self.url)
+        with self.settings(GUNPLA_CACHE_ALIAS='worker-b'):
+            self.client.put(self.url, {'name': 'RX', 'series': 'MSG', 'grade': 'HG'}, format='json')
+        with self.settings(GUNPLA_CACHE_ALIAS='worker-a'):
+            self.assertEqual(self.client.get(self.url).json()['name'], 'RX')
+
+    def test_list_cache_follows_table_version(self):
+        """Test a cached list is reused until any write bumps the table version."""
+        self.client.get('/gunplas')
+        with self.assertNumQueries(1):
+            self.client.get('/gunplas')
+        Gunpla.objects.create(name="Zaku II", series="Mobile Suit Gundam", grade="HG")
+        response = self.client.get('/gunplas')
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_cache_stats(self):
+        """Test hit and miss counters are exposed."""
+        self.client.get(self.url)
+        self.client.get(self.url)
+        response = self.client.get('/gunplas/cache')
+        self.assertEqual(response.json(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+
+class SQLiteTuningTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_pragmas(self):
+        """Test every connection gets the concurrency profile from settings."""
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('temp_store'), 2)  # MEMORY
+        self.assertEqual(self.pragma('cache_size'), -64000)
+
+
+class AsyncGunplaAPITest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = AsyncClient()
+        self.sync_client = APIClient()
+        Gunpla.objects.bulk_create([
+            Gunpla(name=f"Kit {i}", series="Series", grade="HG" if i % 2 else "MG", scale="1/144")
+            for i in range(5)
+        ])
+        self.first = Gunpla.objects.order_by('id').first()
+        self.base_url = "/async/gunplas"
+
+    async def test_list_matches_sync_view(self):
+        """Test async list pages, filters and cursors are byte-identical to the sync API."""
+        for query in ('limit=2', 'grade=MG', 'all=true'):
+            expected = await sync_to_async(self.sync_client.get)(f'/gunplas?{query}')
+            response = await self.client.get(f'{self.base_url}?{query}')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.content.replace(b'/async/gunplas', b'/gunplas'), expected.content
+            )
+
+    async def test_walk_pages_forward_and_back(self):
+        """Test following next/prev cursors visits every row exactly once."""
+        seen = []
+        url = f'{self.base_url}?limit=2'
+        while url:
+            data = (await self.client.get(url)).json()
+            seen.extend(g['name'] for g in data['results'])
+            last_page = data
+            url = data['next']
+        self.assertEqual(seen, [f"Kit {i}" for i in range(5)])
+
+        data = (await self.client.get(last_page['prev'])).json()
+        self.assertEqual([g['name'] for g in data['results']], ["Kit 2", "Kit 3"])
+        self.assertEqual((await self.client.get(self.base_url, {'cursor': 'bad'})).status_code, 404)
+
+    async def test_list_etag_and_304(self):
+        """Test the async list honours the same conditional GET as the sync one."""
+        etag = (await self.client.get(self.base_url))['ETag']
+        response = await self.client.get(self.base_url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_stream(self):
+        """Test ?stream=1 streams NDJSON from an async iterator."""
+        response = await self.client.get(self.base_url, {'stream': '1'})
+        lines = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual([row['name'] for row in lines], [f"Kit {i}" for i in range(5)])
+
+        response = astream_ndjson(Gunpla.objects.all(), GunplaSerializer.Meta.fields, chunk_size=2)
+        lines = [json.loads(line) async for line in response.streaming_content]
+        self.assertEqual(len(lines), 5)
+
+    async def test_async_stream_is_compressed(self):
+        """Test async streams from the ASGI views are compressed too."""
+        response = await self.client.get(self.base_url, {'stream': '1'}, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join([chunk async for chunk in response.streaming_content]))
+        self.assertEqual([json.loads(line)['name'] for line in body.splitlines()], [f"Kit {i}" for i in range(5)])
+
+    async def test_crud(self):
+        """Test create, read, update and delete through the async ORM."""
+        response = await self.client.post(
+            self.base_url, {'name': 'Exia', 'series': 'Gundam 00', 'grade': 'RG'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        url = f"{self.base_url}/{response.json()['id']}"
+
+        response = await self.client.put(
+            url, {'name': 'Exia Repair', 'series': 'Gundam 00', 'grade': 'RG'}, content_type='application/json'
+        )
+        self.assertEqual(response.json()['name'], 'Exia Repair')
+        self.assertEqual((await self.client.get(url)).json()['name'], 'Exia Repair')
+
+        response = await self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((await self.client.get(url)).status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_validation_errors(self):
+        """Test invalid bodies get the same 400 messages as the sync API."""
+        response = await self.client.post(self.base_url, {'name': 'Exia'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()['message'], ["Series field is required.", "Grade field is required."])
+        response = await self.client.post(self.base_url, 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompressionTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.bulk_create([
+            Gunpla(name=f"Kit {i}", series="Mobile Suit Gundam", grade="Master Grade", scale="1/100")
+            for i in range(100)
+        ])
+
+    def test_list_is_compressed_when_accepted(self):
+        """Test the list is gzipped for clients that ask, and left alone otherwise."""
+        plain = self.client.get('/gunplas')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get('/gunplas', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(len(response.content), len(plain.content) // 4)
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+
+        # The weakened ETag still validates.
+        response = self.client.get('/gunplas', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_small_responses_are_not_compressed(self):
+        """Test bodies under GUNPLA_COMPRESSION_MIN_SIZE are sent as is."""
+        response = self.client.get('/gunplas', {'limit': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_stream_is_compressed_chunk_by_chunk(self):
+        """Test the NDJSON export stays a stream and decompresses to the same lines."""
+        plain = b''.join(self.client.get('/gunplas', {'stream': '1'}).streaming_content)
+        response = self.client.get('/gunplas', {'stream': '1'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    async def test_async_mode(self):
+        """Test an async get_response makes the middleware a coroutine function, not a sync_to_async hop."""
+        async def get_response(request):
+            return await sync_to_async(self.client.get)('/gunplas')
+
+        middleware = CompressionMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        plain = await get_response(None)
+        response = await middleware(RequestFactory().get('/gunplas', headers={'Accept-Encoding': 'gzip'}))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_choose_encoding(self):
+        """Test q-values win over server order, which breaks ties, and q=0 refuses."""
+        encodings = ['zstd', 'br', 'gzip']
+        self.assertEqual(choose_encoding('gzip, br, zstd', encodings), 'zstd')
+        self.assertEqual(choose_encoding('gzip;q=1.0, br;q=0.5', encodings), 'gzip')
+        self.assertEqual(choose_encoding('*;q=0.1, zstd;q=0', encodings), 'br')
+        self.assertIsNone(choose_encoding('gzip;q=0, identity', encodings))
+        self.assertIsNone(choose_encoding('', encodings))
+
+    def test_encoders_round_trip(self):
+        """Test every available encoder's one-shot and streamed output decodes."""
+        body = b'{"series": "Mobile Suit Gundam", "grade": "Master Grade"}\n' * 50
+        decoders = {'gzip': gzip.decompress}
+        if 'br' in ENCODERS:
+            import brotli
+            decoders['br'] = brotli.decompress
+        if 'zstd' in ENCODERS:
+            import zstandard
+            decoders['zstd'] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        for encoding, decompress in decoders.items():
+            with self.subTest(encoding=encoding):
+                self.assertEqual(decompress(ENCODERS[encoding]().compress(body)), body)
+                encoder = ENCODERS[encoding]()
+                streamed = b''.join(encoder.chunk(body[i:i + 100]) for i in range(0, len(body), 100))
+                self.assertEqual(decompress(streamed + encoder.finish()), body)
+
+
+class ColumnarFormatTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.bulk_create([
+            Gunpla(name=f"Kit {i}", series="Gundam 00" if i % 2 else "Mobile Suit Gundam",
+                   grade="HG", scale=None if i == 3 else "1/144")
+            for i in range(5)
+        ])
+
+    def decode(self, data):
+        columns = data['columns']
+        rows = []
+        for i in range(data['count']):
+            row = {}
+            for field, column in columns.items():
+                row[field] = column['values'][column['codes'][i]] if isinstance(column, dict) else column[i]
+            rows.append(row)
+        return rows
+
+    def test_columnar_decodes_to_rows(self):
+        """Test ?format=columnar round-trips to the row format, unpaginated and paged."""
+        rows = self.client.get('/gunplas', {'all': 'true'}).json()
+        data = self.client.get('/gunplas', {'all': 'true', 'format': 'columnar'}).json()
+        self.assertEqual(data['columns']['series'], {
+            'values': ["Mobile Suit Gundam", "Gundam 00"], 'codes': [0, 1, 0, 1, 0],
+        })
+        self.assertEqual(data['columns']['scale']['values'], ["1/144", None])
+        self.assertEqual(self.decode(data), rows)
+
+        page = self.client.get('/gunplas', {'limit': 2, 'format': 'columnar'}).json()
+        self.assertEqual(self.decode(page['results']), rows[:2])
+        self.assertIn('format=columnar', page['next'])
+        self.assertEqual(self.decode(self.client.get(page['next']).json()['results']), rows[2:4])
+
+    def test_columnar_empty_and_filtered(self):
+        """Test empty results still carry every column."""
+        data = self.client.get('/gunplas', {'grade': 'PG', 'format': 'columnar'}).json()
+        self.assertEqual(data['results']['count'], 0)
+        self.assertEqual(data['results']['columns']['grade'], {'values': [], 'codes': []})
+        self.assertEqual(data['results']['columns']['id'], [])
+
+    def test_columnar_has_its_own_etag(self):
+        """Test the row and columnar representations are cached and validated apart."""
+        rows = self.client.get('/gunplas')
+        columnar = self.client.get('/gunplas', {'format': 'columnar'})
+        self.assertNotEqual(rows['ETag'], columnar['ETag'])
+        self.assertIn('columns', columnar.json()['results'])
+
+    async def test_async_view_matches(self):
+        """Test the async list returns the same columnar body."""
+        expected = await sync_to_async(self.client.get)('/gunplas', {'all': 'true', 'format': 'columnar'})
+        response = await AsyncClient().get('/async/gunplas', {'all': 'true', 'format': 'columnar'})
+        self.assertEqual(response.content, expected.content)
+
+
+class LookupTableTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+
+    def test_names_are_normalized(self):
+        """Test series and grade names are stored once and exposed as strings."""
+        for name in ("Sazabi", "Nu Gundam"):
+            response = self.client.post('/gunplas', {'name': name, 'series': "Char's Counterattack", 'grade': 'RG'}, format='json')
+            self.assertEqual(response.json()['series'], "Char's Counterattack")
+        self.client.post('/gunplas/bulk', [{'name': 'Zaku II', 'series': "Char's Counterattack", 'grade': 'HG'}], format='json')
+        self.assertEqual(list(Series.objects.values_list('name', flat=True)), ["Char's Counterattack"])
+        self.assertEqual(sorted(Grade.objects.values_list('name', flat=True)), ['HG', 'RG'])
+
+        gunpla = Gunpla.objects.get(name="Sazabi")
+        response = self.client.put(f'/gunplas/{gunpla.id}', {'name': 'Sazabi', 'series': 'CCA', 'grade': 'MG'}, format='json')
+        self.assertEqual(response.json()['series'], 'CCA')
+        self.assertEqual(Gunpla.objects.get(pk=gunpla.id).series.name, 'CCA')
+        names = [g['name'] for g in self.client.get('/gunplas', {'series': 'CCA'}).json()['results']]
+        self.assertEqual(names, ['Sazabi'])
+
+    def test_cached_names_skip_queries(self):
+        """Test a known name costs no query once its transaction has committed."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+        with self.assertNumQueries(1):
+            Gunpla.objects.create(name="Zaku II", series="Mobile Suit Gundam", grade="MG")
+
+    def test_rolled_back_names_are_not_cached(self):
+        """Test a name created in a rolled-back transaction is looked up again."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    Gunpla.objects.create(name="Sazabi", series="Char's Counterattack", grade="MG")
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertFalse(Series.objects.exists())
+        gunpla = Gunpla.objects.create(name="Sazabi", series="Char's Counterattack", grade="MG")
+        self.assertEqual(Gunpla.objects.get(pk=gunpla.pk).series.name, "Char's Counterattack")
+
+    async def test_async_writes_resolve_names(self):
+        """Test the async views resolve names off the event loop."""
+        client = AsyncClient()
+        response = await client.post('/async/gunplas', {'name': 'Sazabi', 'series': 'CCA', 'grade': 'MG'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        pk = response.json()['id']
+        response = await client.put(f'/async/gunplas/{pk}', {'name': 'Sazabi', 'series': 'CCA', 'grade': 'RG'},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['grade'], 'RG')
+        self.assertEqual(await Series.objects.acount(), 1)
+
+
+class LookupMigrationTest(TransactionTestCase):
+    before = [('gunpla', '0004_gunpla_version')]
+    after = [('gunpla', '0006_drop_gunpla_name_columns')]
+
+    def setUp(self):
+        # The flush after each TransactionTestCase test empties the version row 0004 seeds.
+        GunplaVersion.objects.get_or_create(pk=1, defaults={'updated_at': timezone.now()})
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes('gunpla'))
+
+    def test_names_move_to_lookup_tables(self):
+        """Test 0005/0006 copy existing names into Series/Grade and keep search and versions working."""
+        apps = self.migrate(self.before)
+        OldGunpla = apps.get_model('gunpla', 'Gunpla')
+        for name, series, grade in (("Sazabi", "Char's Counterattack", "MG"),
+                                    ("Nu Gundam", "Char's Counterattack", "RG"),
+                                    ("Wing Gundam Zero", "Gundam Wing", "MG")):
+            OldGunpla.objects.create(name=name, series=series, grade=grade)
+
+        apps = self.migrate(self.after)
+        Gunpla = apps.get_model('gunpla', 'Gunpla')
+        rows = Gunpla.objects.order_by('id').values_list('name', 'series__name', 'grade__name')
+        self.assertEqual(list(rows), [("Sazabi", "Char's Counterattack", "MG"),
+                                      ("Nu Gundam", "Char's Counterattack", "RG"),
+                                      ("Wing Gundam Zero", "Gundam Wing", "MG")])
+        self.assertEqual(apps.get_model('gunpla', 'Series').objects.count(), 2)
+
+        version = apps.get_model('gunpla', 'GunplaVersion').objects.get(pk=1).version
+        Gunpla.objects.filter(name="Sazabi").delete()
+        self.assertEqual(apps.get_model('gunpla', 'GunplaVersion').objects.get(pk=1).version, version + 1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM gunpla_gunpla_fts WHERE gunpla_gunpla_fts MATCH 'char*'")
+            self.assertEqual(len(cursor.fetchall()), 1)
+
+    def test_migrate_back_with_rows(self):
+        """Test 0006/0005 reverse on a populated table, copying the names back into text columns."""
+        apps = self.migrate(self.after)
+        Series, Grade = apps.get_model('gunpla', 'Series'), apps.get_model('gunpla', 'Grade')
+        apps.get_model('gunpla', 'Gunpla').objects.create(
+            name="Sazabi", series=Series.objects.create(name="Char's Counterattack"),
+            grade=Grade.objects.create(name="MG"),
+        )
+
+        apps = self.migrate(self.before)
+        rows = apps.get_model('gunpla', 'Gunpla').objects.values_list('name', 'series', 'grade')
+        self.assertEqual(list(rows), [("Sazabi", "Char's Counterattack", "MG")])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM gunpla_gunpla_fts WHERE gunpla_gunpla_fts MATCH 'char*'")
+            self.assertEqual(len(cursor.fetchall()), 1)
+
+
+class QueryMetricsTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+
+    def test_server_timing(self):
+        """Test each response reports its query count and timings."""
+        response = self.client.get('/gunplas')
+        timing = response['Server-Timing']
+        self.assertIn('desc="2 queries"', timing)
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="2 queries", serialize;dur=[\d.]+, total;dur=[\d.]+$')
+        # A cached list only reads the table version.
+        self.assertIn('desc="1 queries"', self.client.get('/gunplas')['Server-Timing'])
+
+    def test_request_log(self):
+        """Test the structured log record carries the figures."""
+        with self.assertLogs('gunpla.requests', 'INFO') as logs:
+            self.client.get('/gunplas', {'all': 'true'})
+        record = logs.records[0]
+        self.assertEqual(record.getMessage(), 'GET /gunplas 200')
+        self.assertEqual((record.view, record.queries), ('GET GunplaList', 2))
+        self.assertGreater(record.serialize_ms, 0)
+
+    @override_settings(GUNPLA_QUERY_BUDGETS={'GET GunplaList': 1})
+    def test_query_budget(self):
+        """Test a view over its query budget fails the test."""
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/gunplas')
+
+    @override_settings(GUNPLA_BULK_CHUNK_SIZE=1, GUNPLA_REPEATED_QUERY_THRESHOLD=3)
+    def test_repeated_queries_are_logged(self):
+        """Test the same statement run over and over in one request is flagged as N+1."""
+        items = [{'name': f'Kit {i}', 'series': 'Mobile Suit Gundam', 'grade': 'MG'} for i in range(3)]
+        with self.assertLogs('gunpla.requests', 'WARNING') as logs:
+            self.client.post('/gunplas/bulk', items, format='json')
+        self.assertTrue(any(
+            'Possible N+1 in POST GunplaBulk: 3 x INSERT INTO "gunpla_gunpla"' in line for line in logs.output
+        ), logs.output)
+
+    async def test_async_views_are_counted(self):
+        """Test queries the async views run through sync_to_async are counted too."""
+        response = await AsyncClient().get('/async/gunplas')
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+
+class QueryMetricsASGITest(TransactionTestCase):
+    # Committed rows: the ASGI handler runs each request's ORM calls on a
+    # thread of its own, outside the TestCase transaction.
+    def setUp(self):
+        Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+
+    @classmethod
+    def tearDownClass(cls):
+        # The flush after each test also empties the version row 0004 seeds.
+        GunplaVersion.objects.create(pk=1, version=0, updated_at=timezone.now())
+        super().tearDownClass()
+
+    async def test_async_view_through_asgi_handler(self):
+        """Test queries an async view runs on the ASGI handler's per-request thread are counted."""
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'scheme': 'http',
+            'method': 'GET', 'path': '/async/gunplas', 'root_path': '', 'query_string': b'',
+            'headers': [(b'host', b'testserver')], 'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+        }
+        with self.assertLogs('gunpla.requests', 'INFO') as logs:
+            communicator = ApplicationCommunicator(ASGIHandler(), scope)
+            await communicator.send_input({'type': 'http.request', 'body': b''})
+            start = await communicator.receive_output()
+            await communicator.receive_output()
+            await communicator.wait()
+        self.assertEqual(start['status'], 200)
+        self.assertIn(b'desc="2 queries"', dict(start['headers'])[b'Server-Timing'])
+        self.assertEqual((logs.records[0].view, logs.records[0].queries), ('GET AsyncGunplaList', 2))
+
+
+class MetricsTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        Gunpla.objects.create(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG")
+
+    def scrape(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        samples = {}
+        for line in response.content.decode().splitlines():
+            if line and not line.startswith('#'):
+                sample, value = line.rsplit(' ', 1)
+                samples[sample] = float(value)
+        return samples
+
+    def test_metrics(self):
+        """Test /metrics counts requests per view and reports queries, cache and process."""
+        labels = 'method="GET",view="GunplaList"'
+        count = f'gunpla_http_request_duration_seconds_count{{{labels}}}'
+        missing = 'gunpla_http_responses_total{method="GET",view="GunplaDetail",code="4xx"}'
+        before = self.scrape()
+        self.client.get('/gunplas')
+        self.client.get('/gunplas')
+        self.client.get('/gunplas/999')
+        after = self.scrape()
+
+        self.assertEqual(after[count] - before.get(count, 0), 2)
+        self.assertEqual(after[f'gunpla_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'], after[count])
+        self.assertEqual(after[missing] - before.get(missing, 0), 1)
+        self.assertEqual(after['gunpla_http_requests_in_flight'], 1)
+        # A list miss, a cached list (table version only) and a detail miss (version and row)
+        self.assertEqual(after['gunpla_db_queries_total'] - before['gunpla_db_queries_total'], 2 + 1 + 2)
+        self.assertEqual(after['gunpla_cache_hits_total{cache="response"}'], 1)
+        self.assertGreater(after['process_cpu_seconds_total'], 0)
+        self.assertIn('python_gc_collections_total{generation="2"}', after)
+
+    def test_unknown_methods_share_a_label_set(self):
+        """Test methods outside the usual set cannot add series."""
+        self.client.generic('BREW', '/gunplas')
+        samples = self.scrape()
+        self.assertFalse(any('BREW' in sample for sample in samples))
+        self.assertIn('gunpla_http_request_duration_seconds_count{method="OTHER",view="GunplaList"}', samples)
+
+    async def test_async_views(self):
+        """Test requests to the async views are counted under their view."""
+        count = 'gunpla_http_request_duration_seconds_count{method="GET",view="AsyncGunplaList"}'
+        before = await sync_to_async(self.scrape)()
+        await AsyncClient().get('/async/gunplas')
+        after = await sync_to_async(self.scrape)()
+        self.assertEqual(after[count] - before.get(count, 0), 1)
+
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class ProfilingTest(GunplaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_sampler_collapses_stacks(self):
+        """Test the sampler counts the sampled thread's stacks, outermost frame first."""
+        sampler = Sampler(threading.get_ident(), interval=0.001).start()
+        spin(0.05)
+        sampler.stop()
+        self.assertGreater(sampler.samples, 0)
+        self.assertEqual(sum(sampler.stacks.values()), sampler.samples)
+        stack = sampler.stacks.most_common(1)[0][0]
+        self.assertTrue(stack.split(';')[-1].startswith('spin (tests.py:'), stack)
+        self.assertIn('ProfilingTest.test_sampler_collapses_stacks (tests.py:', stack)
+
+    def test_profile_header(self):
+        """Test a signed header profiles its request and a forged one does not."""
+        with self.settings(GUNPLA_PROFILE_DIR=self.directory.name, GUNPLA_PROFILE_INTERVAL=0.001):
+            client = APIClient()
+            with self.assertLogs('gunpla.profiling', 'WARNING'):
+                forged = client.get('/gunplas', HTTP_X_GUNPLA_PROFILE='profile:forged')
+            self.assertNotIn('X-Gunpla-Profile-File', forged)
+            self.assertEqual(os.listdir(self.directory.name), [])
+
+            response = client.get('/gunplas', HTTP_X_GUNPLA_PROFILE=profile_token())
+        name = response['X-Gunpla-Profile-File']
+        self.assertIn('-GET-GunplaList-', name)
+        self.assertEqual(os.listdir(self.directory.name), [name])
+
+    async def test_async_profile_header(self):
+        """Test the async path profiles signed requests and passes the rest straight through."""
+        with self.settings(GUNPLA_PROFILE_DIR=self.directory.name, GUNPLA_PROFILE_INTERVAL=0.001):
+            client = AsyncClient()
+            plain = await client.get('/async/gunplas')
+            self.assertNotIn('X-Gunpla-Profile-File', plain)
+            response = await client.get('/async/gunplas', headers={'X-Gunpla-Profile': profile_token()})
+        name = response['X-Gunpla-Profile-File']
+        self.assertIn('-GET-AsyncGunplaList-', name)
+        self.assertEqual(os.listdir(self.directory.name), [name])
+
+    async def test_no_middleware_is_adapted_under_asgi(self):
+        """Test every middleware runs natively in async mode, so requests take no thread hop to reach the views."""
+        with self.settings(GUNPLA_PROFILE_DIR=self.directory.name, DEBUG=True):
+            # Django logs "... handler adapted for middleware ..." when DEBUG is on.
+            with self.assertNoLogs('django.request', 'DEBUG'):
+                response = await AsyncClient().get('/async/gunplas')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_off_by_default(self):
+        """Test the middleware is dropped without GUNPLA_PROFILE_DIR."""
+        response = APIClient().get('/gunplas', HTTP_X_GUNPLA_PROFILE=profile_token())
+        self.assertNotIn('X-Gunpla-Profile-File', response)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_profile_token_command(self):
+        """Test manage.py profile_token prints a header the middleware accepts."""
+        out = io.StringIO()
+        call_command('profile_token', stdout=out)
+        header, token = out.getvalue().strip().split(': ')
+        self.assertEqual(header, 'X-Gunpla-Profile')
+        self.assertTrue(token.startswith('profile:'))
+
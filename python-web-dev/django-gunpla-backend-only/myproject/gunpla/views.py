@@ -2,16 +2,56 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404
 from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from .models import Gunpla
-from .serializers import GunplaSerializer
+from .serializers import (
+    GunplaSerializer, GunplaReadSerializer, GunplaColumnarSerializer, format_errors, wants_columnar
+)
+from .renderers import FastJSONRenderer, ColumnarJSONRenderer
+from .conditional import list_etag, list_last_modified, table_version
+from .cache import response_cache, detail_key, list_key
+from .filters import filter_gunplas
+from .search import search_gunplas
+from .stats import gunpla_stats
+from .pagination import GunplaCursorPagination, wants_unpaginated
+from .streaming import NDJSONParser, NDJSONRenderer, wants_stream, stream_ndjson
+from . import bulk
 
 class GunplaList(APIView):
+    pagination_class = GunplaCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, NDJSONRenderer, ColumnarJSONRenderer]
+
+    # Answer unchanged polls with a 304 after one primary-key lookup.
+    @method_decorator(condition(etag_func=list_etag, last_modified_func=list_last_modified))
+    @method_decorator(cache_control(no_cache=True))
     def get(self, request):
-        gunplas = Gunpla.objects.all()
-        serializer = GunplaSerializer(gunplas, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        gunplas = filter_gunplas(Gunpla.objects.all(), request.query_params)
+        if wants_stream(request):
+            return stream_ndjson(gunplas, GunplaReadSerializer.fields, GunplaReadSerializer.columns)
+
+        etag = list_etag(request)
+        cache_key = list_key(etag) if etag else None
+        data = response_cache.get(cache_key)
+        if data is None:
+            data = self.list_data(request, gunplas)
+            response_cache.set(cache_key, data)
+        return Response(data, status=status.HTTP_200_OK)
+
+    def list_data(self, request, gunplas):
+        serializer_class = GunplaColumnarSerializer if wants_columnar(request) else GunplaReadSerializer
+        if wants_unpaginated(request):
+            return serializer_class(gunplas).data
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(GunplaReadSerializer.rows(gunplas), request, view=self)
+        serializer = serializer_class(page)
+        return paginator.get_paginated_response(serializer.data).data
 
     def post(self, request):
         serializer = GunplaSerializer(data=request.data)
@@ -20,13 +60,72 @@ class GunplaList(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         # Transform error messages to match expected format in tests
-        error_message = []
-        for field, errors in serializer.errors.items():
-            for error in errors:
-                error_message.append(f"{field.capitalize()} field is required.")
-        
+        error_message = format_errors(serializer.errors)
         return Response({"message": error_message}, status=status.HTTP_400_BAD_REQUEST)
 
+class GunplaSearch(APIView):
+    """Full-text search over name and series, best BM25 match first."""
+    default_limit = 50
+    max_limit = 1000
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request):
+        q = request.query_params.get('q', '')
+        results = search_gunplas(q, self.get_limit(request))
+        return Response(results, status=status.HTTP_200_OK)
+
+class GunplaStats(APIView):
+    """Counts per series, grade and scale, read from the trigger-maintained summary table."""
+
+    def get(self, request):
+        return Response(gunpla_stats(), status=status.HTTP_200_OK)
+
+class GunplaBulk(APIView):
+    """
+    Batch writes for catalog syncs. Each method takes a JSON array (or an
+    NDJSON body): POST creates items, PUT updates items by ``id`` and DELETE
+    removes a list of ids. Invalid items are skipped and reported by index.
+    """
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
+
+    def get_items(self, request):
+        if not isinstance(request.data, list):
+            return None
+        return request.data
+
+    def bulk_response(self, key, count, errors, success_status):
+        response_status = success_status
+        if errors and not count:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({key: count, "errors": errors}, status=response_status)
+
+    def post(self, request):
+        items = self.get_items(request)
+        if items is None:
+            return Response({"message": "Expected a JSON array."}, status=status.HTTP_400_BAD_REQUEST)
+        created, errors = bulk.bulk_create(items)
+        return self.bulk_response("created", created, errors, status.HTTP_201_CREATED)
+
+    def put(self, request):
+        items = self.get_items(request)
+        if items is None:
+            return Response({"message": "Expected a JSON array."}, status=status.HTTP_400_BAD_REQUEST)
+        updated, errors = bulk.bulk_update(items)
+        return self.bulk_response("updated", updated, errors, status.HTTP_200_OK)
+
+    def delete(self, request):
+        ids = self.get_items(request)
+        if ids is None:
+            return Response({"message": "Expected a JSON array."}, status=status.HTTP_400_BAD_REQUEST)
+        deleted, errors = bulk.bulk_delete(ids)
+        return self.bulk_response("deleted", deleted, errors, status.HTTP_200_OK)
+
 class GunplaDetail(APIView):
     def get_object(self, pk):
         try:
@@ -35,9 +134,13 @@ class GunplaDetail(APIView):
             raise Http404("Not found.")
     
     def get(self, request, pk):
-        gunpla = self.get_object(pk)
-        serializer = GunplaSerializer(gunpla)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The version before the row, so a racing write can only make the entry newer.
+        cache_key = detail_key(pk, table_version(request))
+        data = response_cache.get(cache_key)
+        if data is None:
+            data = GunplaSerializer(self.get_object(pk)).data
+            response_cache.set(cache_key, data)
+        return Response(data, status=status.HTTP_200_OK)
 
     def put(self, request, pk):
         gunpla = self.get_object(pk)
@@ -50,4 +153,10 @@ class GunplaDetail(APIView):
     def delete(self, request, pk):
         gunpla = self.get_object(pk)
         gunpla.delete()
-        return Response({"message": "Gunpla model deleted successfully"}, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response({"message": "Gunpla model deleted successfully"}, status=status.HTTP_200_OK)
+
+class GunplaCacheStats(APIView):
+    """Per-process hit/miss counters of the response cache, for sizing it."""
+
+    def get(self, request):
+        return Response(response_cache.stats(), status=status.HTTP_200_OK)
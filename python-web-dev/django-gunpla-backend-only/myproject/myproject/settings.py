@@ -27,8 +27,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Request histograms and in-flight gauge for /metrics, around everything
+    'gunpla.metrics.MetricsMiddleware',
+    # Opt-in sampling profiler for requests with a signed X-Gunpla-Profile header
+    'gunpla.profiling.ProfilingMiddleware',
+    # Outside the middleware below, so ETags and 304s are worked out on the identity body first
+    'gunpla.compression.CompressionMiddleware',
+    # Query counts and timings as Server-Timing headers, logs and budgets
+    'gunpla.instrumentation.QueryMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    # Content-hash ETags and If-None-Match -> 304 for detail responses
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -55,14 +65,56 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'myproject.wsgi.application'
 
-# Using SQLite
+# Using SQLite, tuned for concurrent use:
+# - WAL lets readers run alongside the single writer.
+# - synchronous=NORMAL only fsyncs at checkpoints (safe with WAL).
+# - busy_timeout makes writers queue instead of raising "database is locked".
+# - mmap_size/cache_size/temp_store keep hot pages and sort spills in memory.
+# init_command runs on every new connection; IMMEDIATE transactions take the
+# write lock up front so atomic() blocks never fail upgrading a read lock.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Response cache for Gunpla reads (see gunpla/cache.py). The default is a
+# per-process LRU; set GUNPLA_REDIS_URL (e.g. redis://127.0.0.1:6379/1) to
+# share it between workers through a local Redis.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'gunpla': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gunpla-responses',
+        'TIMEOUT': 60,
+        'OPTIONS': {'MAX_ENTRIES': 1024},
+    },
+}
+if os.environ.get('GUNPLA_REDIS_URL'):
+    CACHES['gunpla'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['GUNPLA_REDIS_URL'],
+        'TIMEOUT': 60,
+        'KEY_PREFIX': 'gunpla',
+    }
+GUNPLA_CACHE_ALIAS = 'gunpla'
+
 # For testing, you can also configure a separate in-memory DB:
 # (Django will handle this automatically by default, but you can be explicit)
 # if 'test' in sys.argv:
@@ -71,6 +123,44 @@ DATABASES = {
 #         'NAME': ':memory:',
 #     }
 
+# Rows written per transaction by the /gunplas/bulk endpoint
+GUNPLA_BULK_CHUNK_SIZE = 1000
+
+# Response compression (see gunpla/compression.py), in server preference
+# order. br and zstd need the optional brotli and zstandard packages and are
+# skipped without them; set to () to turn compression off.
+GUNPLA_COMPRESSION_ENCODINGS = ('zstd', 'br', 'gzip')
+# Bodies smaller than this are sent uncompressed
+GUNPLA_COMPRESSION_MIN_SIZE = 1024
+
+# Most SQL statements a view may run per request (see
+# gunpla/instrumentation.py), keyed "<METHOD> <view class>". Lists read the
+# table version (for the ETag) and then one page, details the table version
+# (for the cache key) and then the row; cache hits and 304s stop after the
+# first. Going over is logged, or raised with
+# GUNPLA_QUERY_BUDGET_STRICT, which the test suite turns on.
+GUNPLA_QUERY_BUDGETS = {
+    'GET GunplaList': 2,
+    'GET AsyncGunplaList': 2,
+    'GET GunplaDetail': 2,
+    'GET AsyncGunplaDetail': 2,
+    'GET GunplaSearch': 1,
+    'GET GunplaStats': 1,
+    'GET GunplaCacheStats': 0,
+}
+GUNPLA_QUERY_BUDGET_STRICT = False
+# Identical statements in one request before a possible N+1 is logged
+GUNPLA_REPEATED_QUERY_THRESHOLD = 5
+
+# Sampling profiler (gunpla/profiling.py), off unless GUNPLA_PROFILE_DIR is set.
+# Requests with an X-Gunpla-Profile header from `manage.py profile_token`
+# (signed with SECRET_KEY, valid GUNPLA_PROFILE_TOKEN_MAX_AGE seconds) are
+# sampled every GUNPLA_PROFILE_INTERVAL seconds into collapsed-stack files.
+GUNPLA_PROFILE_DIR = os.environ.get('GUNPLA_PROFILE_DIR')
+GUNPLA_PROFILE_INTERVAL = 0.005
+GUNPLA_PROFILE_MAX_SAMPLES = 20000
+GUNPLA_PROFILE_TOKEN_MAX_AGE = 3600
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = 'en-us'
@@ -1,10 +1,20 @@
 # myproject/urls.py
 from django.contrib import admin
 from django.urls import path
-from gunpla.views import GunplaList, GunplaDetail
+from gunpla.views import GunplaList, GunplaSearch, GunplaStats, GunplaBulk, GunplaDetail, GunplaCacheStats
+from gunpla.async_views import AsyncGunplaList, AsyncGunplaDetail
+from gunpla.metrics import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics),  # Matches GET /metrics (Prometheus text format)
     path('gunplas', GunplaList.as_view()),  # Matches GET/POST /gunplas
+    path('gunplas/search', GunplaSearch.as_view()),  # Matches GET /gunplas/search?q=
+    path('gunplas/stats', GunplaStats.as_view()),  # Matches GET /gunplas/stats
+    path('gunplas/bulk', GunplaBulk.as_view()),  # Matches POST/PUT/DELETE /gunplas/bulk
+    path('gunplas/cache', GunplaCacheStats.as_view()),  # Matches GET /gunplas/cache
     path('gunplas/<int:pk>', GunplaDetail.as_view()),  # Matches GET/PUT/DELETE /gunplas/<pk>
+    # Async-native variants of the same endpoints, for ASGI deployments
+    path('async/gunplas', AsyncGunplaList.as_view()),  # Matches GET/POST /async/gunplas
+    path('async/gunplas/<int:pk>', AsyncGunplaDetail.as_view()),  # Matches GET/PUT/DELETE /async/gunplas/<pk>
 ]
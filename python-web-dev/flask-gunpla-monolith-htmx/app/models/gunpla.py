@@ -1,11 +1,19 @@
 from app import db
 
 class Gunpla(db.Model):
+    COLUMNS = ('id', 'name', 'series', 'grade', 'scale')
+    # AUTOINCREMENT so a deleted id is never handed out again: row fragments
+    # are cached under (id, version) and a reused id would start at version 1.
+    __table_args__ = {'sqlite_autoincrement': True}
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    series = db.Column(db.String(100), nullable=False)
-    grade = db.Column(db.String(50), nullable=False)
-    scale = db.Column(db.String(20))
+    name = db.Column(db.String(100), nullable=False, index=True)
+    series = db.Column(db.String(100), nullable=False, index=True)
+    grade = db.Column(db.String(50), nullable=False, index=True)
+    scale = db.Column(db.String(20), index=True)
+    # Bumped in SQL by every UPDATE, ORM or bulk; keys the cached row fragments.
+    # Not a version_id_col: concurrent edits stay last-write-wins.
+    version = db.Column(db.Integer, nullable=False, server_default='1', onupdate=db.text('version + 1'))
 
     def __repr__(self):
         return f'<Gunpla {self.name}>'
\ No newline at end of file
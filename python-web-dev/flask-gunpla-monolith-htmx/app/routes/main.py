@@ -1,15 +1,57 @@
 # app/routes/main.py
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, jsonify
 from app.models.gunpla import Gunpla
 from app.forms.gunpla import GunplaForm
+from app.utils.filters import gunpla_criteria
+from app.utils.search import search_gunplas
+from app.utils.pagination import keyset_page
+from app.utils.pool import pool_stats
+from app.utils.fragments import get_fragment_cache, row_fragment, oob_row, oob_delete
+from app.utils.events import event_stream, publish_html
 from app import db
 
 bp = Blueprint('main', __name__)
 
+SEARCH_LIMIT = 50
+# Rows per infinite-scroll page
+PAGE_SIZE = 50
+
 @bp.route('/')
 def index():
-    gunplas = db.session.execute(db.select(Gunpla)).scalars().all()
-    return render_template('gunpla/index.html', gunplas=gunplas)
+    return render_template('gunpla/index.html', **page_context())
+
+@bp.route('/gunplas/page')
+def page():
+    """The next page of rows for infinite scroll, after the ``after`` id."""
+    return render_template('gunpla/gunpla_page.html', **page_context())
+
+def page_context():
+    """
+    Rows for the first (or ``after``) page under the list filters, and the
+    URL of the following page, which the last row's sentinel loads when it
+    scrolls into view.
+    """
+    stmt = db.select(Gunpla).where(*gunpla_criteria(request.args))
+    gunplas, has_more = keyset_page(stmt, request.args.get('after', type=int), PAGE_SIZE)
+    next_url = None
+    if has_more:
+        args = {key: value for key, value in request.args.items() if key != 'after'}
+        next_url = url_for('main.page', after=gunplas[-1].id, **args)
+    return {'gunplas': gunplas, 'next_url': next_url}
+
+@bp.route('/gunplas/events')
+def events():
+    """Server-Sent Events stream of edited and deleted rows, as HTMX swaps."""
+    return event_stream()
+
+@bp.route('/gunplas/search')
+def search():
+    q = request.args.get('q', '').strip()
+    if not q:
+        # Cleared search box: back to the infinitely scrolled list.
+        return render_template('gunpla/gunpla_page.html', **page_context())
+    gunplas = search_gunplas(q, SEARCH_LIMIT)
+    return render_template('gunpla/search_results.html', gunplas=gunplas)
 
 @bp.route('/create', methods=['GET', 'POST'])
 def create():
@@ -39,8 +81,10 @@ def edit(gunpla_id):
         gunpla.grade = form.grade.data
         gunpla.scale = form.scale.data
         db.session.commit()
+        get_fragment_cache().invalidate(gunpla_id)
+        publish_html(oob_row(gunpla))
         flash('Gunpla model updated successfully!', 'success')
-        return render_template('gunpla/gunpla_row.html', gunpla=gunpla)
+        return row_fragment(gunpla)
     return render_template('gunpla/edit_form.html', form=form, gunpla=gunpla)
 
 @bp.route('/delete/<int:gunpla_id>', methods=['POST'])
@@ -50,6 +94,8 @@ def delete(gunpla_id):
         abort(404)
     db.session.delete(gunpla)
     db.session.commit()
+    get_fragment_cache().invalidate(gunpla_id)
+    publish_html(oob_delete(gunpla_id))
     flash('Gunpla model deleted successfully!', 'success')
     return ''  # Return empty response for HTMX to remove the element
 
@@ -66,4 +112,9 @@ def get_gunpla_row(gunpla_id):
     gunpla = db.session.get(Gunpla, gunpla_id)
     if gunpla is None:
         abort(404)
-    return render_template('gunpla/gunpla_row.html', gunpla=gunpla)
\ No newline at end of file
+    return row_fragment(gunpla)
+
+@bp.route('/pool')
+def pool():
+    """Connections in use and checkout wait times of this worker's pool."""
+    return jsonify(pool_stats(db.engine))
@@ -0,0 +1,33 @@
+from app.models.gunpla import Gunpla
+
+EXACT_FILTERS = ('series', 'grade', 'scale')
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def gunpla_criteria(args):
+    """
+    Turn the list query parameters into WHERE criteria.
+
+    - ``series``, ``grade``, ``scale``: exact match, each backed by an index.
+    - ``q``: name prefix. It is written as a ``name >= q AND name < q'``
+      range so it can use the ``name`` index (a ``LIKE`` is case-insensitive
+      on SQLite and cannot). The match is therefore case-sensitive.
+    - ``match=contains``: make ``q`` a case-insensitive substring match
+      instead. This cannot use an index and scans the table.
+    """
+    criteria = []
+    for field in EXACT_FILTERS:
+        value = args.get(field)
+        if value:
+            criteria.append(getattr(Gunpla, field) == value)
+
+    q = args.get('q')
+    if q:
+        if args.get('match') == 'contains':
+            criteria.append(Gunpla.name.icontains(q, autoescape=True))
+        else:
+            criteria.append(Gunpla.name >= q)
+            criteria.append(Gunpla.name < prefix_upper_bound(q))
+    return criteria
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from flask import current_app
+from markupsafe import Markup
+
+ROW_TEMPLATE = 'gunpla/gunpla_row.html'
+
+class FragmentCache:
+    """
+    Rendered ``gunpla_row.html`` fragments keyed by ``(id, version)``, least
+    recently used first out. Only the newest version of a row is kept.
+    ``Gunpla.version`` changes on every update and ids are never reused
+    (the table is AUTOINCREMENT), so an edit or delete made by another
+    worker is never served from a stale entry; ``invalidate`` just frees
+    the memory in this one.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, gunpla_id, version):
+        with self._lock:
+            entry = self._rows.get(gunpla_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._rows.move_to_end(gunpla_id)
+            return entry[1]
+
+    def set(self, gunpla_id, version, html):
+        with self._lock:
+            self._rows[gunpla_id] = (version, html)
+            self._rows.move_to_end(gunpla_id)
+            while len(self._rows) > self.max_entries:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, gunpla_id):
+        with self._lock:
+            self._rows.pop(gunpla_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+def init_fragments(app):
+    app.extensions['fragment_cache'] = FragmentCache(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 100000))
+    app.add_template_global(row_fragment)
+
+def get_fragment_cache():
+    return current_app.extensions['fragment_cache']
+
+def row_fragment(gunpla):
+    """
+    ``gunpla_row.html`` for ``gunpla``, rendered once per version. Used
+    instead of ``{% include %}`` in the list templates, so a page of
+    unchanged rows costs one dict lookup each.
+    """
+    cache = get_fragment_cache()
+    html = cache.get(gunpla.id, gunpla.version)
+    if html is None:
+        template = current_app.jinja_env.get_template(ROW_TEMPLATE)
+        html = Markup(template.render(gunpla=gunpla))
+        cache.set(gunpla.id, gunpla.version, html)
+    return html
+
+def oob_row(gunpla):
+    """``gunpla_row.html`` marked ``hx-swap-oob``, to replace the row wherever it is shown."""
+    template = current_app.jinja_env.get_template(ROW_TEMPLATE)
+    return Markup(template.render(gunpla=gunpla, oob=True))
+
+def oob_delete(gunpla_id):
+    return Markup(f'<li id="gunpla-{gunpla_id}" hx-swap-oob="delete"></li>')
@@ -0,0 +1,13 @@
+from app import db
+from app.models.gunpla import Gunpla
+
+def keyset_page(stmt, after=None, size=50):
+    """
+    One page of the Gunpla ``stmt``: up to ``size`` rows with ``id > after``,
+    in id order, plus whether more rows follow. Each page is an index range
+    scan on the primary key, so page 1,000 costs the same as page 1.
+    """
+    if after is not None:
+        stmt = stmt.where(Gunpla.id > after)
+    rows = db.session.execute(stmt.order_by(Gunpla.id).limit(size + 1)).scalars().all()
+    return rows[:size], len(rows) > size
@@ -0,0 +1,84 @@
+import re
+from sqlalchemy import DDL, event
+from app import db
+from app.models.gunpla import Gunpla
+from app.utils.filters import gunpla_criteria
+
+FTS_TABLE = 'gunpla_fts'
+# bm25() column weights: a hit in the name counts more than one in the series.
+NAME_WEIGHT = 10.0
+SERIES_WEIGHT = 1.0
+
+# External-content FTS5 index over gunpla.name/series, kept in sync by triggers.
+# Databases managed with ``flask db upgrade`` get it from the migration; the
+# hooks below cover ``db.create_all()`` (used by the tests).
+FTS_SETUP = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, series, content='gunpla', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, series ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+        INSERT INTO {FTS_TABLE}(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+]
+
+for statement in FTS_SETUP:
+    event.listen(Gunpla.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(
+    Gunpla.__table__, 'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite')
+)
+
+def build_match_query(q):
+    """
+    Turn free text from the search box into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"rx"* "78"*``), so FTS5
+    operators typed by users are treated as plain text.
+    """
+    terms = re.findall(r'\w+', q)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_gunplas(q, limit):
+    """Return up to ``limit`` Gunpla models matching ``q``, best BM25 score first."""
+    match = build_match_query(q)
+    if not match:
+        return []
+    if db.engine.dialect.name != 'sqlite':
+        # Other databases have no FTS5; fall back to a substring scan.
+        stmt = (
+            db.select(Gunpla)
+            .where(*gunpla_criteria({'q': q, 'match': 'contains'}))
+            .order_by(Gunpla.id)
+            .limit(limit)
+        )
+    else:
+        # Rank and limit inside FTS5 first, then join only the winning rows.
+        stmt = db.select(Gunpla).from_statement(db.text(
+            f'SELECT g.* FROM gunpla g JOIN ('
+            f'SELECT rowid, bm25({FTS_TABLE}, :name_weight, :series_weight) AS score '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY score LIMIT :limit'
+            f') hits ON g.id = hits.rowid ORDER BY hits.score'
+        ).bindparams(
+            match=match,
+            name_weight=NAME_WEIGHT,
+            series_weight=SERIES_WEIGHT,
+            limit=limit,
+        ))
+    return db.session.execute(stmt).scalars().all()
@@ -0,0 +1,13 @@
+from sqlalchemy import event
+
+def configure_sqlite(engine, pragmas):
+    """Run ``PRAGMA name=value`` for each of ``pragmas`` on every new SQLite connection."""
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
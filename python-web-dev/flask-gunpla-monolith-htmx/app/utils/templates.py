@@ -0,0 +1,28 @@
+import os
+import click
+from jinja2 import ChoiceLoader, ModuleLoader
+
+def precompiled_templates_dir(app):
+    return app.config.get('PRECOMPILED_TEMPLATES_DIR') or os.path.join(app.instance_path, 'templates')
+
+def init_templates(app):
+    """
+    Register ``flask compile-templates`` and, once it has been run, load
+    templates from the compiled Python modules instead of parsing and
+    compiling the sources in every worker. The source loader stays behind
+    it for templates added since the last build. Compiled templates are not
+    reloaded, so re-run the command after changing a template.
+    """
+    source_loader = app.jinja_env.loader
+
+    @app.cli.command('compile-templates')
+    def compile_templates():
+        """Compile all templates into PRECOMPILED_TEMPLATES_DIR."""
+        target = precompiled_templates_dir(app)
+        env = app.jinja_env.overlay(loader=source_loader)
+        env.compile_templates(target, zip=None, ignore_errors=False)
+        click.echo(f'Compiled {len(env.list_templates())} templates into {target}')
+
+    target = precompiled_templates_dir(app)
+    if os.path.isdir(target):
+        app.jinja_env.loader = ChoiceLoader([ModuleLoader(target), source_loader])
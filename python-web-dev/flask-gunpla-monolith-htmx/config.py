@@ -1,6 +1,69 @@
 import os
 
+# Tuned for concurrent use, applied to every connection (see app/utils/sqlite.py):
+# - WAL lets readers run alongside the single writer.
+# - synchronous=NORMAL only fsyncs at checkpoints (safe with WAL).
+# - busy_timeout makes writers queue instead of raising "database is locked".
+# - mmap_size/cache_size/temp_store keep hot pages and sort spills in memory.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
+# Per-worker connection pool (see app/utils/pool.py). Under gunicorn the
+# database sees up to workers * (pool_size + max_overflow) connections, so
+# size DB_POOL_SIZE/DB_MAX_OVERFLOW to stay under its max_connections.
+# - pool_timeout bounds how long a request waits for a free connection.
+# - pool_recycle replaces connections before server/proxy idle timeouts.
+# - pool_pre_ping discards connections that died while idle (e.g. failover).
+POOL_PRODUCTION_OPTIONS = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+    'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+    'pool_timeout': 10,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-please-change'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///gunpla.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    # Written by `flask compile-templates` (default: instance/templates)
+    PRECOMPILED_TEMPLATES_DIR = os.environ.get('PRECOMPILED_TEMPLATES_DIR')
+    # Rendered gunpla_row.html fragments kept per worker
+    FRAGMENT_CACHE_MAX_ENTRIES = 100000
+    # /gunplas/events: changes kept for reconnecting clients, and seconds
+    # between keep-alive comments on idle streams
+    EVENTS_BACKLOG = 1000
+    EVENTS_HEARTBEAT = 15
+    SQLALCHEMY_ENGINE_OPTIONS = POOL_PRODUCTION_OPTIONS
+    # Connections each worker opens at startup, ahead of its first requests
+    POOL_WARMUP = int(os.environ.get('DB_POOL_WARMUP', 2))
+    # Most SQL statements an endpoint may run per request, keyed
+    # "<METHOD> <endpoint>" (see app/utils/instrumentation.py). Going over is
+    # logged, or raised with QUERY_BUDGET_STRICT (the tests set it).
+    QUERY_BUDGETS = {
+        'GET main.index': 1,
+        'GET main.page': 1,
+        'GET main.search': 1,
+        'GET main.get_edit_form': 1,
+        'GET main.get_gunpla_row': 1,
+    }
+    QUERY_BUDGET_STRICT = False
+    # Identical statements in one request before a possible N+1 is logged
+    REPEATED_QUERY_THRESHOLD = 5
+    # Prometheus metrics at /metrics (app/utils/metrics.py)
+    METRICS_ENABLED = True
+    # Sampling profiler (app/utils/profiling.py), off unless PROFILE_DIR is set.
+    # Requests with an X-Gunpla-Profile header from `flask profile-token`
+    # (signed with SECRET_KEY, valid PROFILE_TOKEN_MAX_AGE seconds) are sampled
+    # every PROFILE_INTERVAL seconds into collapsed-stack files.
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')
+    PROFILE_INTERVAL = 0.005
+    PROFILE_MAX_SAMPLES = 20000
+    PROFILE_TOKEN_MAX_AGE = 3600
@@ -0,0 +1,65 @@
+"""Add gunpla full-text search index
+
+Revision ID: 02aeef9a9ca7
+Revises: de56fd0ee419
+Create Date: 2026-10-18 10:02:17.554120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '02aeef9a9ca7'
+down_revision = 'de56fd0ee419'
+branch_labels = None
+depends_on = None
+
+# FTS5 is SQLite-only; on other databases search falls back to a LIKE scan.
+FTS_SETUP = [
+    """
+    CREATE VIRTUAL TABLE gunpla_fts USING fts5(
+        name, series, content='gunpla', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER gunpla_fts_ai AFTER INSERT ON gunpla BEGIN
+        INSERT INTO gunpla_fts(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_fts_ad AFTER DELETE ON gunpla BEGIN
+        INSERT INTO gunpla_fts(gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+    END
+    """,
+    """
+    CREATE TRIGGER gunpla_fts_au AFTER UPDATE OF name, series ON gunpla BEGIN
+        INSERT INTO gunpla_fts(gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+        INSERT INTO gunpla_fts(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+    "INSERT INTO gunpla_fts(gunpla_fts) VALUES ('rebuild')",
+]
+
+FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS gunpla_fts_au",
+    "DROP TRIGGER IF EXISTS gunpla_fts_ad",
+    "DROP TRIGGER IF EXISTS gunpla_fts_ai",
+    "DROP TABLE IF EXISTS gunpla_fts",
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS_SETUP:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in FTS_TEARDOWN:
+        op.execute(statement)
@@ -0,0 +1,58 @@
+"""Make gunpla id autoincrement
+
+Revision ID: 9d4b2e6f1a87
+Revises: 5c1e7a9d3b42
+Create Date: 2026-10-18 16:40:12.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b2e6f1a87'
+down_revision = '5c1e7a9d3b42'
+branch_labels = None
+depends_on = None
+
+# Rebuilding the table drops the triggers that keep gunpla_fts in sync; the
+# index itself is external-content and keeps its rows, since ids are copied.
+FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS gunpla_fts_ai AFTER INSERT ON gunpla BEGIN
+        INSERT INTO gunpla_fts(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS gunpla_fts_ad AFTER DELETE ON gunpla BEGIN
+        INSERT INTO gunpla_fts(gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS gunpla_fts_au AFTER UPDATE OF name, series ON gunpla BEGIN
+        INSERT INTO gunpla_fts(gunpla_fts, rowid, name, series)
+        VALUES ('delete', old.id, old.name, old.series);
+        INSERT INTO gunpla_fts(rowid, name, series) VALUES (new.id, new.name, new.series);
+    END
+    """,
+]
+
+
+def rebuild_gunpla(autoincrement):
+    # AUTOINCREMENT only exists on SQLite, where it needs the table recreated.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table('gunpla', schema=None, recreate='always',
+                              table_kwargs={'sqlite_autoincrement': autoincrement}):
+        pass
+    for statement in FTS_TRIGGERS:
+        op.execute(statement)
+
+
+def upgrade():
+    rebuild_gunpla(True)
+
+
+def downgrade():
+    rebuild_gunpla(False)
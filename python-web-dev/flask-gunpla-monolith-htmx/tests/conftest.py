@@ -11,7 +11,8 @@ def app():
     app.config.update({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'WTF_CSRF_ENABLED': False  # Disable CSRF during testing
+        'WTF_CSRF_ENABLED': False,  # Disable CSRF during testing
+        'QUERY_BUDGET_STRICT': True
     })
 
     with app.app_context():
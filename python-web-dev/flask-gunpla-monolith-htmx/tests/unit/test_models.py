@@ -1,6 +1,9 @@
 # tests/unit/test_models.py
 import pytest
 from app.models.gunpla import Gunpla
+from app import db
+from app.utils.pool import MeteredQueuePool
+from config import Config
 
 def test_new_gunpla():
     """Test creating a new Gunpla model"""
@@ -18,4 +21,35 @@ def test_new_gunpla():
 def test_gunpla_representation():
     """Test the string representation of Gunpla model"""
     gunpla = Gunpla(name='Strike Freedom')
-    assert str(gunpla) == '<Gunpla Strike Freedom>'
\ No newline at end of file
+    assert str(gunpla) == '<Gunpla Strike Freedom>'
+
+def pragma(name):
+    return db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+
+def test_sqlite_pragmas(app):
+    """Test every connection gets the concurrency profile from Config."""
+    assert pragma('synchronous') == 1  # NORMAL
+    assert pragma('busy_timeout') == 5000
+    assert pragma('temp_store') == 2  # MEMORY
+    assert pragma('cache_size') == -64000
+
+def test_connection_pool(app):
+    """Test the engine uses the pool profile from Config and was warmed up."""
+    pool = db.engine.pool
+    assert isinstance(pool, MeteredQueuePool)
+    assert pool.size() == Config.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+    assert pool.timeout() == Config.SQLALCHEMY_ENGINE_OPTIONS['pool_timeout']
+    assert pool.checkedin() + pool.checkedout() >= Config.POOL_WARMUP
+
+def test_version_bumps_without_locking(app, init_database):
+    """Test every UPDATE bumps the version and an edit of a stale copy still saves"""
+    gunpla = db.session.get(Gunpla, 1)
+    assert gunpla.version == 1
+    # Another request edits the row behind this session's back.
+    db.session.execute(
+        db.update(Gunpla).where(Gunpla.id == 1).values(name='RX-78-2 Ver.Ka'),
+        execution_options={'synchronize_session': False},
+    )
+    gunpla.grade = 'MG'
+    db.session.commit()
+    assert (gunpla.version, gunpla.grade) == (3, 'MG')
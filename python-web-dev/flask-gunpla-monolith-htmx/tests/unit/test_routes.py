@@ -1,7 +1,12 @@
 # tests/unit/test_routes.py
 import pytest
+from jinja2 import ModuleLoader
 from app.models.gunpla import Gunpla
-from app import db
+from app.utils.fragments import get_fragment_cache
+from app.utils.instrumentation import QueryBudgetExceeded
+from app.utils.profiling import profile_token
+from app import create_app, db
+from config import Config
 
 def test_index_page(client, init_database):
     """Test the index page loads correctly"""
@@ -10,6 +15,37 @@ def test_index_page(client, init_database):
     assert b'RX-78-2' in response.data
     assert b'Mobile Suit Gundam' in response.data
 
+def test_index_first_page(client, init_database, monkeypatch):
+    """Test the index renders one page of rows and a sentinel for the next"""
+    monkeypatch.setattr('app.routes.main.PAGE_SIZE', 2)
+    for name in ('Exia', 'Unicorn', 'Barbatos'):
+        db.session.add(Gunpla(name=name, series='Gundam', grade='HG', scale='1/144'))
+    db.session.commit()
+
+    response = client.get('/')
+    assert b'RX-78-2' in response.data
+    assert b'Exia' in response.data
+    assert b'Unicorn' not in response.data
+    assert b'hx-trigger="revealed"' in response.data
+    assert b'hx-get="/gunplas/page?after=2"' in response.data
+
+def test_infinite_scroll_pages(client, init_database, monkeypatch):
+    """Test the page endpoint walks the list by id and keeps the filters"""
+    monkeypatch.setattr('app.routes.main.PAGE_SIZE', 2)
+    for name in ('Exia', 'Unicorn', 'Barbatos'):
+        db.session.add(Gunpla(name=name, series='Gundam', grade='HG', scale='1/144'))
+    db.session.commit()
+
+    response = client.get('/gunplas/page?after=2')
+    assert b'Unicorn' in response.data
+    assert b'Barbatos' in response.data
+    assert b'Exia' not in response.data
+    assert b'hx-trigger' not in response.data
+
+    response = client.get('/gunplas/page?series=Gundam')
+    assert b'RX-78-2' not in response.data
+    assert b'hx-get="/gunplas/page?after=3&amp;series=Gundam"' in response.data
+
 def test_create_gunpla(client, init_database):
     """Test creating a new Gunpla entry"""
     response = client.post('/create', data={
@@ -73,4 +109,172 @@ def test_404_handling(client, app):
     """Test handling of non-existent Gunpla IDs"""
     with app.app_context():
         response = client.get('/gunpla/999')
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+def test_index_filters(client, init_database):
+    """Test the index page honours the series/grade/scale/q filters"""
+    db.session.add(Gunpla(name='Exia', series='Gundam 00', grade='MG', scale='1/100'))
+    db.session.commit()
+    response = client.get('/?grade=MG')
+    assert b'Exia' in response.data
+    assert b'RX-78-2' not in response.data
+
+    response = client.get('/?q=RX')
+    assert b'RX-78-2' in response.data
+    assert b'Exia' not in response.data
+
+def test_search(client, init_database):
+    """Test the search fragment returns FTS matches ranked by name first"""
+    db.session.add(Gunpla(name='Zaku II', series='Mobile Suit Gundam', grade='HG', scale='1/144'))
+    db.session.commit()
+    response = client.get('/gunplas/search?q=zaku')
+    assert response.status_code == 200
+    assert b'Zaku II' in response.data
+    assert b'RX-78-2' not in response.data
+
+    response = client.get('/gunplas/search?q=mobile+suit')
+    assert b'Zaku II' in response.data
+    assert b'RX-78-2' in response.data
+
+def test_search_no_results(client, init_database):
+    """Test the search fragment when nothing matches"""
+    response = client.get('/gunplas/search?q=turn+a')
+    assert response.status_code == 200
+    assert b'No matching gunpla models.' in response.data
+
+def test_search_follows_edits(client, init_database):
+    """Test the FTS triggers pick up edited names"""
+    client.post('/edit/1', data={'name': 'Char Zaku', 'series': 'Mobile Suit Gundam', 'grade': 'RG'})
+    response = client.get('/gunplas/search?q=char')
+    assert b'Char Zaku' in response.data
+
+def test_pool_stats(client):
+    """Test the pool metrics report checkouts and connections in use."""
+    response = client.get('/pool')
+    assert response.status_code == 200
+    stats = response.json
+    assert stats['pool'] == 'MeteredQueuePool'
+    assert stats['checkouts'] >= 1
+    assert stats['timeouts'] == 0
+    assert stats['checked_out'] + stats['idle'] >= 1
+
+def test_row_fragments(client, init_database):
+    """Test rows are rendered once per version and edits re-render only that row"""
+    cache = get_fragment_cache()
+    client.get('/')
+    assert cache.get(1, 1) is not None
+
+    response = client.post('/edit/1', data={
+        'name': 'RX-78-2 Ver.Ka',
+        'series': 'Mobile Suit Gundam',
+        'grade': 'MG',
+        'scale': '1/100'
+    })
+    assert b'Ver.Ka' in response.data
+    assert cache.get(1, 1) is None
+    assert cache.get(1, 2) is not None
+    assert b'Ver.Ka' in client.get('/').data
+
+    client.post('/delete/1')
+    assert len(cache) == 0
+
+def test_row_fragments_ids_not_reused(client, init_database):
+    """Test a row added after deleting the last one never matches its cached fragment"""
+    cache = get_fragment_cache()
+    client.get('/')
+    stale = cache.get(1, 1)
+    db.session.delete(db.session.get(Gunpla, 1))
+    db.session.commit()
+    cache.set(1, 1, stale)  # as another worker that rendered the row would still hold it
+
+    client.post('/create', data={
+        'name': 'Zaku II',
+        'series': 'Mobile Suit Gundam',
+        'grade': 'HG',
+        'scale': '1/144'
+    })
+    zaku = Gunpla.query.filter_by(name='Zaku II').one()
+    assert zaku.id != 1
+    response = client.get('/')
+    assert b'Zaku II' in response.data
+    assert b'RX-78-2' not in response.data
+
+def test_compile_templates(app, init_database, tmp_path):
+    """Test `flask compile-templates` output is picked up by new apps"""
+    app.config['PRECOMPILED_TEMPLATES_DIR'] = str(tmp_path)
+    result = app.test_cli_runner().invoke(args=['compile-templates'])
+    assert result.exit_code == 0
+    assert any(tmp_path.glob('tmpl_*.py'))
+
+    class PrecompiledConfig(Config):
+        PRECOMPILED_TEMPLATES_DIR = str(tmp_path)
+
+    precompiled = create_app(PrecompiledConfig)
+    assert isinstance(precompiled.jinja_env.loader.loaders[0], ModuleLoader)
+    response = precompiled.test_client().get('/')
+    assert response.status_code == 200
+    assert b'RX-78-2' in response.data
+
+def test_events_stream(client, init_database, app):
+    """Test edits and deletes are pushed to subscribers as out-of-band swaps"""
+    app.config['EVENTS_HEARTBEAT'] = 0.05
+    response = client.get('/gunplas/events', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+
+    client.post('/edit/1', data={
+        'name': 'RX-78-2 Ver.Ka',
+        'series': 'Mobile Suit Gundam',
+        'grade': 'MG',
+        'scale': '1/100'
+    })
+    client.post('/delete/1')
+    body = ''
+    for chunk in response.response:
+        body += chunk.decode()
+        if body.count('event: gunpla') == 2:
+            break
+    response.close()
+    assert 'data: <li id="gunpla-1" hx-swap-oob="true">' in body
+    assert 'Ver.Ka' in body
+    assert 'data: <li id="gunpla-1" hx-swap-oob="delete"></li>' in body
+
+def test_server_timing(client, init_database):
+    """Test a rendered page reports its queries and template rendering time"""
+    timing = client.get('/').headers['Server-Timing']
+    assert 'desc="1 queries"' in timing
+    assert 'serialize;dur=0.00,' not in timing
+
+def test_query_budget(app, client, init_database):
+    """Test an endpoint over its query budget fails the test"""
+    app.config['QUERY_BUDGETS'] = {'GET main.index': 0}
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/')
+
+def test_metrics(client, init_database):
+    """Test /metrics counts requests per route and row fragment cache hits"""
+    client.get('/')
+    client.get('/')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'gunpla_http_request_duration_seconds_count{method="GET",endpoint="main.index"} 2' in body
+    assert 'gunpla_http_responses_total{method="GET",endpoint="main.index",code="2xx"} 2' in body
+    cache = get_fragment_cache()
+    assert cache.hits >= 1
+    assert f'gunpla_cache_hits_total{{cache="fragment"}} {cache.hits}' in body
+
+def test_profile_header(tmp_path):
+    """Test a signed header profiles its request into PROFILE_DIR and a forged one does not"""
+    class ProfilingConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+        PROFILE_DIR = str(tmp_path)
+        PROFILE_INTERVAL = 0.001
+
+    app = create_app(ProfilingConfig)
+    client = app.test_client()
+    forged = client.get('/create', headers={'X-Gunpla-Profile': 'profile.forged'})
+    assert 'X-Gunpla-Profile-File' not in forged.headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get('/create', headers={'X-Gunpla-Profile': profile_token(app)})
+    name = response.headers['X-Gunpla-Profile-File']
+    assert '-GET-main.create-' in name
+    assert (tmp_path / name).exists()
@@ -3,6 +3,11 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
 from config import Config
+from app.utils.sqlite import configure_sqlite
+from app.utils.pool import pool_options, warm_pool
+from app.utils.instrumentation import init_instrumentation
+from app.utils.metrics import init_metrics
+from app.utils.profiling import init_profiling
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -11,11 +16,20 @@ csrf = CSRFProtect()
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_options(
+        app.config.get('SQLALCHEMY_ENGINE_OPTIONS'), app.config['SQLALCHEMY_DATABASE_URI']
+    )
 
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_profiling(app)
+    with app.app_context():
+        configure_sqlite(db.engine, app.config.get('SQLITE_PRAGMAS'))
+        warm_pool(db.engine, app.config.get('POOL_WARMUP', 0))
 
     # Register blueprints
     from app.routes.main import bp as main_bp
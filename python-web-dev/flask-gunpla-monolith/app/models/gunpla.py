@@ -1,11 +1,13 @@
 from app import db
 
 class Gunpla(db.Model):
+    COLUMNS = ('id', 'name', 'series', 'grade', 'scale')
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    series = db.Column(db.String(100), nullable=False)
-    grade = db.Column(db.String(50), nullable=False)
-    scale = db.Column(db.String(20))
+    name = db.Column(db.String(100), nullable=False, index=True)
+    series = db.Column(db.String(100), nullable=False, index=True)
+    grade = db.Column(db.String(50), nullable=False, index=True)
+    scale = db.Column(db.String(20), index=True)
 
     def __repr__(self):
         return f'<Gunpla {self.name}>'
\ No newline at end of file
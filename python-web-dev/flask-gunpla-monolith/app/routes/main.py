@@ -1,13 +1,22 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from flask import Blueprint, current_app, render_template, redirect, url_for, flash, request, abort, jsonify
 from app.models.gunpla import Gunpla
 from app.forms.gunpla import GunplaForm
+from app.utils.streaming import wants_stream, stream_ndjson, stream_page, RowStream
+from app.utils.filters import gunpla_criteria
+from app.utils.pool import pool_stats
 from app import db
 
 bp = Blueprint('main', __name__)
 
 @bp.route('/')
 def index():
-    gunplas = db.session.execute(db.select(Gunpla)).scalars().all()
+    criteria = gunpla_criteria(request.args)
+    if wants_stream():
+        return stream_ndjson(Gunpla, Gunpla.COLUMNS, criteria)
+    stmt = db.select(Gunpla).where(*criteria).order_by(Gunpla.id)
+    if current_app.config.get('STREAM_INDEX'):
+        return stream_page('gunpla/index.html', gunplas=RowStream(stmt))
+    gunplas = db.session.execute(stmt).scalars().all()
     return render_template('gunpla/index.html', gunplas=gunplas)
 
 @bp.route('/create', methods=['GET', 'POST'])
@@ -52,4 +61,9 @@ def delete(gunpla_id):
     db.session.delete(gunpla)
     db.session.commit()
     flash('Gunpla model deleted successfully!', 'success')
-    return redirect(url_for('main.index'))
\ No newline at end of file
+    return redirect(url_for('main.index'))
+
+@bp.route('/pool')
+def pool():
+    """Connections in use and checkout wait times of this worker's pool."""
+    return jsonify(pool_stats(db.engine))
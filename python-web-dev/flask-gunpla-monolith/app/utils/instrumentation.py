@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from flask import before_render_template, current_app, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('gunpla.requests')
+
+_metrics = ContextVar('gunpla_request_metrics', default=None)
+
+class QueryBudgetExceeded(AssertionError):
+    """An endpoint ran more SQL statements than its ``QUERY_BUDGETS`` entry allows."""
+
+class RequestMetrics:
+    """SQL statements, database time and template rendering time of one request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_start = None
+        self.serialize_time = 0.0
+        self.statements = Counter()
+
+    @property
+    def duration(self):
+        return time.perf_counter() - self.start
+
+    def repeated(self, threshold):
+        """Statements run at least ``threshold`` times: likely N+1 queries."""
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize_time * 1000:.2f}, '
+            f'total;dur={self.duration * 1000:.2f}'
+        )
+
+class QueryTotals:
+    """SQL statements and database time summed over every instrumented request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.db_time = 0.0
+
+    def add(self, metrics):
+        with self._lock:
+            self.queries += metrics.queries
+            self.db_time += metrics.db_time
+
+query_totals = QueryTotals()
+
+def current_metrics():
+    return _metrics.get()
+
+# Outside of an instrumented request the hooks only read the context variable.
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query(conn, cursor, statement, parameters, context, executemany):
+    if _metrics.get() is not None:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def end_query(conn, cursor, statement, parameters, context, executemany):
+    metrics = _metrics.get()
+    if metrics is None or not conn.info.get('query_start'):
+        return
+    metrics.db_time += time.perf_counter() - conn.info['query_start'].pop()
+    metrics.queries += 1
+    metrics.statements[statement] += 1
+
+def start_render(sender, template, context, **extra):
+    metrics = _metrics.get()
+    if metrics is not None:
+        metrics.render_start = time.perf_counter()
+
+def end_render(sender, template, context, **extra):
+    metrics = _metrics.get()
+    if metrics is not None and metrics.render_start is not None:
+        metrics.serialize_time += time.perf_counter() - metrics.render_start
+        metrics.render_start = None
+
+def init_instrumentation(app):
+    """
+    Count the SQL statements of each request and time them, along with
+    template rendering. The figures go out as a ``Server-Timing`` header and
+    a ``gunpla.requests`` log record whose ``extra`` fields hold them.
+
+    Statements repeated ``REPEATED_QUERY_THRESHOLD`` times in one request are
+    logged as a possible N+1. ``QUERY_BUDGETS`` caps the statements of an
+    endpoint, keyed ``"<METHOD> <endpoint>"``; going over is logged, or
+    raised as ``QueryBudgetExceeded`` with ``QUERY_BUDGET_STRICT`` (the tests
+    set it). A streamed index page reads and renders its rows after the
+    headers are sent, so those are not counted.
+    """
+    app.before_request(start_request)
+    app.after_request(finish_request)
+    app.teardown_request(end_request)
+    before_render_template.connect(start_render, app)
+    template_rendered.connect(end_render, app)
+
+def start_request():
+    request.environ['gunpla.metrics_token'] = _metrics.set(RequestMetrics())
+
+def finish_request(response):
+    metrics = _metrics.get()
+    if metrics is None:
+        return response
+    response.headers['Server-Timing'] = metrics.server_timing()
+    key = f'{request.method} {request.endpoint}'
+    logger.info(
+        '%s %s %s', request.method, request.path, response.status_code,
+        extra={
+            'endpoint': key,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'serialize_ms': round(metrics.serialize_time * 1000, 2),
+            'duration_ms': round(metrics.duration * 1000, 2),
+        },
+    )
+    config = current_app.config
+    for sql, count in metrics.repeated(config.get('REPEATED_QUERY_THRESHOLD', 5)).items():
+        logger.warning('Possible N+1 in %s: %d x %s', key, count, sql)
+
+    budget = config.get('QUERY_BUDGETS', {}).get(key)
+    if budget is not None and metrics.queries > budget:
+        message = f'{key} ran {metrics.queries} queries, over its budget of {budget}'
+        if config.get('QUERY_BUDGET_STRICT'):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    return response
+
+def end_request(exc):
+    token = request.environ.pop('gunpla.metrics_token', None)
+    if token is not None:
+        query_totals.add(_metrics.get())
+        _metrics.reset(token)
@@ -0,0 +1,188 @@
+import bisect
+import gc
+import os
+import threading
+import time
+from flask import Response, current_app, request
+from app.utils.instrumentation import query_totals
+from app.utils.pool import MeteredQueuePool
+
+# Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Upper bounds, in seconds, of the request duration buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKET_BOUNDS = tuple(str(bound) for bound in BUCKETS) + ('+Inf',)
+STATUS_CLASSES = ('1xx', '2xx', '3xx', '4xx', '5xx')
+# Any other method is counted as OTHER, so clients cannot add label sets.
+METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+class RouteMetrics:
+    """Duration histogram and responses per status class of one endpoint and method."""
+
+    __slots__ = ('labels', 'lock', 'buckets', 'total', 'statuses')
+
+    def __init__(self, method, endpoint):
+        # Rendered once; observe() only bumps counters allocated here.
+        self.labels = f'method="{method}",endpoint="{endpoint}"'
+        self.lock = threading.Lock()
+        self.buckets = [0] * len(BUCKET_BOUNDS)
+        self.total = 0.0
+        self.statuses = [0] * len(STATUS_CLASSES)
+
+    def observe(self, duration, status):
+        bucket = bisect.bisect_left(BUCKETS, duration)
+        with self.lock:
+            self.buckets[bucket] += 1
+            self.total += duration
+            self.statuses[min(status // 100, 5) - 1] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.buckets), self.total, list(self.statuses)
+
+class MetricsRegistry:
+    """
+    Request metrics of this process, plus ``collectors``: callables that
+    yield the exposition lines of other metric families when scraped.
+    """
+
+    def __init__(self, collectors=()):
+        self._lock = threading.Lock()
+        self.routes = {}
+        self.in_flight = 0
+        self.collectors = list(collectors)
+
+    def route(self, endpoint, method):
+        """The RouteMetrics of ``endpoint`` and ``method``, created on first use."""
+        try:
+            return self.routes[endpoint][method]
+        except KeyError:
+            pass
+        label = method if method in METHODS else 'OTHER'
+        with self._lock:
+            methods = self.routes.setdefault(endpoint, {})
+            if label not in methods:
+                methods[label] = RouteMetrics(label, endpoint or 'unmatched')
+            return methods[label]
+
+    def start_request(self):
+        request.environ['gunpla.request_start'] = time.perf_counter()
+        with self._lock:
+            self.in_flight += 1
+
+    def finish_request(self, response):
+        # One proxy lookup instead of one per attribute
+        req = request._get_current_object()
+        start = req.environ.get('gunpla.request_start')
+        if start is not None:
+            route = self.route(req.endpoint, req.method)
+            route.observe(time.perf_counter() - start, response.status_code)
+        return response
+
+    def end_request(self, exc):
+        if request.environ.pop('gunpla.request_start', None) is not None:
+            with self._lock:
+                self.in_flight -= 1
+
+    def render(self):
+        lines = list(self.request_lines())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+    def request_lines(self):
+        with self._lock:
+            routes = [route for methods in self.routes.values() for route in methods.values()]
+            in_flight = self.in_flight
+        snapshots = [(route.labels, *route.snapshot()) for route in routes]
+        yield from family('gunpla_http_requests_in_flight', 'gauge',
+                          'Requests being handled.', [('', in_flight)])
+        name = 'gunpla_http_request_duration_seconds'
+        yield f'# HELP {name} Time from routing to the response, per endpoint and method.'
+        yield f'# TYPE {name} histogram'
+        for labels, buckets, total, _ in snapshots:
+            count = 0
+            for bound, bucket in zip(BUCKET_BOUNDS, buckets):
+                count += bucket
+                yield f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+            yield f'{name}_sum{{{labels}}} {total}'
+            yield f'{name}_count{{{labels}}} {count}'
+        yield from family('gunpla_http_responses_total', 'counter', 'Responses per status class.', [
+            (f'{labels},code="{code}"', count)
+            for labels, _, _, statuses in snapshots
+            for code, count in zip(STATUS_CLASSES, statuses) if count
+        ])
+
+def family(name, kind, help_text, samples):
+    """Exposition lines of one metric family; ``samples`` are ``(labels, value)`` pairs."""
+    yield f'# HELP {name} {help_text}'
+    yield f'# TYPE {name} {kind}'
+    for labels, value in samples:
+        yield f'{name}{{{labels}}} {value}' if labels else f'{name} {value}'
+
+def query_lines():
+    yield from family('gunpla_db_queries_total', 'counter',
+                      'SQL statements run by requests.', [('', query_totals.queries)])
+    yield from family('gunpla_db_query_seconds_total', 'counter',
+                      'Time spent in SQL statements by requests.', [('', query_totals.db_time)])
+
+def pool_lines():
+    pool = current_app.extensions['sqlalchemy'].engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return
+    stats = pool.stats
+    for name, kind, help_text, value in (
+        ('size', 'gauge', 'Connections the pool keeps open.', pool.size()),
+        ('checked_out', 'gauge', 'Connections in use.', pool.checkedout()),
+        ('idle', 'gauge', 'Open connections waiting in the pool.', pool.checkedin()),
+        ('overflow', 'gauge', 'Connections open beyond the pool size.', max(pool.overflow(), 0)),
+        ('checkouts_total', 'counter', 'Connection checkouts.', stats.checkouts),
+        ('timeouts_total', 'counter', 'Checkouts that timed out.', stats.timeouts),
+        ('wait_seconds_total', 'counter', 'Time checkouts waited for a connection.', stats.wait_total),
+        ('wait_max_seconds', 'gauge', 'Longest checkout wait.', stats.wait_max),
+    ):
+        yield from family(f'gunpla_db_pool_{name}', kind, help_text, [('', value)])
+
+def resident_memory():
+    """Resident set size in bytes, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def process_lines():
+    rss = resident_memory()
+    if rss is not None:
+        yield from family('process_resident_memory_bytes', 'gauge', 'Resident memory size.', [('', rss)])
+    yield from family('process_cpu_seconds_total', 'counter', 'User and system CPU time.',
+                      [('', time.process_time())])
+    generations = list(enumerate(gc.get_stats()))
+    for name, key, help_text in (
+        ('collections', 'collections', 'Garbage collections per generation.'),
+        ('objects_collected', 'collected', 'Objects freed by the garbage collector.'),
+        ('objects_uncollectable', 'uncollectable', 'Unreachable objects that could not be freed.'),
+    ):
+        yield from family(f'python_gc_{name}_total', 'counter', help_text,
+                          [(f'generation="{generation}"', stats[key]) for generation, stats in generations])
+
+def metrics():
+    return Response(current_app.extensions['metrics'].render(), content_type=CONTENT_TYPE)
+
+def init_metrics(app):
+    """
+    Serve this process's metrics at ``/metrics`` in the Prometheus text
+    format: a duration histogram and status class counts per endpoint and
+    method, requests in flight, SQL statements and their time, connection
+    pool usage, resident memory, CPU time and garbage collections. Set
+    ``METRICS_ENABLED = False`` to leave requests unmeasured and the route
+    unregistered.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    registry = MetricsRegistry([query_lines, pool_lines, process_lines])
+    app.extensions['metrics'] = registry
+    app.before_request(registry.start_request)
+    app.after_request(registry.finish_request)
+    app.teardown_request(registry.end_request)
+    app.add_url_rule('/metrics', view_func=metrics)
@@ -0,0 +1,91 @@
+import threading
+import time
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+class PoolStats:
+    """Checkout counters shared by a pool and the pools it is recreated as."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+def pool_options(options, url):
+    """
+    ``SQLALCHEMY_ENGINE_OPTIONS`` for ``url``: a pool profile gets
+    MeteredQueuePool. An in-memory SQLite database lives in a single
+    connection, so there the pool profile is dropped and Flask-SQLAlchemy's
+    StaticPool default applies.
+    """
+    options = dict(options or {})
+    if 'pool_size' not in options:
+        return options
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    options.setdefault('poolclass', MeteredQueuePool)
+    return options
+
+def warm_pool(engine, count):
+    """
+    Open up to ``count`` pooled connections now, so a freshly started worker
+    does not connect on its first requests. Run in each worker: connections
+    opened before a fork (gunicorn --preload) must not be shared.
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return
+    connections = [engine.connect() for _ in range(min(count, engine.pool.size()))]
+    for connection in connections:
+        connection.close()
+
+def pool_stats(engine):
+    """Connections in use and checkout wait times of ``engine``'s pool."""
+    pool = engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {'pool': type(pool).__name__}
+    stats = pool.stats
+    return {
+        'pool': type(pool).__name__,
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'idle': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'checkouts': stats.checkouts,
+        'timeouts': stats.timeouts,
+        'wait_avg_ms': round(stats.wait_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+        'wait_max_ms': round(stats.wait_max * 1000, 3),
+    }
@@ -0,0 +1,125 @@
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+import click
+from flask import current_app, request
+from itsdangerous import BadSignature, TimestampSigner
+
+logger = logging.getLogger('gunpla.profiling')
+
+HEADER = 'X-Gunpla-Profile'
+SALT = 'gunpla-profile'
+
+class Sampler:
+    """
+    Stack samples of one thread, taken every ``interval`` seconds by a
+    background thread and counted as collapsed stacks: one
+    ``outer;...;inner count`` line per distinct stack, the input format of
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval=0.005, max_samples=20000):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_samples = max_samples
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='gunpla-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while self.samples < self.max_samples and not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[collapse(frame)] += 1
+            self.samples += 1
+
+    def write(self, path):
+        with open(path, 'w') as folded:
+            for stack, count in self.stacks.most_common():
+                folded.write(f'{stack} {count}\n')
+
+def collapse(frame):
+    """``frame``'s stack as ``outer;...;inner``, one ``function (file:line)`` per frame."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', code.co_name)  # co_qualname: Python 3.11+
+        names.append(f'{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+def profile_signer(app):
+    return TimestampSigner(app.secret_key, salt=SALT)
+
+def profile_token(app):
+    """A ``X-Gunpla-Profile`` value, good for ``PROFILE_TOKEN_MAX_AGE`` seconds."""
+    return profile_signer(app).sign('profile').decode()
+
+def init_profiling(app):
+    """
+    Opt-in sampling profiler. With ``PROFILE_DIR`` set, a request carrying
+    an ``X-Gunpla-Profile`` header from ``flask profile-token`` has its
+    thread's stack sampled every ``PROFILE_INTERVAL`` seconds, and the
+    collapsed stacks are written to ``PROFILE_DIR``. The file name comes
+    back in ``X-Gunpla-Profile-File``. Other requests only pay for a header
+    lookup; without ``PROFILE_DIR`` nothing is registered.
+    """
+    @app.cli.command('profile-token')
+    def print_profile_token():
+        """Print a header value that profiles the request carrying it."""
+        click.echo(f'{HEADER}: {profile_token(app)}')
+
+    if not app.config.get('PROFILE_DIR'):
+        return
+    if not app.secret_key:
+        raise RuntimeError('PROFILE_DIR needs a SECRET_KEY to check profile tokens')
+    os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
+    app.teardown_request(stop_profile)
+
+def start_profile():
+    token = request.headers.get(HEADER)
+    if token is None:
+        return
+    config = current_app.config
+    try:
+        profile_signer(current_app).unsign(token, max_age=config.get('PROFILE_TOKEN_MAX_AGE', 3600))
+    except BadSignature:
+        logger.warning('Ignoring an invalid or expired %s header on %s', HEADER, request.path)
+        return
+    sampler = Sampler(threading.get_ident(), config.get('PROFILE_INTERVAL', 0.005),
+                      config.get('PROFILE_MAX_SAMPLES', 20000))
+    request.environ['gunpla.profiler'] = sampler.start()
+
+def finish_profile(response):
+    sampler = request.environ.pop('gunpla.profiler', None)
+    if sampler is None:
+        return response
+    sampler.stop()
+    name = (f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-'
+            f'{request.endpoint or "unmatched"}-{uuid.uuid4().hex[:8]}.folded')
+    sampler.write(os.path.join(current_app.config['PROFILE_DIR'], name))
+    logger.info('Wrote %d samples of %s %s to %s', sampler.samples, request.method, request.path, name)
+    response.headers[f'{HEADER}-File'] = name
+    return response
+
+def stop_profile(exc):
+    # The request failed before finish_profile() ran.
+    sampler = request.environ.pop('gunpla.profiler', None)
+    if sampler is not None:
+        sampler.stop()
@@ -0,0 +1,79 @@
+import json
+from flask import Response, get_flashed_messages, request, stream_template, stream_with_context
+from flask_wtf.csrf import generate_csrf
+from app import db
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+# Template output pieces joined into each chunk of a streamed page
+STREAM_BUFFER_SIZE = 200
+
+def wants_stream():
+    """True when the client asked for an NDJSON export instead of a JSON array."""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+def stream_ndjson(model, columns, criteria=(), batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream every row of ``model`` matching ``criteria`` as one JSON object per line.
+
+    Rows are fetched ``batch_size`` at a time (``yield_per``) and written out
+    as soon as each batch arrives, so memory stays flat regardless of table
+    size and the first bytes go out after the first batch.
+    """
+    stmt = (
+        db.select(*[getattr(model, column) for column in columns])
+        .where(*criteria)
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    def generate():
+        result = db.session.execute(stmt)
+        for partition in result.partitions():
+            yield ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in partition)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+class RowStream:
+    """
+    ORM objects selected by ``stmt``, fetched ``batch_size`` at a time
+    (``yield_per``) for a template that iterates over them once. The first
+    row is read up front, so ``{% if gunplas %}`` still works.
+    """
+
+    def __init__(self, stmt, batch_size=STREAM_BATCH_SIZE):
+        self._rows = iter(db.session.execute(stmt.execution_options(yield_per=batch_size)).scalars())
+        self._first = next(self._rows, None)
+
+    def __bool__(self):
+        return self._first is not None
+
+    def __iter__(self):
+        if self._first is not None:
+            yield self._first
+            yield from self._rows
+
+def stream_page(template_name, buffer_size=STREAM_BUFFER_SIZE, **context):
+    """
+    ``render_template`` as a streamed response: the page head and first rows
+    go out while later rows are still being fetched and rendered.
+    """
+    # Headers, including the session cookie, are sent before the body is
+    # rendered, so do the session writes the templates would do now.
+    generate_csrf()
+    get_flashed_messages()
+
+    def generate(chunks):
+        buffer = []
+        for chunk in chunks:
+            buffer.append(chunk)
+            if len(buffer) >= buffer_size:
+                yield ''.join(buffer)
+                buffer.clear()
+        if buffer:
+            yield ''.join(buffer)
+
+    return Response(generate(stream_template(template_name, **context)))
@@ -17,7 +17,8 @@ def app():
     app.config.update({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
-        'WTF_CSRF_ENABLED': False  # Disable CSRF for testing
+        'WTF_CSRF_ENABLED': False,  # Disable CSRF for testing
+        'QUERY_BUDGET_STRICT': True
     })
     
     # Create application context
@@ -2,6 +2,8 @@
 import pytest
 from app.models.gunpla import Gunpla
 from app import db
+from app.utils.pool import MeteredQueuePool
+from config import Config
 
 def test_new_gunpla():
     """Test creating a new Gunpla instance."""
@@ -36,4 +38,23 @@ def test_gunpla_db_interaction(app):
     # Query and verify
     saved_gunpla = Gunpla.query.first()
     assert saved_gunpla.name == 'Unicorn'
-    assert saved_gunpla.id is not None
\ No newline at end of file
+    assert saved_gunpla.id is not None
+
+
+def pragma(name):
+    return db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+
+def test_sqlite_pragmas(app):
+    """Test every connection gets the concurrency profile from Config."""
+    assert pragma('synchronous') == 1  # NORMAL
+    assert pragma('busy_timeout') == 5000
+    assert pragma('temp_store') == 2  # MEMORY
+    assert pragma('cache_size') == -64000
+
+def test_connection_pool(app):
+    """Test the engine uses the pool profile from Config and was warmed up."""
+    pool = db.engine.pool
+    assert isinstance(pool, MeteredQueuePool)
+    assert pool.size() == Config.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+    assert pool.timeout() == Config.SQLALCHEMY_ENGINE_OPTIONS['pool_timeout']
+    assert pool.checkedin() + pool.checkedout() >= Config.POOL_WARMUP
@@ -1,8 +1,12 @@
 # tests/test_routes.py
+import json
 import pytest
 from flask import url_for
 from app.models.gunpla import Gunpla
-from app import db
+from app import create_app, db
+from config import Config
+from app.utils.instrumentation import QueryBudgetExceeded
+from app.utils.profiling import profile_token
 
 def test_index_route(client):
     """Test the index route."""
@@ -10,6 +14,35 @@ def test_index_route(client):
     assert response.status_code == 200
     assert b'Gunpla Models' in response.data
 
+def test_index_stream(client, sample_gunpla):
+    """Test the NDJSON export mode of the index route."""
+    response = client.get('/?stream=1')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows == [{
+        'id': sample_gunpla.id,
+        'name': 'RX-78-2',
+        'series': 'Mobile Suit Gundam',
+        'grade': 'MG',
+        'scale': '1/100'
+    }]
+
+def test_index_streamed(client, sample_gunpla):
+    """Test the index page is streamed and still sets the session cookie."""
+    response = client.get('/')
+    assert response.is_streamed
+    assert 'session=' in response.headers['Set-Cookie']
+    assert b'<ul id="gunpla-list">' in response.data
+    assert b'RX-78-2' in response.data
+
+    client.post(f'/delete/{sample_gunpla.id}')
+    response = client.get('/')
+    assert b'Gunpla model deleted successfully!' in response.data
+    assert b'No gunpla models found.' in response.data
+    # The flash was consumed before the streamed body started.
+    assert b'Gunpla model deleted successfully!' not in client.get('/').data
+
 def test_create_route_get(client):
     """Test accessing the create form."""
     response = client.get('/create')
@@ -56,4 +89,71 @@ def test_delete_route(client, sample_gunpla):
 def test_404_route(client):
     """Test accessing a non-existent Gunpla."""
     response = client.get('/edit/999')
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+
+def test_index_filters(client, sample_gunpla):
+    """Test the index page honours the series/grade/scale/q filters."""
+    db.session.add(Gunpla(name='Exia', series='Gundam 00', grade='RG', scale='1/144'))
+    db.session.commit()
+    response = client.get('/?series=Gundam+00')
+    assert b'Exia' in response.data
+    assert b'RX-78-2' not in response.data
+
+    response = client.get('/?q=RX&scale=1/100')
+    assert b'RX-78-2' in response.data
+    assert b'Exia' not in response.data
+
+def test_pool_stats(client):
+    """Test the pool metrics report checkouts and connections in use."""
+    response = client.get('/pool')
+    assert response.status_code == 200
+    stats = response.json
+    assert stats['pool'] == 'MeteredQueuePool'
+    assert stats['checkouts'] >= 1
+    assert stats['timeouts'] == 0
+    assert stats['checked_out'] + stats['idle'] >= 1
+
+def test_server_timing(app, client, sample_gunpla):
+    """Test a rendered page reports its queries and template rendering time."""
+    app.config['STREAM_INDEX'] = False
+    response = client.get('/')
+    timing = response.headers['Server-Timing']
+    assert 'desc="1 queries"' in timing
+    assert 'serialize;dur=0.00,' not in timing
+
+def test_query_budget(app, client, sample_gunpla):
+    """Test an endpoint over its query budget fails the test."""
+    app.config.update(STREAM_INDEX=False, QUERY_BUDGETS={'GET main.index': 0})
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/')
+
+def test_metrics(client, sample_gunpla):
+    """Test /metrics counts requests per route in the Prometheus text format."""
+    client.get('/')
+    client.get('/edit/999')
+    response = client.get('/metrics')
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+    assert 'gunpla_http_request_duration_seconds_count{method="GET",endpoint="main.index"} 1' in body
+    assert 'gunpla_http_responses_total{method="GET",endpoint="main.edit",code="4xx"} 1' in body
+    assert 'gunpla_http_requests_in_flight 1' in body
+    assert '# TYPE python_gc_collections_total counter' in body
+
+def test_profile_header(tmp_path):
+    """Test a signed header profiles its request into PROFILE_DIR and a forged one does not."""
+    class ProfilingConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+        PROFILE_DIR = str(tmp_path)
+        PROFILE_INTERVAL = 0.001
+
+    app = create_app(ProfilingConfig)
+    client = app.test_client()
+    forged = client.get('/create', headers={'X-Gunpla-Profile': 'profile.forged'})
+    assert 'X-Gunpla-Profile-File' not in forged.headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get('/create', headers={'X-Gunpla-Profile': profile_token(app)})
+    name = response.headers['X-Gunpla-Profile-File']
+    assert '-GET-main.create-' in name
+    assert (tmp_path / name).exists()
@@ -1,32 +1,76 @@
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_restful import Api
 from config.settings import Config
 from app.models import db
-import os
+from app.utils.cache import init_cache
+from app.utils.compression import init_compression
+from app.utils.events import init_events
+from app.utils.static import init_static, serve_asset
+from app.utils.sqlite import configure_sqlite
+from app.utils.pool import pool_options, warm_pool
+from app.utils.async_db import init_async_db
+from app.utils.lookups import init_lookups, upgrade_lookup_schema
+from app.utils.instrumentation import init_instrumentation, instrument_api
+from app.utils.metrics import init_metrics
+from app.utils.profiling import init_profiling
 
 def create_app(config_class=Config):
-    app = Flask(__name__, static_folder='../../frontend/dist', static_url_path='')
+    return build_app(config_class)
+
+def create_async_app(config_class=Config):
+    """
+    Same app and ``/gunplas`` contract as ``create_app``, but the API
+    resources are coroutines on a SQLAlchemy ``AsyncSession`` (aiosqlite).
+    Flask-SQLAlchemy still owns the schema. Needs a file database.
+    """
+    return build_app(config_class, use_async=True)
+
+def build_app(config_class, use_async=False):
+    # frontend/dist is served from an in-memory manifest by serve() below.
+    app = Flask(__name__, static_folder=None)
     app.config.from_object(config_class)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_options(
+        app.config.get('SQLALCHEMY_ENGINE_OPTIONS'), app.config['SQLALCHEMY_DATABASE_URI']
+    )
     
     # Initialize extensions
     db.init_app(app)
+    init_cache(app)
+    init_events(app)
+    init_static(app)
+    init_lookups(app)
+    init_compression(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    init_profiling(app)
     
     # Initialize API
     api = Api(app)
+    instrument_api(api)
     
     # Register blueprints and resources
-    from app.api.routes import initialize_routes
+    if use_async:
+        from app.api.async_routes import initialize_routes
+    else:
+        from app.api.routes import initialize_routes
     initialize_routes(api)
     
     # Create database tables
+    from app.utils.search import ensure_search_index
+    from app.utils.stats import ensure_stats
     with app.app_context():
+        configure_sqlite(db.engine, app.config.get('SQLITE_PRAGMAS'))
+        upgrade_lookup_schema()
         db.create_all()
+        ensure_search_index()
+        ensure_stats()
+        warm_pool(db.engine, app.config.get('POOL_WARMUP', 0))
+        if use_async:
+            init_async_db(app)
 
     @app.route('/', defaults={'path': ''})
     @app.route('/<path:path>')
     def serve(path):
-        if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-            return send_from_directory(app.static_folder, path)
-        return send_from_directory(app.static_folder, 'index.html')
+        return serve_asset(path)
 
     return app
\ No newline at end of file
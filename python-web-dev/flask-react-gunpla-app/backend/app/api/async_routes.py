@@ -0,0 +1,222 @@
+from flask import current_app, request
+from flask_restful import Resource
+from app.models.gunpla import Gunpla
+from app.utils.async_db import async_session
+from app.utils.request_parser import parse_gunpla
+from app.utils.streaming import wants_stream, stream_ndjson
+from app.utils.filters import gunpla_criteria
+from app.utils.columnar import wants_columnar, columnar
+from app.utils.search import search_gunplas
+from app.utils.stats import gunpla_stats
+from app.utils.conditional import (
+    table_version, atable_version, list_etag, content_etag, validator_headers, is_not_modified
+)
+from app.utils.cache import get_cache, detail_key, list_key
+from app.utils.pool import pool_stats
+from app.utils.events import event_stream, publish_change
+from app.utils import bulk
+from app.models import db
+
+def run_async(method):
+    # Flask-RESTful calls handlers directly; Flask's ensure_sync runs a
+    # coroutine handler to completion on an event loop.
+    return current_app.ensure_sync(method)
+
+class AsyncResource(Resource):
+    """Resource whose handlers are coroutines using ``async_session()``."""
+    method_decorators = [run_async]
+
+class GunplaListResource(AsyncResource):
+    def get(self):
+        if wants_stream():
+            # stream_with_context() re-pushes the request context pushed by
+            # this thread, which an async view does not run in, so the NDJSON
+            # export stays on the sync engine and its yield_per stream.
+            return self.stream()
+        return current_app.ensure_sync(self.list)()
+
+    def stream(self):
+        version = table_version()
+        headers = {}
+        if version is not None:
+            headers = validator_headers(list_etag(version), version.updated_at)
+            if is_not_modified(headers['ETag'], version.updated_at):
+                return None, 304, headers
+        response = stream_ndjson(Gunpla, Gunpla.COLUMNS, gunpla_criteria(request.args))
+        response.headers.update(headers)
+        return response
+
+    async def list(self):
+        async with async_session() as session:
+            # Answer unchanged polls with a 304 after one primary-key lookup.
+            version = await atable_version(session)
+            headers = {}
+            if version is not None:
+                headers = validator_headers(list_etag(version), version.updated_at)
+                if is_not_modified(headers['ETag'], version.updated_at):
+                    return None, 304, headers
+
+            cache = get_cache()
+            cache_key = list_key(headers['ETag']) if headers else None
+            data = cache.get(cache_key)
+            if data is None:
+                criteria = gunpla_criteria(request.args)
+                if wants_columnar():
+                    rows = await session.execute(
+                        db.select(*Gunpla.columns()).where(*criteria).order_by(Gunpla.id)
+                    )
+                    data = columnar(Gunpla.COLUMNS, rows)
+                else:
+                    gunplas = await session.scalars(
+                        db.select(Gunpla).where(*criteria).order_by(Gunpla.id)
+                    )
+                    data = [gunpla.to_dict() for gunpla in gunplas]
+                cache.set(cache_key, data)
+            return data, 200, headers
+
+    async def post(self):
+        try:
+            args = parse_gunpla()
+            new_gunpla = Gunpla(
+                name=args['name'],
+                series=args['series'],
+                grade=args['grade'],
+                scale=args.get('scale')
+            )
+            async with async_session() as session:
+                session.add(new_gunpla)
+                await session.commit()
+            data = new_gunpla.to_dict()
+            publish_change('created', data)
+            return data, 201
+        except Exception as e:
+            # Return validation errors as is since they're already formatted correctly
+            if hasattr(e, 'data') and isinstance(e.data, dict):
+                return e.data, 400
+            return {"message": str(e)}, 400
+
+class GunplaResource(AsyncResource):
+    async def get(self, gunpla_id):
+        cache = get_cache()
+        async with async_session() as session:
+            cache_key = detail_key(gunpla_id, await atable_version(session))
+            data = cache.get(cache_key)
+            if data is None:
+                gunpla = await session.get(Gunpla, gunpla_id)
+                if gunpla is None:
+                    return {'message': 'Gunpla model not found'}, 404
+                data = gunpla.to_dict()
+                cache.set(cache_key, data)
+        headers = validator_headers(content_etag(data))
+        if is_not_modified(headers['ETag']):
+            return None, 304, headers
+        return data, 200, headers
+
+    async def put(self, gunpla_id):
+        async with async_session() as session:
+            gunpla = await session.get(Gunpla, gunpla_id)
+            if gunpla is None:
+                return {'message': 'Gunpla model not found'}, 404
+
+            args = parse_gunpla()
+            gunpla.name = args['name']
+            gunpla.series = args['series']
+            gunpla.grade = args['grade']
+            gunpla.scale = args.get('scale')
+            await session.commit()
+        data = gunpla.to_dict()
+        publish_change('updated', data)
+        return data, 200
+
+    async def delete(self, gunpla_id):
+        async with async_session() as session:
+            gunpla = await session.get(Gunpla, gunpla_id)
+            if gunpla is None:
+                return {'message': 'Gunpla model not found'}, 404
+            await session.delete(gunpla)
+            await session.commit()
+        publish_change('deleted', {'id': gunpla_id})
+        return {'message': 'Gunpla model deleted successfully'}, 200
+
+class GunplaSearchResource(AsyncResource):
+    """Full-text search over name and series, best BM25 match first."""
+    default_limit = 50
+    max_limit = 1000
+
+    async def get(self):
+        q = request.args.get('q', '')
+        limit = request.args.get('limit', self.default_limit, type=int)
+        limit = max(1, min(limit, self.max_limit))
+        async with async_session() as session:
+            results = await session.run_sync(lambda sync_session: search_gunplas(q, limit, session=sync_session))
+        return results, 200
+
+class GunplaStatsResource(AsyncResource):
+    """Counts per series, grade and scale, from the trigger-maintained summary table."""
+
+    async def get(self):
+        async with async_session() as session:
+            return await session.run_sync(lambda sync_session: gunpla_stats(session=sync_session)), 200
+
+class GunplaBulkResource(AsyncResource):
+    """
+    Batch writes for catalog syncs, as in ``app.api.routes``. The chunked
+    bulk helpers run unchanged on the AsyncSession through ``run_sync``.
+    """
+    def bulk_response(self, key, count, errors, success_status):
+        if count:
+            # Too many rows for one event each: subscribers reload instead.
+            publish_change('reset', {})
+        if errors and not count:
+            return {key: count, 'errors': errors}, 400
+        return {key: count, 'errors': errors}, success_status
+
+    async def run_bulk(self, operation, items):
+        async with async_session() as session:
+            return await session.run_sync(lambda sync_session: operation(items, session=sync_session))
+
+    async def post(self):
+        items = bulk.parse_items()
+        if items is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        created, errors = await self.run_bulk(bulk.bulk_create, items)
+        return self.bulk_response('created', created, errors, 201)
+
+    async def put(self):
+        items = bulk.parse_items()
+        if items is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        updated, errors = await self.run_bulk(bulk.bulk_update, items)
+        return self.bulk_response('updated', updated, errors, 200)
+
+    async def delete(self):
+        ids = bulk.parse_items()
+        if ids is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        deleted, errors = await self.run_bulk(bulk.bulk_delete, ids)
+        return self.bulk_response('deleted', deleted, errors, 200)
+
+class GunplaCacheResource(Resource):
+    """Per-process hit/miss counters of the response cache, for sizing it."""
+    def get(self):
+        return get_cache().stats(), 200
+
+class GunplaEventsResource(Resource):
+    """Server-Sent Events stream of created/updated/deleted Gunpla models."""
+    def get(self):
+        return event_stream()
+
+class GunplaPoolResource(Resource):
+    """Connections in use and checkout wait times of this worker's pool."""
+    def get(self):
+        return pool_stats(db.engine), 200
+
+def initialize_routes(api):
+    api.add_resource(GunplaListResource, '/gunplas')
+    api.add_resource(GunplaSearchResource, '/gunplas/search')
+    api.add_resource(GunplaStatsResource, '/gunplas/stats')
+    api.add_resource(GunplaBulkResource, '/gunplas/bulk')
+    api.add_resource(GunplaCacheResource, '/gunplas/cache')
+    api.add_resource(GunplaPoolResource, '/gunplas/pool')
+    api.add_resource(GunplaEventsResource, '/gunplas/events')
+    api.add_resource(GunplaResource, '/gunplas/<int:gunpla_id>')
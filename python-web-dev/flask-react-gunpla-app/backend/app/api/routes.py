@@ -1,16 +1,56 @@
+from flask import request
 from flask_restful import Resource
 from app.models.gunpla import Gunpla
-from app.utils.request_parser import gunpla_parser
+from app.utils.request_parser import parse_gunpla
+from app.utils.streaming import wants_stream, stream_ndjson
+from app.utils.filters import gunpla_criteria
+from app.utils.columnar import wants_columnar, columnar
+from app.utils.search import search_gunplas
+from app.utils.stats import gunpla_stats
+from app.utils.conditional import (
+    table_version, list_etag, content_etag, validator_headers, is_not_modified
+)
+from app.utils.cache import get_cache, detail_key, list_key
+from app.utils.pool import pool_stats
+from app.utils.events import event_stream, publish_change
+from app.utils import bulk
 from app.models import db
 
 class GunplaListResource(Resource):
     def get(self):
-        gunplas = Gunpla.query.all()
-        return [gunpla.to_dict() for gunpla in gunplas], 200
+        # Answer unchanged polls with a 304 after one primary-key lookup.
+        version = table_version()
+        headers = {}
+        if version is not None:
+            headers = validator_headers(list_etag(version), version.updated_at)
+            if is_not_modified(headers['ETag'], version.updated_at):
+                return None, 304, headers
+
+        criteria = gunpla_criteria(request.args)
+        if wants_stream():
+            response = stream_ndjson(Gunpla, Gunpla.COLUMNS, criteria)
+            response.headers.update(headers)
+            return response
+        cache = get_cache()
+        cache_key = list_key(headers['ETag']) if headers else None
+        data = cache.get(cache_key)
+        if data is None:
+            if wants_columnar():
+                rows = db.session.execute(
+                    db.select(*Gunpla.columns()).where(*criteria).order_by(Gunpla.id)
+                )
+                data = columnar(Gunpla.COLUMNS, rows)
+            else:
+                gunplas = db.session.execute(
+                    db.select(Gunpla).where(*criteria).order_by(Gunpla.id)
+                ).scalars().all()
+                data = [gunpla.to_dict() for gunpla in gunplas]
+            cache.set(cache_key, data)
+        return data, 200, headers
 
     def post(self):
         try:
-            args = gunpla_parser.parse_args()
+            args = parse_gunpla()
             new_gunpla = Gunpla(
                 name=args['name'],
                 series=args['series'],
@@ -19,7 +59,9 @@ class GunplaListResource(Resource):
             )
             db.session.add(new_gunpla)
             db.session.commit()
-            return new_gunpla.to_dict(), 201
+            data = new_gunpla.to_dict()
+            publish_change('created', data)
+            return data, 201
         except Exception as e:
             # Return validation errors as is since they're already formatted correctly
             if hasattr(e, 'data') and isinstance(e.data, dict):
@@ -28,23 +70,35 @@ class GunplaListResource(Resource):
 
 class GunplaResource(Resource):
     def get(self, gunpla_id):
-        gunpla = db.session.get(Gunpla, gunpla_id)
-        if gunpla is None:
-            return {'message': 'Gunpla model not found'}, 404
-        return gunpla.to_dict(), 200
+        cache = get_cache()
+        # The version before the row, so a racing write can only make the entry newer.
+        cache_key = detail_key(gunpla_id, table_version())
+        data = cache.get(cache_key)
+        if data is None:
+            gunpla = db.session.get(Gunpla, gunpla_id)
+            if gunpla is None:
+                return {'message': 'Gunpla model not found'}, 404
+            data = gunpla.to_dict()
+            cache.set(cache_key, data)
+        headers = validator_headers(content_etag(data))
+        if is_not_modified(headers['ETag']):
+            return None, 304, headers
+        return data, 200, headers
 
     def put(self, gunpla_id):
         gunpla = db.session.get(Gunpla, gunpla_id)
         if gunpla is None:
             return {'message': 'Gunpla model not found'}, 404
         
-        args = gunpla_parser.parse_args()
+        args = parse_gunpla()
         gunpla.name = args['name']
         gunpla.series = args['series']
         gunpla.grade = args['grade']
         gunpla.scale = args.get('scale')
         db.session.commit()
-        return gunpla.to_dict(), 200
+        data = gunpla.to_dict()
+        publish_change('updated', data)
+        return data, 200
 
     def delete(self, gunpla_id):
         gunpla = db.session.get(Gunpla, gunpla_id)
@@ -52,8 +106,82 @@ class GunplaResource(Resource):
             return {'message': 'Gunpla model not found'}, 404
         db.session.delete(gunpla)
         db.session.commit()
+        publish_change('deleted', {'id': gunpla_id})
         return {'message': 'Gunpla model deleted successfully'}, 200
 
+class GunplaSearchResource(Resource):
+    """Full-text search over name and series, best BM25 match first."""
+    default_limit = 50
+    max_limit = 1000
+
+    def get(self):
+        q = request.args.get('q', '')
+        limit = request.args.get('limit', self.default_limit, type=int)
+        limit = max(1, min(limit, self.max_limit))
+        return search_gunplas(q, limit), 200
+
+class GunplaStatsResource(Resource):
+    """Counts per series, grade and scale, from the trigger-maintained summary table."""
+
+    def get(self):
+        return gunpla_stats(), 200
+
+class GunplaBulkResource(Resource):
+    """
+    Batch writes for catalog syncs. Each method takes a JSON array (or an
+    NDJSON body): POST creates items, PUT updates items by ``id`` and DELETE
+    removes a list of ids. Invalid items are skipped and reported by index.
+    """
+    def bulk_response(self, key, count, errors, success_status):
+        if count:
+            # Too many rows for one event each: subscribers reload instead.
+            publish_change('reset', {})
+        if errors and not count:
+            return {key: count, 'errors': errors}, 400
+        return {key: count, 'errors': errors}, success_status
+
+    def post(self):
+        items = bulk.parse_items()
+        if items is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        created, errors = bulk.bulk_create(items)
+        return self.bulk_response('created', created, errors, 201)
+
+    def put(self):
+        items = bulk.parse_items()
+        if items is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        updated, errors = bulk.bulk_update(items)
+        return self.bulk_response('updated', updated, errors, 200)
+
+    def delete(self):
+        ids = bulk.parse_items()
+        if ids is None:
+            return {'message': 'Expected a JSON array.'}, 400
+        deleted, errors = bulk.bulk_delete(ids)
+        return self.bulk_response('deleted', deleted, errors, 200)
+
+class GunplaCacheResource(Resource):
+    """Per-process hit/miss counters of the response cache, for sizing it."""
+    def get(self):
+        return get_cache().stats(), 200
+
+class GunplaEventsResource(Resource):
+    """Server-Sent Events stream of created/updated/deleted Gunpla models."""
+    def get(self):
+        return event_stream()
+
+class GunplaPoolResource(Resource):
+    """Connections in use and checkout wait times of this worker's pool."""
+    def get(self):
+        return pool_stats(db.engine), 200
+
 def initialize_routes(api):
     api.add_resource(GunplaListResource, '/gunplas')
+    api.add_resource(GunplaSearchResource, '/gunplas/search')
+    api.add_resource(GunplaStatsResource, '/gunplas/stats')
+    api.add_resource(GunplaBulkResource, '/gunplas/bulk')
+    api.add_resource(GunplaCacheResource, '/gunplas/cache')
+    api.add_resource(GunplaPoolResource, '/gunplas/pool')
+    api.add_resource(GunplaEventsResource, '/gunplas/events')
     api.add_resource(GunplaResource, '/gunplas/<int:gunpla_id>')
\ No newline at end of file
@@ -1,11 +1,38 @@
 from app.models import db
 
+class Series(db.Model):
+    """Lookup table of series names, referenced by ``Gunpla.series_id``."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False, unique=True)
+
+class Grade(db.Model):
+    """Lookup table of grade names, referenced by ``Gunpla.grade_id``."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+def lookup_name(model, foreign_key):
+    return db.column_property(
+        db.select(model.name).where(model.id == foreign_key).correlate_except(model).scalar_subquery()
+    )
+
 class Gunpla(db.Model):
+    COLUMNS = ('id', 'name', 'series', 'grade', 'scale')
+
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(80), nullable=False)
-    series = db.Column(db.String(120), nullable=False)
-    grade = db.Column(db.String(50), nullable=False)
-    scale = db.Column(db.String(20), nullable=True)
+    name = db.Column(db.String(80), nullable=False, index=True)
+    series_id = db.Column(db.Integer, db.ForeignKey('series.id'), nullable=False, index=True)
+    grade_id = db.Column(db.Integer, db.ForeignKey('grade.id'), nullable=False, index=True)
+    scale = db.Column(db.String(20), nullable=True, index=True)
+
+    # The names, loaded with the row by a primary-key subquery. Assigning a
+    # name is turned into the foreign key on flush (see app/utils/lookups.py).
+    series = lookup_name(Series, series_id)
+    grade = lookup_name(Grade, grade_id)
+
+    @classmethod
+    def columns(cls):
+        """The ``COLUMNS`` attributes, for selecting rows as plain tuples."""
+        return [getattr(cls, column) for column in cls.COLUMNS]
 
     def to_dict(self):
         return {
@@ -14,4 +41,34 @@ class Gunpla(db.Model):
             'series': self.series,
             'grade': self.grade,
             'scale': self.scale
-        }
\ No newline at end of file
+        }
+
+class GunplaVersion(db.Model):
+    """
+    Single-row change counter for the gunpla table.
+
+    Triggers (see ``app.utils.conditional``) bump ``version`` and
+    ``updated_at`` on every insert, update and delete, including bulk
+    writes, so list ETags can be checked with one primary-key lookup.
+    """
+    __tablename__ = 'gunpla_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+class GunplaStat(db.Model):
+    """
+    Number of Gunpla per distinct series, grade and scale value.
+
+    Triggers (see ``app.utils.stats``) adjust the counts on every insert,
+    update and delete, so ``/gunplas/stats`` reads one row per value
+    instead of aggregating the gunpla table.
+    """
+    __tablename__ = 'gunpla_stats'
+    __table_args__ = (db.Index('ix_gunpla_stats_dimension_value', 'dimension', 'value'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(10), nullable=False)
+    value = db.Column(db.String(120), nullable=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
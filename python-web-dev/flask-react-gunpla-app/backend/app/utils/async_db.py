@@ -0,0 +1,28 @@
+from flask import current_app
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.models import db
+from app.utils.sqlite import configure_sqlite
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite'}
+
+def init_async_db(app):
+    """
+    Create an AsyncEngine on the same database as ``db.engine`` and attach an
+    ``async_sessionmaker`` to ``app``. Call inside an app context.
+
+    Flask runs each async view on its own event loop, and pooled asyncio
+    connections must not move between loops, so the engine uses NullPool.
+    An in-memory SQLite database is private to one connection and would not
+    be shared with the sync engine that creates the schema, so it is refused.
+    """
+    url = db.engine.url
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        raise RuntimeError('create_async_app needs a file database; sqlite:///:memory: is per connection.')
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    engine = create_async_engine(url, poolclass=NullPool)
+    configure_sqlite(engine.sync_engine, app.config.get('SQLITE_PRAGMAS'))
+    app.extensions['async_session'] = async_sessionmaker(engine, expire_on_commit=False)
+
+def async_session():
+    return current_app.extensions['async_session']()
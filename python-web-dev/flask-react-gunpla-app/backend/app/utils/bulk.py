@@ -0,0 +1,114 @@
+import json
+from itertools import islice
+from flask import current_app, request
+from app.models import db
+from app.models.gunpla import Gunpla
+from app.utils.request_parser import validate_gunpla
+from app.utils.lookups import resolve_lookups
+from app.utils.streaming import NDJSON_MIMETYPE
+
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+def get_chunk_size():
+    return current_app.config.get('BULK_CHUNK_SIZE', DEFAULT_BULK_CHUNK_SIZE)
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def parse_items():
+    """Read the request body as a JSON array or as NDJSON. Returns None if it is neither."""
+    if request.mimetype == NDJSON_MIMETYPE:
+        try:
+            return [json.loads(line) for line in request.stream if line.strip()]
+        except ValueError:
+            return None
+    data = request.get_json(silent=True)
+    return data if isinstance(data, list) else None
+
+def validate_items(items):
+    """Split items into ``(index, data)`` pairs and ``{"index", "message"}`` errors."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        data, messages = validate_gunpla(item)
+        if messages:
+            errors.append({'index': index, 'message': list(messages.values())})
+        else:
+            valid.append((index, data))
+    return valid, errors
+
+def bulk_create(items, chunk_size=None, session=None):
+    """Insert valid items with one executemany INSERT and one COMMIT per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    if session is None:
+        session = db.session
+    valid, errors = validate_items(items)
+    created = 0
+    for chunk in chunked(valid, chunk_size):
+        session.execute(db.insert(Gunpla), [resolve_lookups(session, data) for _, data in chunk])
+        session.commit()
+        created += len(chunk)
+    return created, errors
+
+def bulk_update(items, chunk_size=None, session=None):
+    """Update existing rows by ``id`` with one executemany UPDATE and one COMMIT per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    if session is None:
+        session = db.session
+    errors = []
+    with_ids = []
+    for index, item in enumerate(items):
+        if isinstance(item, dict) and isinstance(item.get('id'), int):
+            with_ids.append((index, item))
+        else:
+            errors.append({'index': index, 'message': ["Id field is required."]})
+
+    valid, validation_errors = validate_items(item for _, item in with_ids)
+    for error in validation_errors:
+        error['index'] = with_ids[error['index']][0]
+    errors.extend(validation_errors)
+
+    updated = 0
+    for chunk in chunked(valid, chunk_size):
+        ids = [with_ids[position][1]['id'] for position, _ in chunk]
+        existing = set(session.scalars(db.select(Gunpla.id).where(Gunpla.id.in_(ids))))
+        rows = []
+        for (position, data), gunpla_id in zip(chunk, ids):
+            if gunpla_id in existing:
+                rows.append({'id': gunpla_id, **resolve_lookups(session, data)})
+            else:
+                errors.append({'index': with_ids[position][0], 'message': ['Gunpla model not found']})
+        if rows:
+            session.execute(db.update(Gunpla), rows)
+        session.commit()
+        updated += len(rows)
+    errors.sort(key=lambda error: error['index'])
+    return updated, errors
+
+def bulk_delete(ids, chunk_size=None, session=None):
+    """Delete rows with one ``DELETE ... WHERE id IN (...)`` and one COMMIT per chunk."""
+    chunk_size = chunk_size or get_chunk_size()
+    if session is None:
+        session = db.session
+    errors = []
+    valid = []
+    for index, gunpla_id in enumerate(ids):
+        if isinstance(gunpla_id, int):
+            valid.append((index, gunpla_id))
+        else:
+            errors.append({'index': index, 'message': ["Id must be an integer."]})
+
+    deleted = 0
+    for chunk in chunked(valid, chunk_size):
+        chunk_ids = [gunpla_id for _, gunpla_id in chunk]
+        found = set(session.scalars(db.select(Gunpla.id).where(Gunpla.id.in_(chunk_ids))))
+        session.execute(db.delete(Gunpla).where(Gunpla.id.in_(found)))
+        session.commit()
+        deleted += len(found)
+        errors.extend(
+            {'index': index, 'message': ['Gunpla model not found']}
+            for index, gunpla_id in chunk if gunpla_id not in found
+        )
+    errors.sort(key=lambda error: error['index'])
+    return deleted, errors
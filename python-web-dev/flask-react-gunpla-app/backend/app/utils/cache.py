@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+class LRUCache:
+    """In-process cache bounded by entry count, with a per-entry TTL."""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisCache:
+    """
+    Cache shared between workers through a local Redis (or any server that
+    speaks its protocol). Values are stored as JSON with a TTL; eviction is
+    left to the server's ``maxmemory-policy``.
+    """
+
+    def __init__(self, url, ttl=60, prefix='gunpla:'):
+        import redis  # optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + '*'))
+
+class ResponseCache:
+    """Wraps a backend and counts hits and misses for sizing it."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if key is None:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if key is not None:
+            self.backend.set(key, value)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+            'entries': len(self.backend),
+        }
+
+def init_cache(app):
+    """Build the response cache from ``CACHE_*`` config and attach it to ``app``."""
+    ttl = app.config.get('CACHE_TTL', 60)
+    if app.config.get('CACHE_REDIS_URL'):
+        backend = RedisCache(app.config['CACHE_REDIS_URL'], ttl)
+    else:
+        backend = LRUCache(app.config.get('CACHE_MAX_ENTRIES', 1024), ttl)
+    app.extensions['response_cache'] = ResponseCache(backend)
+
+def get_cache():
+    return current_app.extensions['response_cache']
+
+def detail_key(gunpla_id, version):
+    # Keyed by the table version, as the lists are: a write in any worker
+    # moves every detail to a new key, so none is served stale from another
+    # process's cache. Without a version (no triggers) details are not cached.
+    if version is None:
+        return None
+    return f'detail:{version.version}:{gunpla_id}'
+
+def list_key(etag):
+    # List ETags embed the table version, so any write moves every list to a
+    # new key and the stale ones age out of the cache.
+    return f'list:{etag}'
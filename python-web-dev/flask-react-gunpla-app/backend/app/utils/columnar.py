@@ -0,0 +1,35 @@
+from flask import request
+from app.utils.instrumentation import timed_serialization
+
+# Low-cardinality columns sent dictionary-encoded
+CATEGORICAL = ('series', 'grade', 'scale')
+
+def wants_columnar():
+    """True when the client asked for ``?format=columnar``."""
+    return request.args.get('format') == 'columnar'
+
+def encode_column(values):
+    """Dictionary-encode ``values`` as ``{"values": [distinct...], "codes": [index...]}``."""
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return {'values': list(index), 'codes': codes}
+
+@timed_serialization
+def columnar(columns, rows, categorical=CATEGORICAL):
+    """
+    ``rows`` (tuples in ``columns`` order) as one array per column instead of
+    one object per row. ``categorical`` columns are dictionary-encoded:
+    ``values`` holds each distinct value once, in order of first appearance,
+    and ``codes`` one index into it per row::
+
+        {"count": 2, "columns": {"id": [1, 2], "name": ["RX-78-2", "Zaku II"],
+         "series": {"values": ["Mobile Suit Gundam"], "codes": [0, 0]}, ...}}
+
+    ``decodeColumnar()`` in ``src/api/gunplaApi.js`` turns this back into
+    row objects.
+    """
+    rows = list(rows)
+    data = {}
+    for column, values in zip(columns, zip(*rows) if rows else [()] * len(columns)):
+        data[column] = encode_column(values) if column in categorical else list(values)
+    return {'count': len(rows), 'columns': data}
@@ -0,0 +1,121 @@
+import zlib
+from flask import request
+
+# Levels tuned for dynamic responses: most of the size win for little CPU.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# JSON and the NDJSON export. SSE streams and the static manifest (which
+# negotiates its own precompressed variants) are left alone.
+COMPRESSIBLE = ('application/json', 'application/x-ndjson')
+
+class GzipEncoder:
+    def __init__(self, level=GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+    def chunk(self, data):
+        # Sync-flush so each streamed chunk reaches the client right away.
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class BrotliEncoder:
+    def __init__(self, level=BROTLI_QUALITY):
+        import brotli  # optional dependency
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.finish()
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class ZstdEncoder:
+    def __init__(self, level=ZSTD_LEVEL):
+        import zstandard  # optional dependency
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self):
+        return self._compressor.flush()
+
+ENCODERS = {'zstd': ZstdEncoder, 'br': BrotliEncoder, 'gzip': GzipEncoder}
+
+def available_encodings(encodings):
+    """``encodings`` minus those whose optional package is not installed."""
+    available = []
+    for encoding in encodings:
+        try:
+            ENCODERS[encoding]()
+        except (KeyError, ImportError):
+            continue
+        available.append(encoding)
+    return available
+
+def compress_stream(encoder, chunks):
+    for chunk in chunks:
+        data = encoder.chunk(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+def init_compression(app):
+    """
+    Compress JSON responses with the first of ``COMPRESSION_ENCODINGS`` the
+    client accepts (q-values first, then config order). Bodies under
+    ``COMPRESSION_MIN_SIZE`` bytes are sent as is. Streamed responses are
+    compressed chunk by chunk with a flush after each, so they keep streaming.
+    Strong ETags are weakened since the bytes no longer match the identity
+    representation they were computed for.
+    """
+    encodings = available_encodings(app.config.get('COMPRESSION_ENCODINGS', ()))
+    app.extensions['compression'] = encodings
+    if not encodings:
+        return
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            request.method == 'HEAD'
+            or response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE
+            or 'no-transform' in response.headers.get('Cache-Control', '')
+        ):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(encodings)
+        if encoding is None:
+            return response
+
+        encoder = ENCODERS[encoding]()
+        if response.is_streamed:
+            response.response = compress_stream(encoder, response.iter_encoded())
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < min_size:
+                return response
+            response.set_data(encoder.compress(body))
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        response.headers['Content-Encoding'] = encoding
+        return response
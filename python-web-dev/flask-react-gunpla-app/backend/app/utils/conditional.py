@@ -0,0 +1,76 @@
+import hashlib
+import json
+from flask import request
+from sqlalchemy import DDL, event
+from app.models import db
+from app.models.gunpla import GunplaVersion
+
+BUMP = (
+    "UPDATE gunpla_version SET version = version + 1, "
+    "updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now') WHERE id = 1;"
+)
+
+# Runs after every create_all(), so existing databases pick the triggers up
+# too. SQLite-only: elsewhere the counter is never bumped and no list ETags
+# are emitted.
+VERSION_SETUP = [
+    "INSERT OR IGNORE INTO gunpla_version (id, version, updated_at) "
+    "VALUES (1, 0, strftime('%Y-%m-%d %H:%M:%f', 'now'))",
+    f"CREATE TRIGGER IF NOT EXISTS gunpla_version_ai AFTER INSERT ON gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER IF NOT EXISTS gunpla_version_au AFTER UPDATE ON gunpla BEGIN {BUMP} END",
+    f"CREATE TRIGGER IF NOT EXISTS gunpla_version_ad AFTER DELETE ON gunpla BEGIN {BUMP} END",
+]
+
+for statement in VERSION_SETUP:
+    # DDL() applies %-formatting to its statement, so escape strftime's %s.
+    event.listen(
+        db.metadata, 'after_create',
+        DDL(statement.replace('%', '%%')).execute_if(dialect='sqlite')
+    )
+
+def table_version():
+    """Current GunplaVersion row, or None where no triggers maintain it."""
+    if db.engine.dialect.name != 'sqlite':
+        return None
+    return db.session.get(GunplaVersion, 1)
+
+async def atable_version(session):
+    """``table_version`` for the async resources, on an ``AsyncSession``."""
+    if session.bind.dialect.name != 'sqlite':
+        return None
+    return await session.get(GunplaVersion, 1)
+
+def quote(etag):
+    return f'"{etag}"'
+
+def list_etag(version):
+    """
+    Strong ETag for a list response: the table version plus everything that
+    shapes the representation (query string and negotiated format).
+    """
+    key = f"{request.full_path}|{request.headers.get('Accept', '')}"
+    return quote(f"{version.version}-{hashlib.md5(key.encode()).hexdigest()[:16]}")
+
+def content_etag(data):
+    """Strong ETag derived from the representation itself."""
+    body = json.dumps(data, sort_keys=True).encode()
+    return quote(hashlib.md5(body).hexdigest())
+
+def validator_headers(etag, last_modified=None):
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    return headers
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET. As in RFC 9110,
+    If-Modified-Since is only consulted when If-None-Match is absent, and
+    If-None-Match uses the weak comparison, so the W/ ETags of compressed
+    responses still match.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag.strip('"'))
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
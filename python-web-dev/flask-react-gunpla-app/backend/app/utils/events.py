@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from collections import deque
+from flask import Response, current_app, request
+
+SSE_MIMETYPE = 'text/event-stream'
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+class EventBroker:
+    """
+    In-process fan-out of change events to Server-Sent Events subscribers.
+
+    Events go into one bounded ring buffer with increasing ids. Publishing
+    is an append plus a notify_all, and a subscriber is only a cursor into
+    the buffer waiting on the shared condition: no queue or thread is kept
+    per subscriber, so idle subscribers cost just their request handler (a
+    greenlet under ``gunicorn -k gevent``). Ids carry a per-process epoch,
+    so a ``Last-Event-ID`` from another worker or an earlier process is
+    recognised and answered with a ``reset`` instead of a wrong replay.
+    """
+
+    def __init__(self, backlog=1000):
+        self.epoch = os.urandom(4).hex()
+        self.subscribers = 0
+        self._condition = threading.Condition()
+        self._events = deque(maxlen=backlog)
+        self._last_id = 0
+
+    def subscribe(self):
+        with self._condition:
+            self.subscribers += 1
+
+    def unsubscribe(self):
+        with self._condition:
+            self.subscribers -= 1
+
+    def publish(self, event, data):
+        with self._condition:
+            self._last_id += 1
+            self._events.append((self._last_id, event, data))
+            self._condition.notify_all()
+
+    def cursor(self, last_event_id=None):
+        """
+        Position to read from: just after ``last_event_id`` when it is one of
+        ours, else now. The second value is False when events were missed.
+        """
+        with self._condition:
+            if last_event_id:
+                epoch, _, number = last_event_id.partition('-')
+                if epoch == self.epoch and number.isdigit() and int(number) <= self._last_id:
+                    return int(number), self._last_id - int(number) <= len(self._events)
+                return self._last_id, False
+            return self._last_id, True
+
+    def wait(self, cursor, timeout):
+        """
+        Events after ``cursor``, blocking up to ``timeout`` seconds for the
+        first one. Returns ``(events, complete)``; ``complete`` is False when
+        the subscriber fell further behind than the backlog.
+        """
+        with self._condition:
+            if self._last_id == cursor:
+                self._condition.wait(timeout)
+            missed = self._last_id - cursor
+            if missed > len(self._events):
+                return list(self._events), False
+            return [self._events[-i] for i in range(missed, 0, -1)], True
+
+def format_event(event, data, event_id=None):
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.extend(f'data: {line}' for line in data.splitlines() or [''])
+    return '\n'.join(lines) + '\n\n'
+
+def event_stream():
+    """
+    ``text/event-stream`` response with the broker's events from now on, or
+    from the client's ``Last-Event-ID`` after a reconnect. A ``reset`` event
+    tells the client it missed events and should reload. A comment goes out
+    every ``EVENTS_HEARTBEAT`` seconds so proxies keep idle streams open.
+    The generator holds no app context or database session.
+    """
+    broker = get_broker()
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT', 15)
+    cursor, complete = broker.cursor(request.headers.get('Last-Event-ID'))
+
+    def generate(cursor, complete):
+        broker.subscribe()
+        try:
+            yield f'retry: {RETRY_MS}\n\n'
+            while True:
+                if not complete:
+                    yield format_event('reset', '{}')
+                events, complete = broker.wait(cursor, heartbeat)
+                if not events:
+                    yield ': keep-alive\n\n'
+                    continue
+                cursor = events[-1][0]
+                if complete:
+                    yield ''.join(
+                        format_event(event, data, f'{broker.epoch}-{number}')
+                        for number, event, data in events
+                    )
+        finally:
+            broker.unsubscribe()
+
+    return Response(
+        generate(cursor, complete), mimetype=SSE_MIMETYPE,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def init_events(app):
+    app.extensions['event_broker'] = EventBroker(app.config.get('EVENTS_BACKLOG', 1000))
+
+def get_broker():
+    return current_app.extensions['event_broker']
+
+def publish_change(event, data):
+    """Tell subscribers about a ``created``/``updated``/``deleted`` Gunpla, or a bulk ``reset``."""
+    get_broker().publish(event, json.dumps(data))
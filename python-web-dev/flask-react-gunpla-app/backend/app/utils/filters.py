@@ -0,0 +1,42 @@
+from app.models import db
+from app.models.gunpla import Gunpla, Series, Grade
+
+EXACT_FILTERS = ('series', 'grade', 'scale')
+# Filters on a lookup name compare the foreign key, so they use its index.
+LOOKUP_FILTERS = {'series': (Series, Gunpla.series_id), 'grade': (Grade, Gunpla.grade_id)}
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def gunpla_criteria(args):
+    """
+    Turn the list query parameters into WHERE criteria.
+
+    - ``series``, ``grade``, ``scale``: exact match, each backed by an index
+      (for ``series`` and ``grade``, the one on the foreign key).
+    - ``q``: name prefix. It is written as a ``name >= q AND name < q'``
+      range so it can use the ``name`` index (a ``LIKE`` is case-insensitive
+      on SQLite and cannot). The match is therefore case-sensitive.
+    - ``match=contains``: make ``q`` a case-insensitive substring match
+      instead. This cannot use an index and scans the table.
+    """
+    criteria = []
+    for field in EXACT_FILTERS:
+        value = args.get(field)
+        if not value:
+            continue
+        if field in LOOKUP_FILTERS:
+            model, foreign_key = LOOKUP_FILTERS[field]
+            criteria.append(foreign_key == db.select(model.id).where(model.name == value).scalar_subquery())
+        else:
+            criteria.append(getattr(Gunpla, field) == value)
+
+    q = args.get('q')
+    if q:
+        if args.get('match') == 'contains':
+            criteria.append(Gunpla.name.icontains(q, autoescape=True))
+        else:
+            criteria.append(Gunpla.name >= q)
+            criteria.append(Gunpla.name < prefix_upper_bound(q))
+    return criteria
@@ -0,0 +1,151 @@
+import threading
+from flask import current_app
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+from app.models import db
+from app.models.gunpla import Gunpla, Series, Grade
+
+# Gunpla attribute -> (lookup model, foreign key column)
+LOOKUP_FIELDS = {
+    'series': (Series, 'series_id'),
+    'grade': (Grade, 'grade_id'),
+}
+PENDING_KEY = 'gunpla_lookups'
+
+class LookupCache:
+    """
+    Name -> id for every row of the ``Series`` and ``Grade`` lookup tables,
+    held in process so writes resolve the strings clients send without a
+    query. Lookup rows are never updated or deleted, so an entry cannot go
+    stale: a name missing here is looked up (or inserted) once and then
+    remembered.
+
+    Names inserted by a transaction are only remembered once it commits;
+    until then they live in the session's ``info``, so a rollback cannot
+    leave ids of rows that do not exist in the cache.
+    """
+
+    def __init__(self):
+        self._ids = {model: {} for model, _ in LOOKUP_FIELDS.values()}
+        self._lock = threading.Lock()
+
+    def get_id(self, session, model, name):
+        lookup_id = self._ids[model].get(name)
+        if lookup_id is not None:
+            return lookup_id
+        pending = session.info.setdefault(PENDING_KEY, {})
+        if (model, name) in pending:
+            return pending[(model, name)]
+
+        lookup_id = session.scalar(db.select(model.id).where(model.name == name))
+        if lookup_id is not None:
+            self.remember(model, name, lookup_id)
+            return lookup_id
+        session.execute(insert_ignore(session, model).values(name=name))
+        lookup_id = session.scalar(db.select(model.id).where(model.name == name))
+        pending[(model, name)] = lookup_id
+        return lookup_id
+
+    def remember(self, model, name, lookup_id):
+        with self._lock:
+            self._ids[model][name] = lookup_id
+
+    def commit(self, session):
+        for (model, name), lookup_id in session.info.pop(PENDING_KEY, {}).items():
+            self.remember(model, name, lookup_id)
+
+    def rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+    def clear(self):
+        with self._lock:
+            for ids in self._ids.values():
+                ids.clear()
+
+def insert_ignore(session, model):
+    """INSERT that skips a name another worker inserted first (SQLite only)."""
+    if session.get_bind().dialect.name == 'sqlite':
+        return sqlite.insert(model).on_conflict_do_nothing(index_elements=['name'])
+    return insert(model)
+
+def init_lookups(app):
+    app.extensions['lookups'] = LookupCache()
+
+def get_lookups():
+    return current_app.extensions['lookups']
+
+def resolve_lookups(session, data):
+    """
+    Copy of a Gunpla dict (as clients send it) with ``series``/``grade``
+    names replaced by ``series_id``/``grade_id``, for Core bulk statements.
+    """
+    lookups = get_lookups()
+    data = dict(data)
+    for field, (model, column) in LOOKUP_FIELDS.items():
+        if field in data:
+            data[column] = lookups.get_id(session, model, data.pop(field))
+    return data
+
+@event.listens_for(Session, 'before_flush')
+def resolve_gunpla_lookups(session, flush_context, instances):
+    # Gunpla.series/grade are read-only column properties; assigning a name
+    # (Gunpla(series=...), gunpla.grade = ...) is turned into the FK here.
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Gunpla):
+            continue
+        state = inspect(obj)
+        for field, (model, column) in LOOKUP_FIELDS.items():
+            added = state.attrs[field].history.added
+            if added and added[0] is not None:
+                setattr(obj, column, get_lookups().get_id(session, model, added[0]))
+
+@event.listens_for(Session, 'after_commit')
+def remember_lookups(session):
+    if PENDING_KEY in session.info:
+        get_lookups().commit(session)
+
+@event.listens_for(Session, 'after_rollback')
+def forget_lookups(session):
+    if PENDING_KEY in session.info:
+        get_lookups().rollback(session)
+
+def upgrade_lookup_schema():
+    """
+    Move a ``gunpla`` table from before the lookup tables (free-text
+    ``series``/``grade`` columns) onto ``series_id``/``grade_id``. Runs once
+    at startup, before ``create_all()``; a no-op on new or migrated
+    databases. SQLite only, like the rest of the schema setup.
+
+    The old table is renamed aside, the new one created (with its FTS and
+    version triggers), the distinct names copied into ``series`` and
+    ``grade``, and the rows copied over with their ids unchanged.
+    """
+    engine = db.engine
+    if engine.dialect.name != 'sqlite' or not inspect(engine).has_table('gunpla'):
+        return
+    columns = {column['name'] for column in inspect(engine).get_columns('gunpla')}
+    if 'series' not in columns:
+        return
+    with engine.begin() as connection:
+        # The FTS index reads gunpla.series; it is rebuilt by the new table's hooks.
+        for trigger in ('gunpla_fts_ai', 'gunpla_fts_ad', 'gunpla_fts_au'):
+            connection.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+        connection.exec_driver_sql('DROP TABLE IF EXISTS gunpla_fts')
+        connection.exec_driver_sql('ALTER TABLE gunpla RENAME TO gunpla_old')
+        # Index names are global in SQLite and the new table reuses them.
+        indexes = connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'gunpla_old' AND sql IS NOT NULL"
+        ).scalars().all()
+        for index in indexes:
+            connection.exec_driver_sql(f'DROP INDEX "{index}"')
+        db.metadata.create_all(connection)
+        connection.exec_driver_sql('INSERT OR IGNORE INTO series (name) SELECT DISTINCT series FROM gunpla_old')
+        connection.exec_driver_sql('INSERT OR IGNORE INTO grade (name) SELECT DISTINCT grade FROM gunpla_old')
+        connection.exec_driver_sql(
+            'INSERT INTO gunpla (id, name, series_id, grade_id, scale) '
+            'SELECT o.id, o.name, s.id, g.id, o.scale FROM gunpla_old o '
+            'JOIN series s ON s.name = o.series JOIN grade g ON g.name = o.grade'
+        )
+        connection.exec_driver_sql('DROP TABLE gunpla_old')
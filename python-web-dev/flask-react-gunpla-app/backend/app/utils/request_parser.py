@@ -1,8 +1,37 @@
-from flask_restful import reqparse
-
-# Configure the parser to bundle errors
-gunpla_parser = reqparse.RequestParser(bundle_errors=True)
-gunpla_parser.add_argument('name', type=str, required=True, help="Name field is required.", location='json')
-gunpla_parser.add_argument('series', type=str, required=True, help="Series field is required.", location='json')
-gunpla_parser.add_argument('grade', type=str, required=True, help="Grade field is required.", location='json')
-gunpla_parser.add_argument('scale', type=str, location='json')
\ No newline at end of file
+import flask_restful
+from flask import request
+
+REQUIRED_FIELDS = {
+    'name': "Name field is required.",
+    'series': "Series field is required.",
+    'grade': "Grade field is required.",
+}
+
+def validate_gunpla(item):
+    """
+    Validate one Gunpla, from a single-item POST/PUT body or a bulk payload.
+
+    Returns ``(data, errors)`` where ``errors`` maps each missing or null
+    required field to its message. Values are taken as strings, converting
+    non-strings with ``str()``; empty strings are accepted.
+    """
+    if not isinstance(item, dict):
+        return None, {'item': "Item must be a JSON object."}
+    errors = {field: message for field, message in REQUIRED_FIELDS.items() if item.get(field) is None}
+    if errors:
+        return None, errors
+    scale = item.get('scale')
+    data = {
+        'name': str(item['name']),
+        'series': str(item['series']),
+        'grade': str(item['grade']),
+        'scale': str(scale) if scale is not None else None,
+    }
+    return data, {}
+
+def parse_gunpla():
+    """The request's JSON body through ``validate_gunpla``; aborts with 400 and the errors per field."""
+    data, errors = validate_gunpla(request.get_json(silent=True))
+    if errors:
+        flask_restful.abort(400, message=errors)
+    return data
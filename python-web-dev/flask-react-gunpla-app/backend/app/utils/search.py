@@ -0,0 +1,110 @@
+import re
+from sqlalchemy import DDL, event, inspect
+from app.models import db
+from app.models.gunpla import Gunpla
+from app.utils.filters import gunpla_criteria
+
+FTS_TABLE = 'gunpla_fts'
+# bm25() column weights: a hit in the name counts more than one in the series.
+NAME_WEIGHT = 10.0
+SERIES_WEIGHT = 1.0
+
+# External-content FTS5 index over gunpla.name and the series name, kept in
+# sync by triggers. Its content table is a view joining in the series name.
+FTS_CONTENT = 'gunpla_search'
+SERIES_NAME = "(SELECT name FROM series WHERE id = {row}.series_id)"
+FTS_SETUP = [
+    f"""
+    CREATE VIEW IF NOT EXISTS {FTS_CONTENT} AS
+        SELECT g.id, g.name, s.name AS series FROM gunpla g JOIN series s ON s.id = g.series_id
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, series, content='{FTS_CONTENT}', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, series)
+        VALUES (new.id, new.name, {SERIES_NAME.format(row='new')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, series)
+        VALUES ('delete', old.id, old.name, {SERIES_NAME.format(row='old')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, series_id ON gunpla BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, series)
+        VALUES ('delete', old.id, old.name, {SERIES_NAME.format(row='old')});
+        INSERT INTO {FTS_TABLE}(rowid, name, series)
+        VALUES (new.id, new.name, {SERIES_NAME.format(row='new')});
+    END
+    """,
+]
+
+for statement in FTS_SETUP:
+    event.listen(Gunpla.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(
+    Gunpla.__table__, 'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite')
+)
+event.listen(
+    Gunpla.__table__, 'before_drop',
+    DDL(f'DROP VIEW IF EXISTS {FTS_CONTENT}').execute_if(dialect='sqlite')
+)
+
+def ensure_search_index():
+    """
+    Create and backfill the FTS index for databases whose ``gunpla`` table
+    predates it. Fresh tables get it from the ``after_create`` hooks above.
+    """
+    if db.engine.dialect.name != 'sqlite' or inspect(db.engine).has_table(FTS_TABLE):
+        return
+    with db.engine.begin() as connection:
+        for statement in FTS_SETUP:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def build_match_query(q):
+    """
+    Turn free text from the search box into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"rx"* "78"*``), so FTS5
+    operators typed by users are treated as plain text.
+    """
+    terms = re.findall(r'\w+', q)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def search_gunplas(q, limit, session=None):
+    """Return up to ``limit`` Gunpla dicts matching ``q``, best BM25 score first."""
+    if session is None:
+        session = db.session
+    match = build_match_query(q)
+    if not match:
+        return []
+    if db.engine.dialect.name != 'sqlite':
+        # Other databases have no FTS5; fall back to a substring scan.
+        stmt = (
+            db.select(*Gunpla.columns())
+            .where(*gunpla_criteria({'q': q, 'match': 'contains'}))
+            .order_by(Gunpla.id)
+            .limit(limit)
+        )
+    else:
+        # Rank and limit inside FTS5 first, then join only the winning rows.
+        hits = db.text(
+            f'SELECT rowid, bm25({FTS_TABLE}, :name_weight, :series_weight) AS score '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match ORDER BY score LIMIT :limit'
+        ).bindparams(
+            match=match, name_weight=NAME_WEIGHT, series_weight=SERIES_WEIGHT, limit=limit,
+        ).columns(rowid=db.Integer, score=db.Float).subquery('hits')
+        stmt = (
+            db.select(*Gunpla.columns())
+            .join(hits, Gunpla.id == hits.c.rowid)
+            .order_by(hits.c.score)
+        )
+    rows = session.execute(stmt)
+    return [dict(zip(Gunpla.COLUMNS, row)) for row in rows]
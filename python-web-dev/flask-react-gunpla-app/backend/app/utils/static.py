@@ -0,0 +1,130 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from flask import Response, abort, current_app, request
+from app.utils.conditional import validator_headers, is_not_modified
+
+# Vite writes hashed bundles as assets/<name>-<8 char hash>.<ext>.
+ASSETS_PREFIX = 'assets/'
+HASHED_ASSET = re.compile(r'(^|/)assets/.+-[A-Za-z0-9_-]{8}\.\w+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Only text-like files are worth compressing; images and fonts already are.
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/manifest+json')
+MIN_COMPRESS_SIZE = 512
+ENCODINGS = ('br', 'gzip')
+
+class StaticAsset:
+    def __init__(self, path, body, mimetype):
+        self.path = path
+        self.size = len(body)
+        self.hash = hashlib.sha256(body).hexdigest()[:16]
+        self.mimetype = mimetype
+        self.immutable = bool(HASHED_ASSET.search(path))
+        self.variants = {None: body}
+
+    def add_variant(self, encoding, body):
+        if len(body) < self.size:
+            self.variants[encoding] = body
+
+    def etag(self, encoding):
+        # Strong validators must differ between encodings of one resource.
+        return f'"{self.hash}-{encoding}"' if encoding else f'"{self.hash}"'
+
+class StaticManifest:
+    """
+    Everything under ``root`` read once at startup: per file its size,
+    content hash, mimetype and precompressed variants, all held in memory,
+    so serving a file is a dict lookup with no filesystem access.
+
+    Variants come from ``.br``/``.gz`` siblings the frontend build already
+    wrote, else they are compressed here (brotli only when the optional
+    ``brotli`` package is installed). Rebuilding ``frontend/dist`` needs an
+    app restart to be picked up.
+
+    Missing paths fall back to ``index.html`` for client-side routes, except
+    under ``asset_prefix``: a bundle from an older build is a 404, not HTML.
+    """
+
+    def __init__(self, root, asset_prefix=ASSETS_PREFIX):
+        self.root = root
+        self.asset_prefix = asset_prefix
+        self.assets = {}
+        if root and os.path.isdir(root):
+            self.scan()
+
+    def scan(self):
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(('.br', '.gz')):
+                    continue
+                full_path = os.path.join(directory, filename)
+                path = os.path.relpath(full_path, self.root).replace(os.sep, '/')
+                self.assets[path] = self.load(path, full_path)
+
+    def load(self, path, full_path):
+        with open(full_path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        asset = StaticAsset(path, body, mimetype)
+        if asset.size < MIN_COMPRESS_SIZE or not mimetype.startswith(COMPRESSIBLE):
+            return asset
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if os.path.exists(full_path + suffix):
+                with open(full_path + suffix, 'rb') as f:
+                    asset.add_variant(encoding, f.read())
+        if 'gzip' not in asset.variants:
+            asset.add_variant('gzip', gzip.compress(body, compresslevel=9, mtime=0))
+        if 'br' not in asset.variants:
+            try:
+                import brotli  # optional dependency
+            except ImportError:
+                pass
+            else:
+                asset.add_variant('br', brotli.compress(body))
+        return asset
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def resolve(self, path):
+        """``path``'s asset, else ``index.html`` unless ``path`` is under ``asset_prefix``."""
+        asset = self.assets.get(path)
+        if asset is None and not path.startswith(self.asset_prefix):
+            asset = self.assets.get('index.html')
+        return asset
+
+    def __len__(self):
+        return len(self.assets)
+
+def init_static(app):
+    app.extensions['static_manifest'] = StaticManifest(app.config.get('STATIC_DIST_DIR'))
+
+def choose_encoding(asset):
+    for encoding in ENCODINGS:
+        if encoding in asset.variants and request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+def serve_asset(path):
+    """
+    Serve ``path`` from the manifest, falling back to ``index.html`` for
+    client-side routes but not for missing bundles. Hashed bundles are cached for a year as
+    ``immutable``; everything else is revalidated against its ETag.
+    """
+    manifest = current_app.extensions['static_manifest']
+    asset = manifest.resolve(path)
+    if asset is None:
+        abort(404)
+
+    encoding = choose_encoding(asset)
+    headers = validator_headers(asset.etag(encoding))
+    headers['Vary'] = 'Accept-Encoding'
+    if asset.immutable:
+        headers['Cache-Control'] = IMMUTABLE
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    if is_not_modified(headers['ETag']):
+        return Response(status=304, headers=headers)
+    return Response(asset.variants[encoding], mimetype=asset.mimetype, headers=headers)
@@ -0,0 +1,105 @@
+from sqlalchemy import DDL, event, func
+from app.models import db
+from app.models.gunpla import Gunpla, GunplaStat, Series, Grade
+
+STATS_TABLE = GunplaStat.__tablename__
+# Dimension -> its value for a gunpla row in trigger SQL ({row}: new or old).
+DIMENSIONS = {
+    'series': "(SELECT name FROM series WHERE id = {row}.series_id)",
+    'grade': "(SELECT name FROM grade WHERE id = {row}.grade_id)",
+    'scale': "{row}.scale",
+}
+
+def count_statements(row, delta):
+    """Trigger SQL adding ``delta`` to the counts of ``row``'s values."""
+    statements = []
+    for dimension, expression in DIMENSIONS.items():
+        value = expression.format(row=row)
+        if delta > 0:
+            # value IS ... also matches NULL scales, which a UNIQUE/upsert would not.
+            statements.append(
+                f"INSERT INTO {STATS_TABLE} (dimension, value, count) "
+                f"SELECT '{dimension}', v, 0 FROM (SELECT {value} AS v) WHERE NOT EXISTS ("
+                f"SELECT 1 FROM {STATS_TABLE} WHERE dimension = '{dimension}' AND value IS v);"
+            )
+        statements.append(
+            f"UPDATE {STATS_TABLE} SET count = count + ({delta}) "
+            f"WHERE dimension = '{dimension}' AND value IS {value};"
+        )
+    return ' '.join(statements)
+
+PRUNE = f"DELETE FROM {STATS_TABLE} WHERE count <= 0;"
+
+# SQLite-only, like the FTS index: elsewhere /gunplas/stats aggregates the
+# gunpla table instead.
+STATS_SETUP = [
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_ai AFTER INSERT ON gunpla BEGIN "
+    f"{count_statements('new', 1)} END",
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_ad AFTER DELETE ON gunpla BEGIN "
+    f"{count_statements('old', -1)} {PRUNE} END",
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_au AFTER UPDATE OF series_id, grade_id, scale ON gunpla BEGIN "
+    f"{count_statements('old', -1)} {count_statements('new', 1)} {PRUNE} END",
+]
+
+for statement in STATS_SETUP:
+    event.listen(Gunpla.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+def ensure_stats():
+    """
+    Create the triggers and backfill the counts for databases whose
+    ``gunpla`` table predates them. Fresh tables get them from the
+    ``after_create`` hooks above.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as connection:
+        exists = connection.exec_driver_sql(
+            f"SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = '{STATS_TABLE}_ai'"
+        ).first()
+        if exists:
+            return
+        for statement in STATS_SETUP:
+            connection.exec_driver_sql(statement)
+        connection.execute(db.delete(GunplaStat))
+        for dimension, column in aggregate_columns().items():
+            connection.execute(db.insert(GunplaStat).from_select(
+                ['dimension', 'value', 'count'], aggregate(dimension, column)
+            ))
+
+def aggregate_columns():
+    return {'series': Series.name, 'grade': Grade.name, 'scale': Gunpla.scale}
+
+def aggregate(dimension, column):
+    """``SELECT dimension, value, count`` grouped over the gunpla table: O(rows)."""
+    return (
+        db.select(db.literal(dimension), column, func.count(Gunpla.id))
+        .select_from(Gunpla)
+        .join(Series, Series.id == Gunpla.series_id)
+        .join(Grade, Grade.id == Gunpla.grade_id)
+        .group_by(column)
+    )
+
+def gunpla_stats(session=None):
+    """
+    Counts per series, grade and scale, most common first::
+
+        {"count": 3, "series": [{"value": "Gundam Wing", "count": 2}, ...],
+         "grade": [...], "scale": [{"value": null, "count": 1}, ...]}
+
+    Read from the trigger-maintained ``gunpla_stats`` table on SQLite, so the
+    cost grows with the number of distinct values, not rows.
+    """
+    if session is None:
+        session = db.session
+    if session.get_bind().dialect.name == 'sqlite':
+        rows = session.execute(db.select(GunplaStat.dimension, GunplaStat.value, GunplaStat.count))
+    else:
+        rows = session.execute(db.union_all(*(
+            aggregate(dimension, column) for dimension, column in aggregate_columns().items()
+        )))
+    stats = {dimension: [] for dimension in DIMENSIONS}
+    for dimension, value, count in rows:
+        stats[dimension].append({'value': value, 'count': count})
+    for values in stats.values():
+        values.sort(key=lambda item: (-item['count'], item['value'] is None, item['value'] or ''))
+    return {'count': sum(item['count'] for item in stats['grade']), **stats}
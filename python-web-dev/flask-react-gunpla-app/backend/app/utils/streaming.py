@@ -0,0 +1,35 @@
+import json
+from flask import Response, request, stream_with_context
+from app.models import db
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+def wants_stream():
+    """True when the client asked for an NDJSON export instead of a JSON array."""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+def stream_ndjson(model, columns, criteria=(), batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream every row of ``model`` matching ``criteria`` as one JSON object per line.
+
+    Rows are fetched ``batch_size`` at a time (``yield_per``) and written out
+    as soon as each batch arrives, so memory stays flat regardless of table
+    size and the first bytes go out after the first batch.
+    """
+    stmt = (
+        db.select(*[getattr(model, column) for column in columns])
+        .where(*criteria)
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    def generate():
+        result = db.session.execute(stmt)
+        for partition in result.partitions():
+            yield ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in partition)
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
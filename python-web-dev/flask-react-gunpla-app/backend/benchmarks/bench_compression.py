@@ -0,0 +1,78 @@
+"""
+Bytes saved versus CPU spent by init_compression on Gunpla list payloads.
+
+Seeds an in-memory SQLite database with N rows and fetches ``/gunplas`` once
+without compression, then compresses that body with every available encoder
+at a few levels (starred: the defaults the app uses). Reports compressed size,
+ratio, compression time and throughput:
+
+    python benchmarks/bench_compression.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_app
+from app.models import db
+from app.models.gunpla import Gunpla
+from app.utils.lookups import resolve_lookups
+from app.utils import compression
+from config.settings import TestingConfig
+
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["High Grade", "Real Grade", "Master Grade", "Perfect Grade"]
+SCALES = ["1/144", "1/100", "1/60", None]
+
+LEVELS = {
+    'gzip': [1, compression.GZIP_LEVEL, 9],
+    'br': [1, compression.BROTLI_QUALITY, 7],
+    'zstd': [1, compression.ZSTD_LEVEL, 9],
+}
+DEFAULTS = {'gzip': compression.GZIP_LEVEL, 'br': compression.BROTLI_QUALITY, 'zstd': compression.ZSTD_LEVEL}
+
+def seed(count):
+    db.session.execute(db.delete(Gunpla))
+    db.session.execute(db.insert(Gunpla), [
+        resolve_lookups(db.session, {'name': f"Kit {i}", 'series': SERIES[i % len(SERIES)],
+                                     'grade': GRADES[i % len(GRADES)], 'scale': SCALES[i % len(SCALES)]})
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    encodings = compression.available_encodings(compression.ENCODERS)
+    client = app.test_client()
+
+    print(f"{'rows':>7}  {'encoding':<10} {'bytes':>11} {'ratio':>6} {'ms':>8} {'MB/s':>8}")
+    with app.app_context():
+        for size in args.sizes:
+            seed(size)
+            body = client.get('/gunplas').data
+            print(f"{size:>7}  {'identity':<10} {len(body):>11,} {1:>6.1f} {0:>8.2f} {'-':>8}")
+            for encoding in encodings:
+                encoder = compression.ENCODERS[encoding]
+                for level in LEVELS[encoding]:
+                    elapsed, compressed = best_of(lambda: encoder(level).compress(body), args.repeat)
+                    label = f"{encoding}-{level}" + ('*' if level == DEFAULTS[encoding] else '')
+                    print(f"{size:>7}  {label:<10} {len(compressed):>11,} {len(body) / len(compressed):>6.1f} "
+                          f"{elapsed * 1000:>8.2f} {len(body) / elapsed / 1e6:>8.1f}")
+
+if __name__ == '__main__':
+    main()
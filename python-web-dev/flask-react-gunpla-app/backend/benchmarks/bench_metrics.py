@@ -0,0 +1,74 @@
+"""
+Per-request overhead of the /metrics instrumentation.
+
+Times --requests GETs of /gunplas/cache (no SQL) through the test client
+with METRICS_ENABLED on and off, then the metrics hooks alone in one
+request context, and the render of a /metrics scrape:
+
+    python benchmarks/bench_metrics.py --requests 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_app
+from config.settings import TestingConfig
+
+class NoMetricsConfig(TestingConfig):
+    METRICS_ENABLED = False
+
+def per_request(app, count, repeat):
+    client = app.test_client()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get('/gunplas/cache')
+        timings.append((time.perf_counter() - start) / count)
+    return min(timings)
+
+def per_hooks(app, count, repeat):
+    registry = app.extensions['metrics']
+    response = app.response_class()
+    timings = []
+    with app.test_request_context('/gunplas/cache'):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(count):
+                registry.start_request()
+                registry.finish_request(response)
+                registry.end_request(None)
+            timings.append((time.perf_counter() - start) / count)
+    return min(timings)
+
+def per_scrape(app, repeat):
+    registry = app.extensions['metrics']
+    timings = []
+    with app.app_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            registry.render()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    plain = per_request(create_app(NoMetricsConfig), args.requests, args.repeat)
+    app = create_app(TestingConfig)
+    metered = per_request(app, args.requests, args.repeat)
+    hooks = per_hooks(app, args.requests, args.repeat)
+    scrape = per_scrape(app, args.repeat)
+    print(f"{'request, metrics off':<24} {plain * 1e6:>8.1f} us")
+    print(f"{'request, metrics on':<24} {metered * 1e6:>8.1f} us  ({(metered - plain) * 1e6:+.1f} us)")
+    print(f"{'metrics hooks alone':<24} {hooks * 1e6:>8.1f} us")
+    print(f"{'/metrics render':<24} {scrape * 1e6:>8.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Concurrent read/write throughput on SQLite, stock vs. SQLITE_PRODUCTION_PRAGMAS.
+
+Each worker is a separate process running the app's own session and models
+against the same database file: writers insert one row per transaction,
+readers fetch the newest page of 50 rows plus one row by id. "locked" counts
+operations that failed with "database is locked".
+
+    python benchmarks/bench_sqlite_concurrency.py --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.models import db
+from app.models.gunpla import Gunpla
+from app.utils.lookups import resolve_lookups
+from config.settings import Config, SQLITE_PRODUCTION_PRAGMAS
+
+PROFILES = {
+    'default': {},
+    'production': SQLITE_PRODUCTION_PRAGMAS,
+}
+
+def make_app(path, pragmas):
+    config = type('BenchConfig', (Config,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SQLITE_PRAGMAS': pragmas,
+        'DEBUG': False,
+    })
+    return create_app(config)
+
+def seed(path, pragmas, rows):
+    app = make_app(path, pragmas)
+    with app.app_context():
+        lookups = resolve_lookups(db.session, {'series': 'Mobile Suit Gundam', 'grade': 'HG'})
+        db.session.execute(db.insert(Gunpla), [
+            {'name': f'Zaku {i}', 'scale': '1/144', **lookups} for i in range(rows)
+        ])
+        db.session.commit()
+
+def worker(args):
+    path, pragmas, role, seconds, rows = args
+    app = make_app(path, pragmas)
+    ops = locked = 0
+    latencies = []
+    with app.app_context():
+        deadline = time.perf_counter() + seconds
+        while (start := time.perf_counter()) < deadline:
+            try:
+                if role == 'writer':
+                    db.session.add(Gunpla(name='Sazabi', series="Char's Counterattack", grade='MG'))
+                    db.session.commit()
+                else:
+                    db.session.execute(
+                        db.select(Gunpla).order_by(Gunpla.id.desc()).limit(50)
+                    ).scalars().all()
+                    db.session.get(Gunpla, random.randint(1, rows))
+                    db.session.rollback()
+                ops += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError as e:
+                db.session.rollback()
+                if 'locked' not in str(e):
+                    raise
+                locked += 1
+    return role, ops, locked, latencies
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def run(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, PROFILES[profile], args.rows)
+        jobs = (
+            [(path, PROFILES[profile], 'writer', args.seconds, args.rows)] * args.writers
+            + [(path, PROFILES[profile], 'reader', args.seconds, args.rows)] * args.readers
+        )
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.map(worker, jobs)
+
+    for role in ('writer', 'reader'):
+        mine = [r for r in results if r[0] == role]
+        ops = sum(r[1] for r in mine)
+        locked = sum(r[2] for r in mine)
+        latencies = [l for r in mine for l in r[3]]
+        print(f"{profile:>10}  {role}s  {ops / args.seconds:9.0f} ops/s  "
+              f"p50 {percentile(latencies, 0.5) * 1000:7.2f} ms  "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms  locked {locked}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--profile', choices=PROFILES, action='append')
+    args = parser.parse_args()
+
+    for profile in args.profile or PROFILES:
+        run(profile, args)
+
+if __name__ == '__main__':
+    main()
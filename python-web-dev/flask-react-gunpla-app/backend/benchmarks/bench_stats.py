@@ -0,0 +1,69 @@
+"""
+/gunplas/stats from the trigger-maintained summary table vs. GROUP BY scans.
+
+Seeds an in-memory SQLite database with N rows, then times gunpla_stats()
+(one row per distinct value) against the same counts aggregated over the
+gunpla table. "insert s" is the seeding time with every trigger in place:
+
+    python benchmarks/bench_stats.py --sizes 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app import create_app
+from app.models import db
+from app.models.gunpla import Gunpla
+from app.utils.lookups import resolve_lookups
+from app.utils.stats import aggregate, aggregate_columns, gunpla_stats
+from config.settings import TestingConfig
+
+SERIES = ["Mobile Suit Gundam", "Gundam Wing", "Gundam 00", "Gundam SEED", "Iron-Blooded Orphans"]
+GRADES = ["High Grade", "Real Grade", "Master Grade", "Perfect Grade"]
+SCALES = ["1/144", "1/100", "1/60", None]
+
+def seed(count):
+    db.session.execute(db.delete(Gunpla))
+    start = time.perf_counter()
+    db.session.execute(db.insert(Gunpla), [
+        resolve_lookups(db.session, {'name': f"Kit {i}", 'series': SERIES[i % len(SERIES)],
+                                     'grade': GRADES[i % len(GRADES)], 'scale': SCALES[i % len(SCALES)]})
+        for i in range(count)
+    ])
+    db.session.commit()
+    return time.perf_counter() - start
+
+def scan_stats():
+    return [
+        db.session.execute(aggregate(dimension, column)).all()
+        for dimension, column in aggregate_columns().items()
+    ]
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    print(f"{'rows':>9}  {'insert s':>9} {'summary ms':>11} {'group by ms':>12} {'speedup':>8}")
+    with app.app_context():
+        for size in args.sizes:
+            insert = seed(size)
+            summary = best_of(gunpla_stats, args.repeat)
+            scan = best_of(scan_stats, args.repeat)
+            print(f"{size:>9,}  {insert:>9.2f} {summary * 1000:>11.2f} {scan * 1000:>12.2f} {scan / summary:>7.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,92 @@ import os
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
+# Tuned for concurrent use, applied to every connection (see app/utils/sqlite.py):
+# - WAL lets readers run alongside the single writer.
+# - synchronous=NORMAL only fsyncs at checkpoints (safe with WAL).
+# - busy_timeout makes writers queue instead of raising "database is locked".
+# - mmap_size/cache_size/temp_store keep hot pages and sort spills in memory.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 268435456,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY',
+}
+
+# Per-worker connection pool (see app/utils/pool.py). Under gunicorn the
+# database sees up to workers * (pool_size + max_overflow) connections, so
+# size DB_POOL_SIZE/DB_MAX_OVERFLOW to stay under its max_connections.
+# - pool_timeout bounds how long a request waits for a free connection.
+# - pool_recycle replaces connections before server/proxy idle timeouts.
+# - pool_pre_ping discards connections that died while idle (e.g. failover).
+POOL_PRODUCTION_OPTIONS = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+    'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+    'pool_timeout': 10,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
+
 class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, '..', 'gunpla.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    SQLALCHEMY_ENGINE_OPTIONS = POOL_PRODUCTION_OPTIONS
+    # Connections each worker opens at startup, ahead of its first requests
+    POOL_WARMUP = int(os.environ.get('DB_POOL_WARMUP', 2))
     DEBUG = True
+    # Rows written per transaction by the /gunplas/bulk endpoint
+    BULK_CHUNK_SIZE = 1000
+    # Response cache for Gunpla reads: a per-process LRU unless
+    # CACHE_REDIS_URL points at a local Redis shared by all workers.
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_TTL = 60
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    # /gunplas/events: changes kept for reconnecting clients, and seconds
+    # between keep-alive comments on idle streams
+    EVENTS_BACKLOG = 1000
+    EVENTS_HEARTBEAT = 15
+    # JSON response compression (see app/utils/compression.py), in server
+    # preference order. zstd and br need the optional zstandard and brotli
+    # packages and are skipped without them; set to () to turn it off.
+    COMPRESSION_ENCODINGS = ('zstd', 'br', 'gzip')
+    # Bodies smaller than this are sent uncompressed
+    COMPRESSION_MIN_SIZE = 1024
+    # Most SQL statements an endpoint may run per request, keyed
+    # "<METHOD> <endpoint>" (see app/utils/instrumentation.py). Lists read the
+    # table version (for the ETag) and then the rows, details the table version
+    # (for the cache key) and then the row; cache hits and 304s stop after the
+    # first. Going over is logged, or raised with QUERY_BUDGET_STRICT.
+    QUERY_BUDGETS = {
+        'GET gunplalistresource': 2,
+        'GET gunplaresource': 2,
+        'GET gunplasearchresource': 1,
+        'GET gunplastatsresource': 1,
+        'GET gunplacacheresource': 0,
+    }
+    QUERY_BUDGET_STRICT = False
+    # Identical statements in one request before a possible N+1 is logged
+    REPEATED_QUERY_THRESHOLD = 5
+    # Prometheus metrics at /metrics (app/utils/metrics.py)
+    METRICS_ENABLED = True
+    # Sampling profiler (app/utils/profiling.py), off unless PROFILE_DIR is set.
+    # Requests with an X-Gunpla-Profile header from `flask profile-token`
+    # (signed with SECRET_KEY, valid PROFILE_TOKEN_MAX_AGE seconds) are sampled
+    # every PROFILE_INTERVAL seconds into collapsed-stack files.
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')
+    PROFILE_INTERVAL = 0.005
+    PROFILE_MAX_SAMPLES = 20000
+    PROFILE_TOKEN_MAX_AGE = 3600
+    # React build served by serve() from an in-memory manifest
+    STATIC_DIST_DIR = os.path.join(basedir, '..', '..', 'frontend', 'dist')
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
-    DEBUG = False
\ No newline at end of file
+    DEBUG = False
+    EVENTS_HEARTBEAT = 0.05
+    QUERY_BUDGET_STRICT = True
+    SECRET_KEY = 'test-secret-key'
\ No newline at end of file
@@ -1,20 +1,42 @@
 import os
+import gzip
+import json
 import sys
+import sqlite3
+import threading
+import time
 import pytest
+from sqlalchemy import event
+from flask import request
 
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app import create_app
+from app import create_app, create_async_app
 from app.models import db
-from app.models.gunpla import Gunpla
-from config.settings import TestingConfig
+from app.models.gunpla import Gunpla, Series, Grade
+from app.utils.cache import LRUCache, ResponseCache, get_cache
+from app.utils.compression import ENCODERS, available_encodings
+from app.utils.lookups import get_lookups
+from app.utils.instrumentation import QueryBudgetExceeded
+from app.utils.filters import gunpla_criteria
+from app.utils.pool import MeteredQueuePool, pool_options
+from app.utils.profiling import Sampler, profile_token
+from app.utils.static import StaticManifest
+from app.utils.stats import ensure_stats
+from config.settings import Config, TestingConfig
 
-@pytest.fixture(scope='session')
-def app():
-    """Create and configure a new app instance for each test."""
-    app = create_app(TestingConfig)
-    return app
+@pytest.fixture(scope='session', params=['sync', 'async'])
+def app(request, tmp_path_factory):
+    """Run every test against both app factories."""
+    if request.param == 'sync':
+        return create_app(TestingConfig)
+
+    # The sync fixtures and the AsyncSession must see the same database.
+    class AsyncTestingConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path_factory.mktemp('async') / 'gunpla.db')
+
+    return create_async_app(AsyncTestingConfig)
 
 @pytest.fixture
 def client(app):
@@ -26,6 +48,9 @@ def app_context(app):
     """Create an application context for tests."""
     with app.app_context():
         db.create_all()
+        # Ids and the table version restart with every test database.
+        get_cache().clear()
+        get_lookups().clear()
         yield
         db.session.close()
         db.drop_all()
@@ -59,6 +84,22 @@ def test_get_gunplas(client, sample_gunpla):
     assert response.json[0]['grade'] == "Master Grade"
     assert response.json[0]['scale'] == "1/100"
 
+def test_stream_gunplas(client, sample_gunpla):
+    """Test the NDJSON export mode via query parameter."""
+    response = client.get('/gunplas?stream=1')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == sample_gunpla.to_dict()
+
+def test_stream_gunplas_accept_header(client, sample_gunpla):
+    """Test the NDJSON export mode via content negotiation."""
+    response = client.get('/gunplas', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert json.loads(response.get_data(as_text=True))['name'] == "RX-78-2 Gundam"
+
 def test_create_gunpla(client):
     """Test creating a new gunpla."""
     data = {
@@ -144,4 +185,750 @@ def test_delete_nonexistent_gunpla(client):
     """Test deleting a gunpla that doesn't exist."""
     response = client.delete('/gunplas/999')
     assert response.status_code == 404
-    assert response.json['message'] == 'Gunpla model not found'
\ No newline at end of file
+    assert response.json['message'] == 'Gunpla model not found'
+
+def test_bulk_create(client):
+    """Test creating many gunplas in one request."""
+    data = [
+        {'name': f'Kit {i}', 'series': 'Series', 'grade': 'HG', 'scale': '1/144'}
+        for i in range(3)
+    ]
+    response = client.post('/gunplas/bulk', json=data)
+    assert response.status_code == 201
+    assert response.json == {'created': 3, 'errors': []}
+    assert db.session.scalar(db.select(db.func.count(Gunpla.id))) == 3
+
+def test_bulk_create_reports_errors_per_item(app, client):
+    """Test invalid items are skipped and reported by index across chunks."""
+    app.config['BULK_CHUNK_SIZE'] = 2
+    data = [
+        {'name': 'Kit 0', 'series': 'Series', 'grade': 'HG'},
+        {'name': 'Kit 1', 'grade': 'HG'},
+        {'name': 'Kit 2', 'series': 'Series', 'grade': 'HG'},
+        {'name': 'Kit 3', 'series': 'Series', 'grade': 'HG'},
+    ]
+    try:
+        response = client.post('/gunplas/bulk', json=data)
+    finally:
+        app.config['BULK_CHUNK_SIZE'] = TestingConfig.BULK_CHUNK_SIZE
+    assert response.status_code == 201
+    assert response.json['created'] == 3
+    assert response.json['errors'] == [{'index': 1, 'message': ['Series field is required.']}]
+
+def test_bulk_create_ndjson(client):
+    """Test creating gunplas from an NDJSON body."""
+    body = '\n'.join(
+        json.dumps({'name': f'Kit {i}', 'series': 'Series', 'grade': 'HG'})
+        for i in range(2)
+    )
+    response = client.post('/gunplas/bulk', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 201
+    assert response.json['created'] == 2
+
+def test_bulk_accepts_what_the_single_endpoint_does(client):
+    """Test single and bulk writes share one validator: empty and non-string values pass, nulls do not."""
+    item = {'name': '', 'series': 'Series', 'grade': 1, 'scale': 144}
+    single = client.post('/gunplas', json=item)
+    assert single.status_code == 201
+    response = client.post('/gunplas/bulk', json=[item, {'name': 'Kit', 'series': None, 'grade': 'HG'}])
+    assert response.json == {'created': 1, 'errors': [{'index': 1, 'message': ['Series field is required.']}]}
+    created = db.session.scalars(db.select(Gunpla).order_by(Gunpla.id)).all()
+    assert [gunpla.to_dict() | {'id': None} for gunpla in created] == [single.json | {'id': None}] * 2
+
+    response = client.post('/gunplas', json={'name': 'Kit', 'series': None, 'grade': 'HG'})
+    assert response.status_code == 400
+    assert response.json == {'message': {'series': 'Series field is required.'}}
+
+def test_bulk_create_requires_array(client):
+    """Test a non-array body is rejected."""
+    response = client.post('/gunplas/bulk', json={'name': 'Kit'})
+    assert response.status_code == 400
+
+def test_bulk_update(client, sample_gunpla):
+    """Test updating many gunplas by id."""
+    data = [
+        {'id': sample_gunpla.id, 'name': 'New', 'series': 'Series', 'grade': 'MG', 'scale': '1/100'},
+        {'id': 999, 'name': 'Missing', 'series': 'Series', 'grade': 'HG'},
+    ]
+    response = client.put('/gunplas/bulk', json=data)
+    assert response.status_code == 200
+    assert response.json == {
+        'updated': 1,
+        'errors': [{'index': 1, 'message': ['Gunpla model not found']}],
+    }
+    response = client.get(f'/gunplas/{sample_gunpla.id}')
+    assert response.json['name'] == 'New'
+    assert response.json['grade'] == 'MG'
+
+def test_bulk_delete(client, sample_gunpla):
+    """Test deleting many gunplas by id."""
+    response = client.delete('/gunplas/bulk', json=[sample_gunpla.id, 999])
+    assert response.status_code == 200
+    assert response.json == {
+        'deleted': 1,
+        'errors': [{'index': 1, 'message': ['Gunpla model not found']}],
+    }
+    assert client.get('/gunplas').json == []
+
+@pytest.fixture
+def catalog(app_context):
+    """Create a small catalog to filter."""
+    db.session.add_all([
+        Gunpla(name="RX-78-2 Gundam", series="Mobile Suit Gundam", grade="MG", scale="1/100"),
+        Gunpla(name="RX-93 Nu Gundam", series="Char's Counterattack", grade="RG", scale="1/144"),
+        Gunpla(name="Wing Gundam Zero", series="Gundam Wing", grade="MG", scale="1/100"),
+    ])
+    db.session.commit()
+
+def names(client, query):
+    response = client.get('/gunplas', query_string=query)
+    assert response.status_code == 200
+    return [g['name'] for g in response.json]
+
+def test_exact_filters(client, catalog):
+    """Test filtering on series, grade and scale."""
+    assert names(client, {'series': 'Gundam Wing'}) == ["Wing Gundam Zero"]
+    assert names(client, {'grade': 'MG'}) == ["RX-78-2 Gundam", "Wing Gundam Zero"]
+    assert names(client, {'grade': 'MG', 'scale': '1/144'}) == []
+
+def test_name_prefix(client, catalog):
+    """Test q matches a name prefix."""
+    assert names(client, {'q': 'RX-'}) == ["RX-78-2 Gundam", "RX-93 Nu Gundam"]
+    assert names(client, {'q': 'Gundam'}) == []
+
+def test_name_contains(client, catalog):
+    """Test q with match=contains matches a substring."""
+    assert names(client, {'q': 'nu gundam', 'match': 'contains'}) == ["RX-93 Nu Gundam"]
+
+def test_stream_applies_filters(client, catalog):
+    """Test the NDJSON export honours the same filters."""
+    response = client.get('/gunplas', query_string={'stream': 1, 'grade': 'RG'})
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['name'] for row in rows] == ["RX-93 Nu Gundam"]
+
+@pytest.mark.parametrize('param, index_name', [
+    ('series', 'ix_gunpla_series_id'),
+    ('grade', 'ix_gunpla_grade_id'),
+    ('scale', 'ix_gunpla_scale'),
+    ('q', 'ix_gunpla_name'),
+])
+def test_filters_use_indexes(param, index_name):
+    """Test EXPLAIN shows each filter is answered from an index, not a full scan."""
+    stmt = db.select(Gunpla).where(*gunpla_criteria({param: 'value'})).order_by(Gunpla.id)
+    sql = str(stmt.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    plan = ' '.join(row[-1] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql)))
+    assert f'USING INDEX {index_name}' in plan
+
+def search_names(client, q):
+    response = client.get('/gunplas/search', query_string={'q': q})
+    assert response.status_code == 200
+    return [g['name'] for g in response.json]
+
+def test_search_ranks_name_matches_first(client, catalog):
+    """Test a term in the name outranks the same term in the series."""
+    db.session.add(Gunpla(name="Sinanju", series="Gundam Unicorn", grade="MG"))
+    db.session.commit()
+    assert search_names(client, 'wing') == ["Wing Gundam Zero"]
+    assert search_names(client, 'gundam')[-1] == "Sinanju"
+
+def test_search_matches_prefixes_and_series(client, catalog):
+    """Test words are prefix terms and the series is searched too."""
+    assert search_names(client, 'char counter') == ["RX-93 Nu Gundam"]
+    assert search_names(client, 'zer') == ["Wing Gundam Zero"]
+
+def test_search_index_follows_writes(client, catalog):
+    """Test the triggers keep the FTS index in sync with updates and deletes."""
+    gunpla = db.session.execute(db.select(Gunpla).filter_by(name="RX-93 Nu Gundam")).scalar_one()
+    client.put(f'/gunplas/{gunpla.id}', json={'name': 'Hi-Nu Gundam', 'series': "Char's Counterattack", 'grade': 'RG'})
+    assert search_names(client, 'hi') == ["Hi-Nu Gundam"]
+    assert search_names(client, 'nu') == ["Hi-Nu Gundam"]
+    assert search_names(client, 'rx') == ["RX-78-2 Gundam"]
+    client.delete(f'/gunplas/{gunpla.id}')
+    assert search_names(client, 'hi') == []
+
+def test_search_ignores_fts_syntax(client, catalog):
+    """Test FTS5 operators in user input are treated as text."""
+    assert search_names(client, '"wing* -(') == ["Wing Gundam Zero"]
+    assert search_names(client, '***') == []
+
+def test_stats(client, catalog):
+    """Test counts per series, grade and scale, most common first."""
+    response = client.get('/gunplas/stats')
+    assert response.status_code == 200
+    assert response.json == {
+        'count': 3,
+        'series': [{'value': "Char's Counterattack", 'count': 1}, {'value': "Gundam Wing", 'count': 1},
+                   {'value': "Mobile Suit Gundam", 'count': 1}],
+        'grade': [{'value': 'MG', 'count': 2}, {'value': 'RG', 'count': 1}],
+        'scale': [{'value': '1/100', 'count': 2}, {'value': '1/144', 'count': 1}],
+    }
+
+def test_stats_follow_writes(client, catalog):
+    """Test the triggers keep the summary table in step with every kind of write."""
+    gunpla = db.session.execute(db.select(Gunpla).filter_by(name="RX-93 Nu Gundam")).scalar_one()
+    client.put(f'/gunplas/{gunpla.id}', json={'name': 'Nu Gundam', 'series': "Char's Counterattack", 'grade': 'MG'})
+    client.post('/gunplas/bulk', json=[{'name': 'Zaku II', 'series': 'Mobile Suit Gundam', 'grade': 'HG'}])
+    wing = db.session.execute(db.select(Gunpla.id).filter_by(name="Wing Gundam Zero")).scalar_one()
+    client.delete(f'/gunplas/{wing}')
+    stats = client.get('/gunplas/stats').json
+    assert stats['count'] == 3
+    assert stats['series'] == [{'value': "Mobile Suit Gundam", 'count': 2}, {'value': "Char's Counterattack", 'count': 1}]
+    assert stats['grade'] == [{'value': 'MG', 'count': 2}, {'value': 'HG', 'count': 1}]
+    # The PUT left out the scale, which clears it.
+    assert stats['scale'] == [{'value': None, 'count': 2}, {'value': '1/100', 'count': 1}]
+
+def test_stats_backfill(client, catalog):
+    """Test ensure_stats() adds the triggers to an existing table and counts its rows."""
+    expected = client.get('/gunplas/stats').json
+    with db.engine.begin() as connection:
+        for trigger in ('gunpla_stats_ai', 'gunpla_stats_ad', 'gunpla_stats_au'):
+            connection.exec_driver_sql(f'DROP TRIGGER {trigger}')
+        connection.exec_driver_sql('DELETE FROM gunpla_stats')
+    ensure_stats()
+    assert client.get('/gunplas/stats').json == expected
+
+def test_list_etag_and_304(client, sample_gunpla):
+    """Test an unchanged list poll is answered with 304."""
+    response = client.get('/gunplas')
+    assert response.status_code == 200
+    assert 'Last-Modified' in response.headers
+    assert response.headers['Cache-Control'] == 'no-cache'
+    response = client.get('/gunplas', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_list_etag_varies_with_query(client, sample_gunpla):
+    """Test different filters get different ETags."""
+    first = client.get('/gunplas').headers['ETag']
+    filtered = client.get('/gunplas?grade=MG').headers['ETag']
+    assert first != filtered
+
+def test_list_etag_changes_on_every_kind_of_write(client, sample_gunpla):
+    """Test single and bulk writes all invalidate the list ETag."""
+    etags = [client.get('/gunplas').headers['ETag']]
+    client.post('/gunplas', json={'name': 'Zaku', 'series': 'MSG', 'grade': 'HG'})
+    etags.append(client.get('/gunplas').headers['ETag'])
+    client.put(f'/gunplas/{sample_gunpla.id}', json={'name': 'RX', 'series': 'MSG', 'grade': 'HG'})
+    etags.append(client.get('/gunplas').headers['ETag'])
+    client.delete('/gunplas/bulk', json=[sample_gunpla.id])
+    etags.append(client.get('/gunplas').headers['ETag'])
+    assert len(set(etags)) == len(etags)
+
+def test_detail_etag_and_304(client, sample_gunpla):
+    """Test an unchanged detail poll is answered with 304 and an edit is not."""
+    url = f'/gunplas/{sample_gunpla.id}'
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    client.put(url, json={'name': 'RX', 'series': 'MSG', 'grade': 'HG'})
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['name'] == 'RX'
+
+def test_lru_cache_bounds_and_expiry():
+    """Test the LRU evicts the least recently used entry and honours the TTL."""
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    expired = LRUCache(ttl=-1)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+def test_detail_is_served_from_cache(client, sample_gunpla):
+    """Test a repeated detail read is a cache hit and an update moves it to a new key."""
+    url = f'/gunplas/{sample_gunpla.id}'
+    client.get(url)
+    client.get(url)
+    assert get_cache().stats()['hits'] == 1
+
+    client.put(url, json={'name': 'RX', 'series': 'MSG', 'grade': 'HG'})
+    response = client.get(url)
+    assert response.json['name'] == 'RX'
+    assert get_cache().stats()['hits'] == 1
+
+def test_detail_cache_follows_bulk_writes_and_deletes(client, sample_gunpla):
+    """Test bulk updates and deletes are never served from the entry cached before them."""
+    url = f'/gunplas/{sample_gunpla.id}'
+    client.get(url)
+    client.put('/gunplas/bulk', json=[{'id': sample_gunpla.id, 'name': 'RX', 'series': 'MSG', 'grade': 'HG'}])
+    assert client.get(url).json['name'] == 'RX'
+    client.delete(url)
+    assert client.get(url).status_code == 404
+
+def test_detail_is_fresh_across_workers(app, client, sample_gunpla):
+    """Test a write through one worker's cache is seen by a worker holding the old entry in its own."""
+    url = f'/gunplas/{sample_gunpla.id}'
+    worker_a = get_cache()
+    client.get(url)
+    app.extensions['response_cache'] = ResponseCache(LRUCache())
+    try:
+        client.put(url, json={'name': 'RX', 'series': 'MSG', 'grade': 'HG'})
+    finally:
+        app.extensions['response_cache'] = worker_a
+    assert client.get(url).json['name'] == 'RX'
+
+def test_list_cache_follows_table_version(client, sample_gunpla):
+    """Test a cached list is reused until a write bumps the table version."""
+    client.get('/gunplas')
+    assert len(client.get('/gunplas').json) == 1
+    assert get_cache().stats()['hits'] == 1
+
+    client.post('/gunplas', json={'name': 'Zaku II', 'series': 'MSG', 'grade': 'HG'})
+    assert len(client.get('/gunplas').json) == 2
+
+def test_cache_stats(client, sample_gunpla):
+    """Test hit and miss counters are exposed."""
+    client.get(f'/gunplas/{sample_gunpla.id}')
+    client.get(f'/gunplas/{sample_gunpla.id}')
+    response = client.get('/gunplas/cache')
+    assert response.json == {'hits': 1, 'misses': 1, 'hit_ratio': 0.5, 'entries': 1}
+
+def pragma(name):
+    return db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+
+def test_sqlite_pragmas():
+    """Test every connection gets the concurrency profile from Config."""
+    assert pragma('synchronous') == 1  # NORMAL
+    assert pragma('busy_timeout') == 5000
+    assert pragma('temp_store') == 2  # MEMORY
+    assert pragma('cache_size') == -64000
+
+def test_pool_options():
+    """Test the pool profile is kept for servers and dropped for in-memory SQLite."""
+    options = pool_options(Config.SQLALCHEMY_ENGINE_OPTIONS, 'postgresql://gunpla@db/gunpla')
+    assert options['poolclass'] is MeteredQueuePool
+    assert options['pool_pre_ping'] is True
+    assert pool_options(Config.SQLALCHEMY_ENGINE_OPTIONS, 'sqlite:///:memory:') == {}
+
+def test_pool_stats(app, client):
+    """Test connections in use and checkout waits are exposed."""
+    response = client.get('/gunplas/pool')
+    assert response.status_code == 200
+    if isinstance(db.engine.pool, MeteredQueuePool):
+        assert response.json['size'] == Config.SQLALCHEMY_ENGINE_OPTIONS['pool_size']
+        assert response.json['checkouts'] >= app.config['POOL_WARMUP']
+        assert response.json['timeouts'] == 0
+    else:
+        # sqlite:///:memory: is a single shared connection.
+        assert response.json == {'pool': 'StaticPool'}
+
+def sse_events(response, count):
+    """The first ``count`` events of an SSE response, as ``(event, data)``."""
+    events = []
+    for chunk in response.response:
+        for block in chunk.decode().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if 'event' in fields:
+                events.append((fields['event'], json.loads(fields['data'])))
+        if len(events) >= count:
+            response.close()
+            return events
+
+def test_events_stream(client):
+    """Test writes are published to /gunplas/events subscribers."""
+    response = client.get('/gunplas/events', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    created = client.post('/gunplas', json={'name': 'Zaku', 'series': 'MSG', 'grade': 'HG'}).json
+    updated = client.put(f"/gunplas/{created['id']}", json={**created, 'grade': 'MG'}).json
+    client.delete(f"/gunplas/{created['id']}")
+    client.post('/gunplas/bulk', json=[{'name': 'Gouf', 'series': 'MSG', 'grade': 'HG'}])
+    assert sse_events(response, 4) == [
+        ('created', created),
+        ('updated', updated),
+        ('deleted', {'id': created['id']}),
+        ('reset', {}),
+    ]
+
+def test_events_resume(app, client):
+    """Test reconnects replay missed events, or reset when they are unknown."""
+    broker = app.extensions['event_broker']
+    client.post('/gunplas', json={'name': 'Zaku', 'series': 'MSG', 'grade': 'HG'})
+    last_id = f'{broker.epoch}-{broker.cursor()[0]}'
+    client.post('/gunplas', json={'name': 'Gouf', 'series': 'MSG', 'grade': 'HG'})
+
+    response = client.get('/gunplas/events', headers={'Last-Event-ID': last_id}, buffered=False)
+    [(event, data)] = sse_events(response, 1)
+    assert (event, data['name']) == ('created', 'Gouf')
+
+    response = client.get('/gunplas/events', headers={'Last-Event-ID': 'stale-1'}, buffered=False)
+    assert sse_events(response, 1) == [('reset', {})]
+
+@pytest.fixture
+def dist(tmp_path):
+    """A small Vite-style build: index.html plus one hashed bundle."""
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'index.html').write_text('<!DOCTYPE html><div id="root"></div>' + ' ' * 1024)
+    (tmp_path / 'assets' / 'index-4f2a9c1b.js').write_text('console.log("gunpla");\n' * 200)
+    (tmp_path / 'favicon.png').write_bytes(b'\x89PNG' + bytes(2048))
+    return tmp_path
+
+@pytest.fixture
+def dist_client(dist):
+    class DistConfig(TestingConfig):
+        STATIC_DIST_DIR = str(dist)
+    return create_app(DistConfig).test_client()
+
+def test_static_manifest(dist):
+    """Test the manifest holds hashes and compressed variants of text files only."""
+    manifest = StaticManifest(str(dist))
+    assert len(manifest) == 3
+    bundle = manifest.get('assets/index-4f2a9c1b.js')
+    assert bundle.immutable
+    assert bundle.mimetype in ('text/javascript', 'application/javascript')
+    assert len(bundle.variants['gzip']) < bundle.size
+    assert not manifest.get('index.html').immutable
+    assert list(manifest.get('favicon.png').variants) == [None]
+
+def test_static_encoding_negotiation(dist_client):
+    """Test hashed bundles are served compressed and cached as immutable."""
+    response = dist_client.get('/assets/index-4f2a9c1b.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response.data).startswith(b'console.log')
+
+    response = dist_client.get('/assets/index-4f2a9c1b.js')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.startswith(b'console.log')
+
+def test_static_spa_fallback(dist_client):
+    """Test unknown paths get index.html, revalidated by ETag."""
+    response = dist_client.get('/gunpla/42/edit')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert b'<div id="root">' in response.data
+
+    response = dist_client.get('/', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+def test_static_missing_bundle_is_404(dist_client):
+    """Test a bundle that is not in the build is a 404, not index.html served as JavaScript."""
+    response = dist_client.get('/assets/index-0ld8uild.js')
+    assert response.status_code == 404
+    assert b'<div id="root">' not in response.data
+    assert dist_client.get('/gunpla/assets').status_code == 200
+
+@pytest.fixture
+def many_gunplas(app_context):
+    """Enough rows for the list to pass COMPRESSION_MIN_SIZE."""
+    db.session.add_all(
+        Gunpla(name=f"Kit {i}", series="Mobile Suit Gundam", grade="Master Grade", scale="1/100")
+        for i in range(100)
+    )
+    db.session.commit()
+
+def test_list_is_compressed_when_accepted(client, many_gunplas):
+    """Test the list is compressed for clients that ask, with a weak ETag that still validates."""
+    plain = client.get('/gunplas')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    response = client.get('/gunplas', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(response.data) < len(plain.data) // 4
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers['ETag'] == 'W/' + plain.headers['ETag']
+
+    response = client.get('/gunplas', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+def test_small_responses_are_not_compressed(client, sample_gunpla):
+    """Test bodies under COMPRESSION_MIN_SIZE are sent as is."""
+    response = client.get(f'/gunplas/{sample_gunpla.id}', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['name'] == "RX-78-2 Gundam"
+
+def test_stream_is_compressed_chunk_by_chunk(client, many_gunplas):
+    """Test the NDJSON export stays a stream and decompresses to the same lines."""
+    plain = client.get('/gunplas?stream=1').data
+    response = client.get('/gunplas?stream=1', headers={'Accept-Encoding': 'gzip'})
+    assert response.is_streamed
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain
+
+def test_compression_negotiation(app):
+    """Test q-values win over config order, which breaks ties, and q=0 refuses."""
+    encodings = available_encodings(['zstd', 'br', 'gzip'])
+    assert encodings[-1] == 'gzip'
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip, br, zstd'}):
+        assert request.accept_encodings.best_match(encodings) == encodings[0]
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip;q=1.0, br;q=0.5, zstd;q=0.5'}):
+        assert request.accept_encodings.best_match(encodings) == 'gzip'
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip;q=0, identity'}):
+        assert request.accept_encodings.best_match(encodings) is None
+
+def test_encoders_round_trip():
+    """Test every available encoder's one-shot and streamed output decodes."""
+    body = b'{"series": "Mobile Suit Gundam", "grade": "Master Grade"}\n' * 50
+    decoders = {'gzip': gzip.decompress}
+    if 'br' in available_encodings(['br']):
+        import brotli
+        decoders['br'] = brotli.decompress
+    if 'zstd' in available_encodings(['zstd']):
+        import zstandard
+        decoders['zstd'] = lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    for encoding, decompress in decoders.items():
+        assert decompress(ENCODERS[encoding]().compress(body)) == body
+        encoder = ENCODERS[encoding]()
+        streamed = b''.join(encoder.chunk(body[i:i + 100]) for i in range(0, len(body), 100))
+        assert decompress(streamed + encoder.finish()) == body
+
+def decode_columnar(data):
+    """Python twin of decodeColumnar() in src/api/gunplaApi.js."""
+    columns = data['columns']
+    return [
+        {
+            name: column['values'][column['codes'][i]] if isinstance(column, dict) else column[i]
+            for name, column in columns.items()
+        }
+        for i in range(data['count'])
+    ]
+
+def test_columnar_format(client, app_context):
+    """Test ?format=columnar dictionary-encodes categorical columns and decodes back to rows."""
+    db.session.add_all(
+        Gunpla(name=f"Kit {i}", series="Gundam 00" if i % 2 else "Mobile Suit Gundam",
+               grade="HG", scale=None if i == 3 else "1/144")
+        for i in range(5)
+    )
+    db.session.commit()
+    rows = client.get('/gunplas')
+    response = client.get('/gunplas?format=columnar')
+    data = response.json
+    assert data['count'] == 5
+    assert data['columns']['series'] == {'values': ["Mobile Suit Gundam", "Gundam 00"], 'codes': [0, 1, 0, 1, 0]}
+    assert data['columns']['scale']['values'] == ["1/144", None]
+    assert decode_columnar(data) == rows.json
+    assert response.headers['ETag'] != rows.headers['ETag']
+
+    data = client.get('/gunplas?format=columnar&grade=PG').json
+    assert data == {'count': 0, 'columns': {
+        'id': [], 'name': [], 'series': {'values': [], 'codes': []},
+        'grade': {'values': [], 'codes': []}, 'scale': {'values': [], 'codes': []},
+    }}
+
+def test_lookup_tables_normalize_names(client, app_context):
+    """Test series and grade are stored once each and the API still speaks strings."""
+    for name in ('Exia', 'Dynames'):
+        response = client.post('/gunplas', json={'name': name, 'series': 'Gundam 00', 'grade': 'HG'})
+        assert response.json['series'] == 'Gundam 00'
+    client.post('/gunplas/bulk', json=[{'name': 'Kyrios', 'series': 'Gundam 00', 'grade': 'RG'}])
+    assert db.session.scalars(db.select(Series.name)).all() == ['Gundam 00']
+    assert sorted(db.session.scalars(db.select(Grade.name))) == ['HG', 'RG']
+
+    gunpla = db.session.scalars(db.select(Gunpla).where(Gunpla.name == 'Exia')).one()
+    response = client.put(f'/gunplas/{gunpla.id}', json={'name': 'Exia', 'series': 'Gundam 00 S2', 'grade': 'MG'})
+    assert response.json == {'id': gunpla.id, 'name': 'Exia', 'series': 'Gundam 00 S2', 'grade': 'MG', 'scale': None}
+    assert [g['name'] for g in client.get('/gunplas?series=Gundam 00').json] == ['Dynames', 'Kyrios']
+    assert client.get('/gunplas?series=Unknown').json == []
+
+def test_lookup_cache_skips_queries(app_context):
+    """Test known names resolve without queries and rolled back inserts are not cached."""
+    db.session.add(Gunpla(name='Exia', series='Gundam 00', grade='HG'))
+    db.session.commit()
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        db.session.add(Gunpla(name='Dynames', series='Gundam 00', grade='HG'))
+        db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    lookup_tables = ('FROM series', 'INTO series', 'FROM grade', 'INTO grade')
+    assert [sql for sql in statements if any(table in sql for table in lookup_tables)] == []
+
+    db.session.add(Gunpla(name='Sinanju', series='Gundam Unicorn', grade='MG'))
+    db.session.flush()
+    db.session.rollback()
+    # Had the rolled back id been cached, this would point at a missing row.
+    db.session.add(Gunpla(name='Sinanju', series='Gundam Unicorn', grade='MG'))
+    db.session.commit()
+    assert client_series(db.session) == ['Gundam 00', 'Gundam Unicorn']
+
+def client_series(session):
+    return session.scalars(db.select(Series.name).order_by(Series.id)).all()
+
+def test_upgrade_lookup_schema(tmp_path):
+    """Test a database with free-text series/grade columns is moved onto the lookup tables."""
+    path = tmp_path / 'old.db'
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE gunpla (id INTEGER PRIMARY KEY, name VARCHAR(80) NOT NULL,
+            series VARCHAR(120) NOT NULL, grade VARCHAR(50) NOT NULL, scale VARCHAR(20));
+        CREATE INDEX ix_gunpla_name ON gunpla (name);
+        CREATE INDEX ix_gunpla_series ON gunpla (series);
+        CREATE VIRTUAL TABLE gunpla_fts USING fts5(name, series, content='gunpla', content_rowid='id');
+        CREATE TRIGGER gunpla_fts_ai AFTER INSERT ON gunpla BEGIN
+            INSERT INTO gunpla_fts(rowid, name, series) VALUES (new.id, new.name, new.series);
+        END;
+        INSERT INTO gunpla VALUES (3, 'Exia', 'Gundam 00', 'HG', '1/144'), (7, 'Nu Gundam', 'CCA', 'RG', NULL),
+            (9, 'Dynames', 'Gundam 00', 'HG', NULL);
+    """)
+    connection.close()
+
+    class OldDatabaseConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+
+    old_app = create_app(OldDatabaseConfig)
+    with old_app.app_context():
+        client = old_app.test_client()
+        assert client.get('/gunplas').json == [
+            {'id': 3, 'name': 'Exia', 'series': 'Gundam 00', 'grade': 'HG', 'scale': '1/144'},
+            {'id': 7, 'name': 'Nu Gundam', 'series': 'CCA', 'grade': 'RG', 'scale': None},
+            {'id': 9, 'name': 'Dynames', 'series': 'Gundam 00', 'grade': 'HG', 'scale': None},
+        ]
+        assert client_series(db.session) == ['Gundam 00', 'CCA']
+        assert [g['name'] for g in client.get('/gunplas/search?q=gundam 00').json] == ['Exia', 'Dynames']
+        client.post('/gunplas', json={'name': 'Zaku', 'series': 'MSG', 'grade': 'HG'})
+        assert [g['name'] for g in client.get('/gunplas/search?q=msg').json] == ['Zaku']
+        assert client.get('/gunplas/stats').json['series'] == [
+            {'value': 'Gundam 00', 'count': 2}, {'value': 'CCA', 'count': 1}, {'value': 'MSG', 'count': 1},
+        ]
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_server_timing(client, sample_gunpla):
+    """Test each response reports its query count and timings, on both app factories."""
+    timing = client.get('/gunplas').headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'desc="2 queries"' in timing
+    assert 'serialize;dur=' in timing and 'total;dur=' in timing
+    # A cached list only reads the table version.
+    assert 'desc="1 queries"' in client.get('/gunplas').headers['Server-Timing']
+
+def test_request_log(client, sample_gunpla, caplog):
+    """Test the structured log record carries the figures."""
+    with caplog.at_level('INFO', logger='gunpla.requests'):
+        client.get('/gunplas?format=columnar')
+    record = caplog.records[-1]
+    assert record.getMessage() == 'GET /gunplas 200'
+    assert (record.endpoint, record.queries) == ('GET gunplalistresource', 2)
+    assert record.serialize_ms > 0
+
+def test_query_budget(app, client, sample_gunpla):
+    """Test an endpoint over its query budget fails the test."""
+    budgets = app.config['QUERY_BUDGETS']
+    app.config['QUERY_BUDGETS'] = {**budgets, 'GET gunplalistresource': 1}
+    try:
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/gunplas')
+    finally:
+        app.config['QUERY_BUDGETS'] = budgets
+
+def test_repeated_queries_are_logged(app, client, caplog):
+    """Test the same statement run over and over in one request is flagged as N+1."""
+    app.config.update(BULK_CHUNK_SIZE=1, REPEATED_QUERY_THRESHOLD=3)
+    items = [{'name': f'Kit {i}', 'series': 'Mobile Suit Gundam', 'grade': 'MG'} for i in range(3)]
+    try:
+        with caplog.at_level('WARNING', logger='gunpla.requests'):
+            client.post('/gunplas/bulk', json=items)
+    finally:
+        app.config.update(BULK_CHUNK_SIZE=Config.BULK_CHUNK_SIZE,
+                          REPEATED_QUERY_THRESHOLD=Config.REPEATED_QUERY_THRESHOLD)
+    warnings = [record.getMessage() for record in caplog.records if record.levelname == 'WARNING']
+    assert any(message.startswith('Possible N+1 in POST gunplabulkresource: 3 x INSERT INTO gunpla')
+               for message in warnings), warnings
+
+def scrape(client):
+    """``/metrics`` samples as ``{'name{labels}': value}``."""
+    response = client.get('/metrics')
+    assert response.content_type == 'text/plain; version=0.0.4; charset=utf-8'
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            sample, value = line.rsplit(' ', 1)
+            samples[sample] = float(value)
+    return samples
+
+def test_metrics(client, sample_gunpla):
+    """Test /metrics counts requests per route and reports the database, cache and process."""
+    labels = 'method="GET",endpoint="gunplalistresource"'
+    before = scrape(client)
+    client.get('/gunplas')
+    client.get('/gunplas')
+    client.get('/gunplas/999')
+    after = scrape(client)
+
+    count = f'gunpla_http_request_duration_seconds_count{{{labels}}}'
+    assert after[count] - before.get(count, 0) == 2
+    assert after[f'gunpla_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == after[count]
+    missing = 'gunpla_http_responses_total{method="GET",endpoint="gunplaresource",code="4xx"}'
+    assert after[missing] - before.get(missing, 0) == 1
+    assert after['gunpla_http_requests_in_flight'] == 1
+    # A list miss, a cached list (table version only) and a detail miss (version and row)
+    assert after['gunpla_db_queries_total'] - before['gunpla_db_queries_total'] == 2 + 1 + 2
+    assert after['gunpla_cache_hits_total{cache="response"}'] - before['gunpla_cache_hits_total{cache="response"}'] == 1
+    assert after['python_gc_collections_total{generation="0"}'] >= 0
+    assert after['process_cpu_seconds_total'] > 0
+    assert ('gunpla_db_pool_size' in after) == isinstance(db.engine.pool, MeteredQueuePool)
+
+def test_metrics_bounds_methods(client):
+    """Test unknown methods share one label set instead of adding series."""
+    client.open('/gunplas', method='BREW')
+    client.open('/gunplas', method='PROPFIND')
+    samples = scrape(client)
+    assert not any('BREW' in sample or 'PROPFIND' in sample for sample in samples)
+    assert samples['gunpla_http_request_duration_seconds_count{method="OTHER",endpoint="unmatched"}'] >= 2
+
+def test_metrics_disabled():
+    """Test METRICS_ENABLED = False leaves the route out."""
+    class NoMetricsConfig(TestingConfig):
+        METRICS_ENABLED = False
+
+    app = create_app(NoMetricsConfig)
+    assert 'metrics' not in app.extensions
+    assert app.test_client().get('/metrics').status_code != 200
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def test_sampler_collapses_stacks():
+    """Test the sampler counts the sampled thread's stacks, outermost frame first."""
+    sampler = Sampler(threading.get_ident(), interval=0.001).start()
+    spin(0.05)
+    sampler.stop()
+    assert sampler.samples > 0
+    assert sum(sampler.stacks.values()) == sampler.samples
+    stack = sampler.stacks.most_common(1)[0][0]
+    assert stack.split(';')[-1].startswith('spin (test_api.py:')
+    assert 'test_sampler_collapses_stacks (test_api.py:' in stack
+
+def test_profile_header(tmp_path):
+    """Test a signed header profiles its request into PROFILE_DIR and a forged one does not."""
+    class ProfilingConfig(TestingConfig):
+        PROFILE_DIR = str(tmp_path)
+        PROFILE_INTERVAL = 0.001
+
+    app = create_app(ProfilingConfig)
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+    assert 'X-Gunpla-Profile-File' not in client.get('/gunplas').headers
+    assert 'X-Gunpla-Profile-File' not in client.get('/gunplas', headers={'X-Gunpla-Profile': 'profile.forged'}).headers
+    assert list(tmp_path.iterdir()) == []
+
+    response = client.get('/gunplas', headers={'X-Gunpla-Profile': profile_token(app)})
+    name = response.headers['X-Gunpla-Profile-File']
+    assert name.endswith('.folded') and '-GET-gunplalistresource-' in name
+    for line in (tmp_path / name).read_text().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0 and ';' in stack
+
+def test_profile_token_command(app):
+    """Test `flask profile-token` prints a header the app accepts."""
+    result = app.test_cli_runner().invoke(args=['profile-token'])
+    header, token = result.output.strip().split(': ')
+    assert header == 'X-Gunpla-Profile'
+    assert token.startswith('profile.')
+
@@ -0,0 +1,27 @@
+import { describe, it, expect } from 'vitest';
+import { decodeColumnar } from '../gunplaApi';
+
+describe('decodeColumnar', () => {
+  it('rebuilds rows from plain and dictionary-encoded columns', () => {
+    const data = {
+      count: 2,
+      columns: {
+        id: [1, 2],
+        name: ['RX-78-2 Gundam', 'Exia'],
+        series: { values: ['Mobile Suit Gundam', 'Gundam 00'], codes: [0, 1] },
+        grade: { values: ['MG'], codes: [0, 0] },
+        scale: { values: ['1/100', null], codes: [0, 1] }
+      }
+    };
+
+    expect(decodeColumnar(data)).toEqual([
+      { id: 1, name: 'RX-78-2 Gundam', series: 'Mobile Suit Gundam', grade: 'MG', scale: '1/100' },
+      { id: 2, name: 'Exia', series: 'Gundam 00', grade: 'MG', scale: null }
+    ]);
+  });
+
+  it('passes row arrays through', () => {
+    const rows = [{ id: 1, name: 'Zaku II' }];
+    expect(decodeColumnar(rows)).toBe(rows);
+  });
+});
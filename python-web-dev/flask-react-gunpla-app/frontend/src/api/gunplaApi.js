@@ -1,11 +1,31 @@
 const API_URL = import.meta.env.VITE_API_URL || '';
 
+// Turns a ?format=columnar list back into row objects. Columns are either
+// plain arrays or dictionary-encoded {values, codes} pairs; a plain array of
+// rows (from a server without columnar support) is passed through.
+export const decodeColumnar = (data) => {
+    if (Array.isArray(data)) {
+        return data;
+    }
+    const names = Object.keys(data.columns);
+    const rows = new Array(data.count);
+    for (let i = 0; i < data.count; i++) {
+        const row = {};
+        for (const name of names) {
+            const column = data.columns[name];
+            row[name] = Array.isArray(column) ? column[i] : column.values[column.codes[i]];
+        }
+        rows[i] = row;
+    }
+    return rows;
+};
+
 export const fetchGunplas = async () => {
-    const response = await fetch(`${API_URL}/gunplas`);
+    const response = await fetch(`${API_URL}/gunplas?format=columnar`);
     if (!response.ok) {
         throw new Error('Failed to fetch gunplas');
     }
-    return response.json();
+    return decodeColumnar(await response.json());
 };
 
 export const createGunpla = async (gunpla) => {
@@ -41,3 +61,19 @@ export const deleteGunpla = async (id) => {
     }
     return response.json();
 };
+
+// Live changes made by other users. Returns an unsubscribe function.
+export const subscribeGunplaEvents = ({ onCreated, onUpdated, onDeleted, onReset }) => {
+    if (typeof EventSource === 'undefined') {
+        return () => {};
+    }
+    const source = new EventSource(`${API_URL}/gunplas/events`);
+    const listen = (event, handler) => {
+        source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+    };
+    listen('created', onCreated);
+    listen('updated', onUpdated);
+    listen('deleted', onDeleted);
+    listen('reset', onReset);
+    return () => source.close();
+};
@@ -3,9 +3,17 @@ import {
     fetchGunplas as apiFetchGunplas,
     createGunpla,
     updateGunpla as apiUpdateGunpla,
-    deleteGunpla as apiDeleteGunpla
+    deleteGunpla as apiDeleteGunpla,
+    subscribeGunplaEvents
 } from '../api/gunplaApi';
 
+// Insert or replace by id, so our own writes echoed back are no-ops.
+const upsert = (list, gunpla) => (
+    list.some(g => g.id === gunpla.id)
+        ? list.map(g => (g.id === gunpla.id ? gunpla : g))
+        : [...list, gunpla]
+);
+
 export const GunplaContext = createContext();
 
 export const GunplaProvider = ({ children }) => {
@@ -31,7 +39,7 @@ export const GunplaProvider = ({ children }) => {
         setError(null);
         try {
             const data = await createGunpla(gunpla);
-            setGunplas(prev => [...prev, data]);
+            setGunplas(prev => upsert(prev, data));
         } catch (err) {
             setError(err.message);
             throw err;
@@ -64,6 +72,13 @@ export const GunplaProvider = ({ children }) => {
         fetchGunplas();
     }, []);
 
+    useEffect(() => subscribeGunplaEvents({
+        onCreated: (gunpla) => setGunplas(prev => upsert(prev, gunpla)),
+        onUpdated: (gunpla) => setGunplas(prev => upsert(prev, gunpla)),
+        onDeleted: ({ id }) => setGunplas(prev => prev.filter(g => g.id !== id)),
+        onReset: () => fetchGunplas()
+    }), []);
+
     return (
         <GunplaContext.Provider value={{
             gunplas,
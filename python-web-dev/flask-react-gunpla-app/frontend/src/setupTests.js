@@ -14,6 +14,21 @@ import { rest } from 'msw';
 export const handlers = [
   // GET /gunplas
   rest.get('/gunplas', (req, res, ctx) => {
+    if (req.url.searchParams.get('format') === 'columnar') {
+      return res(
+        ctx.status(200),
+        ctx.json({
+          count: 1,
+          columns: {
+            id: [1],
+            name: ["RX-78-2 Gundam"],
+            series: { values: ["Mobile Suit Gundam"], codes: [0] },
+            grade: { values: ["Master Grade"], codes: [0] },
+            scale: { values: ["1/100"], codes: [0] }
+          }
+        })
+      );
+    }
     return res(
       ctx.status(200),
       ctx.json([